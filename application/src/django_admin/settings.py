@@ -42,8 +42,15 @@ DEPLOYMENT = custom_settings.get("deployment", "legacy")
 LEGACY_USER_FILE = Path(custom_settings.get("legacy_users_file", TIRA_ROOT / "model" / "users" / "users.prototext"))
 DISRAPTOR_SECRET_FILE = Path(custom_settings.get("disraptor_secret_file", "/etc/discourse/client-api-key"))
 HOST_GRPC_PORT = custom_settings.get("host_grpc_port", "50051")
+GRPC_DEADLINE = float(custom_settings.get("grpc_deadline", 15))  # seconds until a call to a host is aborted
+# seconds until a stream (e.g., run_output) is closed, the viewers reconnect
+GRPC_STREAM_DEADLINE = float(custom_settings.get("grpc_stream_deadline", 60))
+GRPC_MAX_OUTPUT_STREAMS = int(custom_settings.get("grpc_max_output_streams", 10))  # concurrent run_output viewers
+GRPC_FANOUT_WORKERS = int(custom_settings.get("grpc_fanout_workers", 16))  # hosts queried at once
 APPLICATION_GRPC_PORT = custom_settings.get("application_grpc_port", "50052")
 GRPC_HOST = custom_settings.get("grpc_host", "local")  # can be local or remote
+# the python interpreter of the background jobs (under uWSGI, sys.executable is the uwsgi binary)
+BACKGROUND_JOB_PYTHON = custom_settings.get("background_job_python", None)
 TIRA_DB_NAME = Path(TIRA_ROOT / "state") / f"{custom_settings['database'].get('name', 'tira')}.sqlite3" \
     if custom_settings['database'].get('engine', 'django.db.backends.sqlite3') == 'django.db.backends.sqlite3' \
     else custom_settings['database'].get('name', 'tira')
@@ -244,6 +251,15 @@ GIT_CI_AVAILABLE_RESOURCES = {
     'small-resources-gpu': {'cores': 1, 'ram': 10, 'gpu': '1-nvidia-1080', 'description': 'Small w. GPU (1 CPU Cores, 10GB of RAM, 1 Nvidia GTX 1080 with 8GB)', 'key': 'small-resources-gpu'},
 }
 
+# Secret token of the GitLab pipeline and job webhooks (sent as X-Gitlab-Token to git/webhook). If set, the running
+# softwares are read from the pipeline states reported by the webhooks, and GitLab is only polled to reconcile them.
+GIT_WEBHOOK_TOKEN = custom_settings.get('git_webhook_token', None)
+GIT_PIPELINE_RECONCILE_INTERVAL = int(custom_settings.get('git_pipeline_reconcile_interval', 900))  # seconds
+GITLAB_MAX_WORKERS = int(custom_settings.get('gitlab_max_workers', 8))  # concurrent requests to gitlab per process
+GITLAB_RATE_LIMIT = float(custom_settings.get('gitlab_rate_limit', 10))  # requests per second, host, and process
+GITLAB_RATE_BURST = int(custom_settings.get('gitlab_rate_burst', 20))
+GIT_MAX_BATCH_SIZE = int(custom_settings.get('git_max_batch_size', 100))  # jobs per batch submission
+
 IR_MEASURES_IMAGE = custom_settings.get('IR_MEASURES_IMAGE', 'webis/tira-ir-measures-evaluator:0.0.1')
 IR_MEASURES_COMMAND = custom_settings.get('IR_MEASURES_COMMAND', 'echo "hello world"')
 
@@ -11,6 +11,7 @@ import requests
 from django.conf import settings
 from django.http import JsonResponse, Http404, HttpResponseNotAllowed
 import tira.tira_model as model
+from tira.data.existence import ExistsCache
 from slugify import slugify
 
 from google.protobuf.text_format import Parse
@@ -20,6 +21,32 @@ import urllib.parse
 
 logger = logging.getLogger(__name__)
 
+PROVISIONING_TTL = 300  # seconds
+PROVISIONING_CACHE_SIZE = 4096
+_provisioned_vms = ExistsCache(maxsize=PROVISIONING_CACHE_SIZE, ttl=PROVISIONING_TTL)  # the vms known to exist
+
+
+def provision_vms(vm_ids):
+    """ Membership provisioning: create the (default and group) vms of a user that do not exist yet.
+    VMs that were provisioned are remembered for PROVISIONING_TTL seconds (in a bounded LRU cache of this process), so
+    that in most requests this is neither a read nor a write in the database. This is the only place where
+    authentication creates vms, the role and user lookups are pure reads.
+
+    :returns: the ids of the created vms
+    """
+    vm_ids = [vm_id for vm_id in vm_ids if vm_id and not _provisioned_vms.contains(vm_id)]
+    if not vm_ids:
+        return []
+
+    ret = model.create_missing_vms(vm_ids)
+    for vm_id in vm_ids:
+        _provisioned_vms.add(vm_id)
+
+    if ret:
+        logger.info(f"Provisioned the vms {ret}.")
+
+    return ret
+
 
 class Authentication(object):
     """ Base class for Authentication and Role Management"""
@@ -81,6 +108,14 @@ class Authentication(object):
     def logout(self, request, **kwargs):
         pass
 
+    def _vms_to_provision(self, request) -> list:
+        return []
+
+    def provision(self, request):
+        """ Create the vms the requesting user needs (e.g., the default vm) if they do not exist yet.
+        This is called once per request by the security context (tira.checks) and on login. """
+        return provision_vms(self._vms_to_provision(request))
+
     def create_group(self, vm_id):
         return {"status": 0, "message": f"create_group is not implemented for {self._AUTH_SOURCE}"}
 
@@ -113,6 +148,7 @@ class LegacyAuthentication(Authentication):
             user = model.get_vm(kwargs["user_id"])
             if kwargs["password"] == user['user_password']:
                 request.session["user_id"] = kwargs["user_id"]
+                self.provision(request)
             else:
                 return False
         except:
@@ -152,14 +188,12 @@ class LegacyAuthentication(Authentication):
 
         return self.ROLE_USER
 
-    # TODO creating the default user should be done at some other point that's less frequently called.
     def get_user_id(self, request):
-        user_id = request.session.get("user_id", None)
-        if user_id:
-            vm_id = Authentication.get_default_vm_id(user_id)
-            _ = model.get_vm(vm_id, create_if_none=True)
+        return request.session.get("user_id", None)
 
-        return user_id
+    def _vms_to_provision(self, request) -> list:
+        user_id = self.get_user_id(request)
+        return [Authentication.get_default_vm_id(user_id)] if user_id else []
 
     def get_vm_id(self, request, user_id):
         """ Note: in the old schema, user_id == vm_id"""
@@ -195,11 +229,7 @@ class DisraptorAuthentication(Authentication):
 
     def _get_user_id(self, request):
         """ Return the content of the X-Disraptor-User header set in the http request """
-        user_id = request.headers.get('X-Disraptor-User', None)
-        if user_id:
-            vm_id = Authentication.get_default_vm_id(user_id)
-            _ = model.get_vm(vm_id, create_if_none=True)
-        return user_id
+        return request.headers.get('X-Disraptor-User', None)
 
     def _is_in_group(self, request, group_name='tira_reviewer') -> bool:
         """ return True if the user is in the given disraptor group"""
@@ -232,10 +262,6 @@ class DisraptorAuthentication(Authentication):
         if group_type == 'vm':  # if we check for groups of a virtual machine
             ret = [group["value"] for group in self._parse_tira_groups(all_groups) if group["key"] == "vm"]
 
-            # Some discourse vm groups are created manually, so we have to ensure that they also have a vm
-            for vm_id in ret:
-                _ = model.get_vm(vm_id, create_if_none=True)
-
             return ret + [user_id]
         if group_type == 'org':  # if we check for organizer groups of a user
             return [group["value"] for group in self._parse_tira_groups(all_groups) if group["key"] == "org"]
@@ -269,6 +295,17 @@ class DisraptorAuthentication(Authentication):
         """ public wrapper of _get_user_id that checks conditions """
         return self._get_user_id(request)
 
+    @check_disraptor_token
+    def provision(self, request):
+        """ Create the default vm of the user and the vms of the user's vm groups. Some discourse vm groups are
+        created manually, so we have to ensure that they also have a vm. """
+        user_id = self._get_user_id(request)
+        if not user_id:
+            return []
+
+        return provision_vms([Authentication.get_default_vm_id(user_id)] +
+                             [i for i in self._get_user_groups(request, group_type='vm') if i])
+
     @check_disraptor_token
     def get_vm_id(self, request, user_id=None):
         """ return the vm_id of the first vm_group ("tira-vm-<vm_id>") found.
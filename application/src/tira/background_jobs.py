@@ -0,0 +1,160 @@
+"""
+Background jobs for long-running admin operations (dataset imports, reindexing, ...).
+Each job is a django management command that runs in its own process (manage.py run_background_job), so that the
+web workers stay free, several jobs run concurrently, and each job writes its output to its own log file instead of
+swapping sys.stdout of the worker.
+A running job updates its heartbeat regularly, a job without a recent heartbeat is marked as failed (the pid can not
+be checked, the process may run on another host or in another container than the web worker that reads the status).
+"""
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
+from pathlib import Path
+import subprocess
+import shutil
+import threading
+import traceback
+import logging
+import json
+import sys
+import os
+
+import tira.model as modeldb
+
+logger = logging.getLogger("tira")
+
+JOBS_DIR = Path(settings.TIRA_ROOT) / "state" / "background-jobs"
+MANAGE_PY = Path(__file__).resolve().parent.parent / "manage.py"
+HEARTBEAT_SECONDS = 30
+MISSED_HEARTBEATS = 4  # a running job without a heartbeat for HEARTBEAT_SECONDS * MISSED_HEARTBEATS is failed
+START_TIMEOUT_SECONDS = 300  # a queued job whose process did not start within this time is failed
+
+
+def output_file(job_id) -> Path:
+    return JOBS_DIR / f"{job_id}.log"
+
+
+def _tail(path: Path, max_bytes=64*1024) -> str:
+    if not path.exists():
+        return ""
+    with open(path, 'rb') as f:
+        f.seek(max(path.stat().st_size - max_bytes, 0))
+        return f.read().decode('utf-8', errors='replace')
+
+
+def python_executable() -> str:
+    """ The python interpreter that runs the jobs: BACKGROUND_JOB_PYTHON if configured, otherwise the interpreter of
+    this process. Under uWSGI, sys.executable is the uwsgi binary, then the python3 on the PATH is used. """
+    if getattr(settings, 'BACKGROUND_JOB_PYTHON', None):
+        return settings.BACKGROUND_JOB_PYTHON
+
+    for executable in [sys.executable, getattr(sys, '_base_executable', None)]:
+        if executable and Path(executable).name.startswith('python'):
+            return executable
+
+    return shutil.which('python3') or sys.executable
+
+
+def start_job(title, cmd, args) -> int:
+    """ Start the management command cmd with the keyword arguments args in a new process.
+
+    @param title: a human readable description of the job
+    @param cmd: the name of the django management command, e.g., 'ir_datasets_loader_cli'
+    @param args: the options of the command, must be json serializable (paths are converted to strings)
+    :returns: the id of the job
+    """
+    args = json.loads(json.dumps(args, default=str))
+    job = modeldb.BackgroundJob.objects.create(title=title, cmd=cmd, args=args)
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+
+    try:
+        with open(output_file(job.job_id), 'wb') as out:
+            process = subprocess.Popen([python_executable(), str(MANAGE_PY), 'run_background_job',
+                                        '--job_id', str(job.job_id)], stdin=subprocess.DEVNULL, stdout=out,
+                                       stderr=subprocess.STDOUT, start_new_session=True)
+    except OSError as e:
+        modeldb.BackgroundJob.objects.filter(job_id=job.job_id).update(
+            status='failed', error=f'The process of the job could not be started: {e}', finished=timezone.now())
+        raise
+
+    modeldb.BackgroundJob.objects.filter(job_id=job.job_id).update(pid=process.pid)
+    # reap the process when it exits, the job itself records its status in the database
+    threading.Thread(target=process.wait, daemon=True).start()
+    logger.info(f"Started background job {job.job_id} ({title}) with pid {process.pid}.")
+
+    return job.job_id
+
+
+def _send_heartbeats(job_id, stopped):
+    while not stopped.wait(HEARTBEAT_SECONDS):
+        modeldb.BackgroundJob.objects.filter(job_id=job_id).update(heartbeat=timezone.now())
+    # the database connection of this thread
+    connection.close()
+
+
+def run_job(job_id):
+    """ Execute the job. This is called in the process of the job by manage.py run_background_job. """
+    from django.core.management import call_command
+
+    job = modeldb.BackgroundJob.objects.get(job_id=job_id)
+    job.status, job.pid, job.started, job.heartbeat = 'running', os.getpid(), timezone.now(), timezone.now()
+    job.save()
+
+    stopped = threading.Event()
+    heartbeat = threading.Thread(target=_send_heartbeats, args=(job_id, stopped), daemon=True)
+    heartbeat.start()
+    try:
+        call_command(job.cmd, **job.args)
+        job.status = 'finished'
+    except Exception as e:
+        job.status = 'failed'
+        job.error = f'{e}\n\n{traceback.format_exc()}'
+        print(job.error, file=sys.stderr)
+    finally:
+        stopped.set()
+        heartbeat.join()
+
+    job.finished = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished'])
+
+
+def _terminated_unexpectedly(job):
+    """ True if the process of the job is gone: a running job missed its heartbeats or a queued job never started """
+    now = timezone.now()
+    if job.status == 'running':
+        return (job.heartbeat or job.started) < now - timedelta(seconds=HEARTBEAT_SECONDS * MISSED_HEARTBEATS)
+
+    return job.status == 'queued' and job.created < now - timedelta(seconds=START_TIMEOUT_SECONDS)
+
+
+def _job_as_dict(job, output_bytes):
+    if _terminated_unexpectedly(job):
+        job.status, job.error, job.finished = 'failed', 'The process of the job terminated unexpectedly.', timezone.now()
+        job.save(update_fields=['status', 'error', 'finished'])
+
+    output = _tail(output_file(job.job_id), output_bytes) if output_bytes else ""
+    # progress bars (e.g., tqdm) overwrite their line with \r, the last non-empty line is the current progress
+    lines = [i for i in output.replace('\r', '\n').split('\n') if i.strip()]
+
+    return {"job_id": job.job_id, "title": job.title, "cmd": job.cmd, "args": job.args, "status": job.status,
+            "error": job.error, "created": str(job.created), "started": str(job.started) if job.started else None,
+            "finished": str(job.finished) if job.finished else None, "progress": lines[-1] if lines else "",
+            "output": output}
+
+
+def get_job(job_id, output_bytes=64*1024):
+    """ The status of the job with the last output_bytes of its output, None if the job does not exist """
+    try:
+        return _job_as_dict(modeldb.BackgroundJob.objects.get(job_id=job_id), output_bytes)
+    except modeldb.BackgroundJob.DoesNotExist:
+        return None
+
+
+def get_jobs(limit=100):
+    """ The status of the latest jobs (without their output, but with their progress) """
+    ret = [_job_as_dict(job, 1024) for job in modeldb.BackgroundJob.objects.order_by('-job_id')[:limit]]
+    for job in ret:
+        del job['output']
+
+    return ret
@@ -13,6 +13,78 @@ import logging
 logger = logging.getLogger("tira")
 
 
+class SecurityContext(object):
+    """ Resolves the identity and role of the requesting user and the existence of the requested resources at most once
+    per request, so that check_permissions, check_conditional_permissions, check_resources_exist, and add_context,
+    which wrap the same endpoint, share their lookups. Obtain it via security_context(request).
+    The vms of the user are provisioned (see authentication.provision_vms) when the user is resolved.
+    """
+    def __init__(self, request):
+        self.request = request
+        self._cache = {}
+
+    def _memoize(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    @property
+    def user_id(self):
+        def resolve():
+            auth.provision(self.request)
+            return auth.get_user_id(self.request)
+
+        return self._memoize('user_id', resolve)
+
+    def role(self, vm_id=None):
+        return self._memoize(('role', vm_id), lambda: auth.get_role(self.request, user_id=self.user_id, vm_id=vm_id))
+
+    def is_organizer_for_endpoint(self, task_id=None, organizer_id=None):
+        return self._memoize(('organizer', task_id, organizer_id), lambda: auth.user_is_organizer_for_endpoint(
+            request=self.request, path=self.request.path_info, task_id=task_id, organizer_id_from_params=organizer_id))
+
+    def vm_exists(self, vm_id):
+        return self._memoize(('vm_exists', vm_id), lambda: model.vm_exists(vm_id))
+
+    def dataset_exists(self, dataset_id):
+        return self._memoize(('dataset_exists', dataset_id), lambda: model.dataset_exists(dataset_id))
+
+    def task_exists(self, task_id):
+        return self._memoize(('task_exists', task_id), lambda: model.task_exists(task_id))
+
+    def organizer_exists(self, organizer_id):
+        return self._memoize(('organizer_exists', organizer_id), lambda: model.organizer_exists(organizer_id))
+
+    def software_exists(self, task_id, vm_id, software_id):
+        return self._memoize(('software_exists', task_id, vm_id, software_id),
+                             lambda: model.software_exists(task_id, vm_id, software_id))
+
+    def run_exists(self, vm_id, dataset_id, run_id):
+        return self._memoize(('run_exists', vm_id, dataset_id, run_id),
+                             lambda: model.run_exists(vm_id, dataset_id, run_id))
+
+    def run_review(self, dataset_id, vm_id, run_id):
+        return self._memoize(('run_review', dataset_id, vm_id, run_id),
+                             lambda: model.get_run_review(dataset_id, vm_id, run_id))
+
+    def dataset(self, dataset_id):
+        return self._memoize(('dataset', dataset_id), lambda: model.get_dataset(dataset_id))
+
+    def task(self, task_id):
+        return self._memoize(('task', task_id), lambda: model.get_task(task_id))
+
+    def user_is_registered(self, task_id):
+        return self._memoize(('registered', task_id), lambda: model.user_is_registered(task_id, self.request))
+
+
+def security_context(request) -> SecurityContext:
+    """ The SecurityContext of the request, it is created on first use and lives as long as the request. """
+    if '_tira_security_context' not in request.__dict__:
+        request.__dict__['_tira_security_context'] = SecurityContext(request)
+
+    return request.__dict__['_tira_security_context']
+
+
 def check_permissions(func):
     """ A decorator that checks if the requesting user has the needed permissions to call the decorated function.
     This decorator redirects or blocks requests if the requesting user does not have permission.
@@ -34,29 +106,30 @@ def check_permissions(func):
         run_id = kwargs.get('run_id', None)
         task_id = kwargs.get('task_id', None)
         organizer_id = kwargs.get('organizer_id', None)
-        role = auth.get_role(request, user_id=auth.get_user_id(request))
+        ctx = security_context(request)
+        role = ctx.role()
 
         if role == auth.ROLE_ADMIN or role == auth.ROLE_TIRA:
             return func(request, *args, **kwargs)
 
-        if auth.user_is_organizer_for_endpoint(request=request, path=request.path_info, task_id=task_id, organizer_id_from_params=organizer_id):
+        if ctx.is_organizer_for_endpoint(task_id=task_id, organizer_id=organizer_id):
             return func(request, *args, **kwargs)
 
         if vm_id:
-            if not model.vm_exists(vm_id):  # If the resource does not exist
+            if not ctx.vm_exists(vm_id):  # If the resource does not exist
                 return redirect('tira:request_vm')
-            role = auth.get_role(request, user_id=auth.get_user_id(request), vm_id=vm_id)
+            role = ctx.role(vm_id)
             if run_id and dataset_id:  # this prevents participants from viewing hidden runs
-                if not model.run_exists(vm_id, dataset_id, run_id):
+                if not ctx.run_exists(vm_id, dataset_id, run_id):
                     return Http404(f'The VM {vm_id} has no run with the id {run_id} on {dataset_id}.')
-                review = model.get_run_review(dataset_id, vm_id, run_id)
-                dataset = model.get_dataset(dataset_id)
+                review = ctx.run_review(dataset_id, vm_id, run_id)
+                dataset = ctx.dataset(dataset_id)
                 is_review_visible = (not review['blinded']) or review['published'] or not dataset.get('is_confidential', True)
                 if not is_review_visible:
                     role = auth.ROLE_USER
             if task_id:  # This checks if the registration requirement is fulfilled.
-                if model.get_task(task_id)["require_registration"]:
-                    if not model.user_is_registered(task_id, request):
+                if ctx.task(task_id)["require_registration"]:
+                    if not ctx.user_is_registered(task_id):
                         return HttpResponseNotAllowed(f"Access forbidden. You must register first.")
 
         if role == auth.ROLE_PARTICIPANT:
@@ -101,24 +174,25 @@ def check_conditional_permissions(restricted=False, public_data_ok=False, privat
             if run_id:
                 kwargs['run_id'] = run_id
 
-            role = auth.get_role(request, user_id=auth.get_user_id(request))
+            ctx = security_context(request)
+            role = ctx.role()
             if role == auth.ROLE_ADMIN or role == auth.ROLE_TIRA:
                 return func(request, *args, **kwargs)
             elif restricted:
                 return HttpResponseNotAllowed(f"Access restricted.")
 
             if vm_id:  # First we determine the role of the user on the resource he requests
-                if not model.vm_exists(vm_id):
+                if not ctx.vm_exists(vm_id):
                     return redirect('tira:request_vm')
-                role_on_vm = auth.get_role(request, user_id=auth.get_user_id(request), vm_id=vm_id)
+                role_on_vm = ctx.role(vm_id)
                 if run_id and dataset_id:
                     role = auth.ROLE_USER
-                    if not model.run_exists(vm_id, dataset_id, run_id):
+                    if not ctx.run_exists(vm_id, dataset_id, run_id):
                         return Http404(f'The VM {vm_id} has no run with the id {run_id} on {dataset_id}.')
 
-                    review = model.get_run_review(dataset_id, vm_id, run_id)
+                    review = ctx.run_review(dataset_id, vm_id, run_id)
                     is_review_visible = (not review['blinded']) or review['published']
-                    is_dataset_confidential = model.get_dataset(dataset_id).get('is_confidential', True)
+                    is_dataset_confidential = ctx.dataset(dataset_id).get('is_confidential', True)
                     # if the run is visible OR if we make an exception for public datasets
                     if is_review_visible:
                         role = role_on_vm
@@ -130,8 +204,8 @@ def check_conditional_permissions(restricted=False, public_data_ok=False, privat
                     role = role_on_vm
 
                 if task_id and not not_registered_ok:  # This checks if the registration requirement is fulfilled.
-                    if model.get_task(task_id)["require_registration"]:
-                        if not model.user_is_registered(task_id, request):
+                    if ctx.task(task_id)["require_registration"]:
+                        if not ctx.user_is_registered(task_id):
                             return HttpResponseNotAllowed(f"Access forbidden. You must register first.")
 
             if not restricted and role == auth.ROLE_PARTICIPANT:  # Participants can access when it is their resource, the resource is visible to them, and the call is not restricted
@@ -159,8 +233,9 @@ def check_resources_exist(reply_as='json'):
                     return redirect('tira:request_vm')
                 return Http404(message)
 
+            ctx = security_context(request)
             if "vm_id" in kwargs:
-                if not model.vm_exists(kwargs["vm_id"]):
+                if not ctx.vm_exists(kwargs["vm_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: vm_id does not exist")
                     if "task_id" in kwargs:
                         return return_fail(f'There is no vm with id {kwargs["vm_id"]} matching your request.',
@@ -169,29 +244,29 @@ def check_resources_exist(reply_as='json'):
                     return return_fail(f"vm_id {kwargs['vm_id']} does not exist", request_vm_instead=True)
 
             if "dataset_id" in kwargs:
-                if not model.dataset_exists(kwargs["dataset_id"]):
+                if not ctx.dataset_exists(kwargs["dataset_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: dataset_id does not exist")
                     return return_fail("dataset_id does not exist")
 
             if "task_id" in kwargs:
-                if not model.task_exists(kwargs["task_id"]):
+                if not ctx.task_exists(kwargs["task_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: task_id does not exist")
                     return return_fail("task_id does not exist")
 
             if "organizer_id" in kwargs:
-                if not model.organizer_exists(kwargs["organizer_id"]):
+                if not ctx.organizer_exists(kwargs["organizer_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: organizer_id does not exist")
                     return return_fail("organizer_id does not exist")
 
             if "software_id" in kwargs:
                 if "task_id" not in kwargs or "vm_id" not in kwargs:
                     raise AttributeError("Can't validate software_id: need task_id and vm_id in kwargs")
-                if not model.software_exists(kwargs["task_id"], kwargs["vm_id"], kwargs["software_id"]):
+                if not ctx.software_exists(kwargs["task_id"], kwargs["vm_id"], kwargs["software_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: software_id does not exist")
                     return return_fail("software_id does not exist")
 
             if "run_id" in kwargs:
-                if not model.run_exists(kwargs.get("vm_id", None), kwargs.get("dataset_id", None), kwargs["run_id"]):
+                if not ctx.run_exists(kwargs.get("vm_id", None), kwargs.get("dataset_id", None), kwargs["run_id"]):
                     logger.error(f"{resolve(request.path_info).url_name}: run_id does not exist")
                     return return_fail("run_id does not exist")
 
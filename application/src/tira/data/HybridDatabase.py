@@ -15,6 +15,8 @@ from tira.util import auto_reviewer, now, get_today_timestamp, get_tira_id
 
 import tira.model as modeldb
 import tira.data.data as dbops
+import tira.data.leaderboard as leaderboard
+import tira.data.existence as existence
 
 logger = logging.getLogger("tira_db")
 
@@ -206,6 +208,19 @@ class HybridDatabase(object):
             vm = modeldb.VirtualMachine.objects.get(vm_id=vm_id)
         return self._vm_as_dict(vm)
 
+    @staticmethod
+    def create_missing_vms(vm_ids) -> list:
+        """ Create the vms that do not exist yet with one read and (only if needed) one bulk insert.
+
+        :returns: the ids of the created vms
+        """
+        vm_ids = set(vm_ids)
+        missing = vm_ids - set(modeldb.VirtualMachine.objects.filter(vm_id__in=vm_ids).values_list('vm_id', flat=True))
+        if missing:
+            modeldb.VirtualMachine.objects.bulk_create([modeldb.VirtualMachine(vm_id=vm_id) for vm_id in missing],
+                                                       ignore_conflicts=True)
+        return sorted(missing)
+
     def get_users_vms(self):
         """ Return the users list. """
         return [self._vm_as_dict(vm) for vm in modeldb.VirtualMachine.objects.all()]
@@ -607,72 +622,14 @@ class HybridDatabase(object):
                 {vm_id: str, run_id: str, measures: list}
         """
 
-        def round_if_float(fl):
-            if not round_floats:
-                return fl
-            try:
-                return round(float(fl), 3)
-            except ValueError:
-                return fl
-
-        def format_evaluation(r, ks):
-            """
-            @param r: a queryset of modeldb.Run
-            @param ks: a list of keys of evaluation parameters
-            """
-            def if_exists(evals):
-                for k in ks:
-                    ev = evals.filter(run__run_id=run.run_id, measure_key=k).all()
-                    if ev.exists():
-                        yield round_if_float(ev[0].measure_value)
-                    else:
-                        yield "-"
-
-            # print(r.all().values())
-            for run in r:
-                if run.run_id in exclude:
-                    continue
-                values = evaluations.filter(run__run_id=run.run_id).all()
-                if not values.exists():
-                    continue
-                try:
-                    input_run = run.input_run
-                    # print(input_run.software)
-                    # print(input_run.docker_software)
-                    # print(input_run.upload)
-                    if input_run.software:
-                        vm_id = run.input_run.software.vm.vm_id
-                    elif input_run.docker_software:
-                        vm_id = run.input_run.docker_software.vm.vm_id
-                    elif input_run.upload:
-                        vm_id = run.input_run.upload.vm.vm_id
-                    else:
-                        logger.error(
-                            f"The input run {run.run_id} has no vm assigned. Assigning None instead")
-                        vm_id = "None"
-
-                except AttributeError as e:
-                    logger.error(f"The vm or software of run {run.run_id} does not exist. Maybe either was deleted?", e)
-                    vm_id = "None"
-
-                rev = modeldb.Review.objects.get(run__run_id=run.run_id)
-
-                yield {"vm_id": vm_id,
-                       "run_id": run.run_id,
-                       'input_run_id': run.input_run.run_id,
-                       'published': rev.published,
-                       'blinded': rev.blinded,
-                       "measures": list(if_exists(evaluations))}
-
-        runs = modeldb.Run.objects.filter(input_dataset=dataset_id).exclude(input_run__isnull=True).all()
-        evaluations = modeldb.Evaluation.objects.select_related('run', 'run__software__vm').filter(
-            run__input_dataset__dataset_id=dataset_id).all()
-        keys = [k['measure_key'] for k in evaluations.values('measure_key').distinct()]
+        return leaderboard.leaderboard_from_entries(leaderboard.build_entries(dataset_id), include_unpublished,
+                                                    round_floats)
 
-        exclude = {review.run.run_id for review in modeldb.Review.objects.select_related('run').filter(
-            run__input_dataset__dataset_id=dataset_id, published=False, run__software=None).all()
-                   if not include_unpublished}
-        return keys, list(format_evaluation(runs, keys))
+    def get_leaderboard(self, dataset_id, include_unpublished=False, round_floats=True):
+        """ Like get_evaluations_with_keys_by_dataset, but reads the materialized leaderboard of the dataset, which is
+        maintained incrementally when evaluations are parsed, reviews are updated, and runs are deleted.
+        """
+        return leaderboard.get_leaderboard(dataset_id, include_unpublished, round_floats)
 
     def get_evaluation(self, run_id):
         try:
@@ -1048,6 +1005,7 @@ class HybridDatabase(object):
                 published=review_proto.published,
                 blinded=review_proto.blinded
             )
+            leaderboard.update_review(run_id, review_proto.published, review_proto.blinded)
 
             self._save_review(dataset_id, vm_id, run_id, review_proto)
             return True
@@ -1275,6 +1233,9 @@ class HybridDatabase(object):
 
         open(vm_file_path, 'w').write(str(vm))
 
+    def set_evaluator_git_repository(self, dataset_id, git_repository_id):
+        modeldb.Evaluator.objects.filter(dataset__dataset_id=dataset_id).update(git_repository_id=git_repository_id)
+
     def edit_dataset(self, task_id, dataset_id, dataset_name, command, working_directory, measures, upload_name,
                      is_confidential, is_git_runner, git_runner_image, git_runner_command, git_repository_id):
         """
@@ -1362,6 +1323,7 @@ class HybridDatabase(object):
         except FileNotFoundError as e:
             logger.exception(f'Tried to delete {run_dir} but it was not found. Deleting the run from Database ... ')
 
+        leaderboard.delete_entry(run_id)
         modeldb.Run.objects.filter(run_id=run_id).delete()
         return True
 
@@ -1471,30 +1433,30 @@ class HybridDatabase(object):
             "instructor_email": registration.instructor_email}
 
 
-    # methods to check for existence
+    # methods to check for existence, see tira.data.existence
     @staticmethod
     def task_exists(task_id: str) -> bool:
-        return modeldb.Task.objects.filter(task_id=task_id).exists()
+        return existence.task_exists(task_id)
 
     @staticmethod
     def dataset_exists(dataset_id: str) -> bool:
-        return modeldb.Dataset.objects.filter(dataset_id=dataset_id).exists()
+        return existence.dataset_exists(dataset_id)
 
     @staticmethod
     def vm_exists(vm_id: str) -> bool:
-        return modeldb.VirtualMachine.objects.filter(vm_id=vm_id).exists()
+        return existence.vm_exists(vm_id)
 
     @staticmethod
     def organizer_exists(organizer_id: str) -> bool:
-        return modeldb.Organizer.objects.filter(organizer_id=organizer_id).exists()
+        return existence.organizer_exists(organizer_id)
 
     @staticmethod
     def run_exists(vm_id: str, dataset_id: str, run_id: str) -> bool:
-        return modeldb.Run.objects.filter(run_id=run_id).exists()
+        return existence.run_exists(run_id)
 
     @staticmethod
     def software_exists(task_id: str, vm_id: str, software_id: str) -> bool:
-        return modeldb.Software.objects.filter(software_id=software_id, vm__vm_id=vm_id).exists()
+        return existence.software_exists(vm_id, software_id)
 
 # modeldb.EvaluationLog.objects.filter(vm_id='nlptasks-master').delete()
 # print(modeldb.Run.objects.all().exclude(upload=None).values())
@@ -7,6 +7,8 @@ from google.protobuf.text_format import Parse
 from tira.util import extract_year_from_dataset_id, auto_reviewer
 from pathlib import Path
 import tira.model as modeldb
+import tira.data.leaderboard as leaderboard
+import tira.data.run_indexer as run_indexer
 import logging
 from tqdm import tqdm
 
@@ -41,14 +43,10 @@ def reload_tasks(tasks_dir_path):
 
 
 def reload_runs(runs_dir_path, vm_id):
-    parse_runs_for_vm(runs_dir_path, vm_id)
-
-    for dataset_dir in runs_dir_path.glob("*"):
-        dataset_id = dataset_dir.stem
-        for vm_dir in dataset_dir.glob("*"):
-            if vm_dir.stem != vm_id:
-                continue
-            parse_runs_for_vm(runs_dir_path, dataset_id, vm_id)
+    """ Index the added and changed runs of the vm and purge the runs that disappeared. """
+    stats = run_indexer.incremental_index_runs(runs_dir_path, vm_id)
+    logger.info(f"Reloaded runs of {vm_id}: {stats['runs']} indexed, {stats['unchanged']} unchanged, "
+                f"{stats['purged']} purged.")
 
 
 def _parse_organizer_list(organizers_file_path):
@@ -192,11 +190,13 @@ def _parse_software_list(softwares_dir_path):
 
 
 def _parse_runs_evaluations(runs_dir_path):
-    for dataset_dir in tqdm(runs_dir_path.glob("*")):
-        dataset_id = dataset_dir.stem
-        for vm_dir in tqdm(dataset_dir.glob("*"), desc=f'{dataset_id}'):
-            vm_id = vm_dir.stem
-            parse_runs_for_vm(runs_dir_path, dataset_id, vm_id)
+    """ Index all added and changed runs with the bulk indexer, see run_indexer.incremental_index_runs """
+    try:
+        stats = run_indexer.incremental_index_runs(runs_dir_path, verbose=True)
+    except run_indexer.RunsDirectoryUnavailable as e:
+        logger.error(f"Did not index the runs: {e}")
+        return
+    logger.info(f"Indexed runs: {stats['runs']} indexed, {stats['unchanged']} unchanged, {stats['purged']} purged.")
 
 
 def _parse_run(run_id, task_id, run_proto, vm, dataset):
@@ -305,6 +305,8 @@ def _parse_evalutions(run_dir, run):
         for measure in evaluation.measure:
             modeldb.Evaluation.objects.update_or_create(measure_key=measure.key, run=run, measure_value=measure.value)
 
+    leaderboard.update_entry(run.run_id)
+
 
 def parse_runs_for_vm(runs_dir_path, dataset_id, vm_id, verbose=False):
     vm_dir = runs_dir_path / dataset_id / vm_id
@@ -382,7 +384,27 @@ def parse_run(runs_dir_path, dataset_id, vm_id, run_id):
     return_message += f'|Run updated during parsing of reviews|'
 
     _parse_evalutions(run_dir, run)
+    # evaluations of this run that were parsed before it may not know the owner of this run yet
+    leaderboard.update_entries_of_input_run(run.run_id)
 
     return return_message
 
 
+def sync_run_dir(runs_dir_path, dataset_id, vm_id, run_id):
+    """ Bring the database in sync with a single run directory: parse it if it was added or changed since it was last
+    indexed, otherwise delete the run if the directory disappeared. Uses the manifest of the incremental indexer, so
+    that the files written during parsing do not trigger another parse.
+    """
+    run_dir = runs_dir_path / dataset_id / vm_id / run_id
+    if run_dir.is_dir():
+        if run_indexer.is_indexed(runs_dir_path, run_dir):
+            return f'|Run {run_id} is unchanged|'
+
+        ret = parse_run(runs_dir_path, dataset_id, vm_id, run_id)
+        if modeldb.Run.objects.filter(run_id=run_id).exists():
+            run_indexer.mark_as_indexed(runs_dir_path, run_dir, run_id)
+        return ret
+
+    modeldb.IndexedRunDirectory.objects.filter(run_dir=f'{dataset_id}/{vm_id}/{run_id}').delete()
+    deleted, _ = modeldb.Run.objects.filter(run_id=run_id, input_dataset__dataset_id=dataset_id).delete()
+    return f'|Run {run_id} deleted|' if deleted else f'|Run {run_id} did not exist|'
@@ -0,0 +1,107 @@
+"""
+Existence checks for the resources in the urls (vm, dataset, task, organizer, software, run) that
+check_resources_exist and check_permissions run on nearly every request. The checks are EXISTS queries on indexed
+columns, and positive results are kept in a small in-process LRU cache:
+ - an entry expires after EXISTS_CACHE_TTL seconds (so deletions in other processes are picked up),
+ - deleting an object of a model (via the ORM) invalidates the entries of its kind in this process, a flush of the
+   database (which emits post_migrate) invalidates all entries.
+Negative results are not cached, so created objects are found right away (also those created with bulk_create,
+which sends no signals).
+"""
+from collections import OrderedDict
+from django.db.models.signals import post_delete, post_migrate
+import threading
+import time
+
+import tira.model as modeldb
+
+EXISTS_CACHE_SIZE = 4096
+EXISTS_CACHE_TTL = 60
+
+
+class ExistsCache(object):
+    def __init__(self, maxsize=EXISTS_CACHE_SIZE, ttl=EXISTS_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def contains(self, key):
+        with self.lock:
+            expires = self.entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.time():
+                del self.entries[key]
+                return False
+            self.entries.move_to_end(key)
+            return True
+
+    def add(self, key):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = time.time() + self.ttl
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, kind=None):
+        """ Remove all entries (of the kind, e.g., 'run') """
+        with self.lock:
+            if kind is None:
+                self.entries.clear()
+            else:
+                for key in [k for k in self.entries if k[0] == kind]:
+                    del self.entries[key]
+
+
+cache = ExistsCache()
+
+
+def _exists(key, queryset):
+    if cache.contains(key):
+        return True
+    ret = queryset.exists()
+    if ret:
+        cache.add(key)
+    return ret
+
+
+def task_exists(task_id: str) -> bool:
+    return _exists(('task', task_id), modeldb.Task.objects.filter(task_id=task_id))
+
+
+def dataset_exists(dataset_id: str) -> bool:
+    return _exists(('dataset', dataset_id), modeldb.Dataset.objects.filter(dataset_id=dataset_id))
+
+
+def vm_exists(vm_id: str) -> bool:
+    return _exists(('vm', vm_id), modeldb.VirtualMachine.objects.filter(vm_id=vm_id))
+
+
+def organizer_exists(organizer_id: str) -> bool:
+    return _exists(('organizer', organizer_id), modeldb.Organizer.objects.filter(organizer_id=organizer_id))
+
+
+def run_exists(run_id: str) -> bool:
+    return _exists(('run', run_id), modeldb.Run.objects.filter(run_id=run_id))
+
+
+def software_exists(vm_id: str, software_id: str) -> bool:
+    # software_id and vm_id are the leading columns of the unique index (software_id, vm, task)
+    return _exists(('software', vm_id, software_id),
+                   modeldb.Software.objects.filter(software_id=software_id, vm_id=vm_id))
+
+
+_kinds = {modeldb.Task: 'task', modeldb.Dataset: 'dataset', modeldb.VirtualMachine: 'vm',
+          modeldb.Organizer: 'organizer', modeldb.Run: 'run', modeldb.Software: 'software'}
+
+
+def _invalidate_on_delete(sender, **kwargs):
+    cache.invalidate(_kinds[sender])
+
+
+for model_class in _kinds:
+    post_delete.connect(_invalidate_on_delete, sender=model_class, dispatch_uid=f'tira-exists-{_kinds[model_class]}')
+post_migrate.connect(lambda **kwargs: cache.invalidate(), dispatch_uid='tira-exists-flush', weak=False)
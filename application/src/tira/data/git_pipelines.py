@@ -0,0 +1,135 @@
+"""
+The state of the CI pipelines of the git runner, kept in the table GitPipeline (one row per submission, i.e., branch):
+ - a row is created with the status 'submitted' before the branch of a submission is created,
+ - the GitLab pipeline and job webhooks (vm_api.git_webhook) update the status of the pipeline and its jobs. Events of
+   branches without a row are ignored, e.g., the events of a pipeline that is canceled by stop_job_and_clean_up,
+ - polling GitLab (GitLabRunner.all_running_pipelines_for_repository with reconcile=True, e.g., by the cache_daemon)
+   reconciles the table, e.g., after missed events or for deleted branches.
+If webhooks are configured (GIT_WEBHOOK_TOKEN), the running softwares are read from this table instead of GitLab.
+The configuration of each submission is stored in GitJobConfiguration when its branch is created.
+"""
+from django.conf import settings
+from django.db import transaction
+import logging
+
+import tira.model as modeldb
+
+logger = logging.getLogger("tira_db")
+
+RUNNING_PIPELINE_STATUSES = ['scheduled', 'running', 'pending', 'created', 'waiting_for_resource', 'preparing']
+# submissions whose pipeline did not send events yet are shown as running
+ACTIVE_STATUSES = ['submitted'] + RUNNING_PIPELINE_STATUSES
+
+
+def webhooks_enabled() -> bool:
+    return bool(getattr(settings, 'GIT_WEBHOOK_TOKEN', None))
+
+
+def record_submission(git_repository_id, branch, status='submitted'):
+    modeldb.GitPipeline.objects.update_or_create(branch=branch, defaults={
+        'git_repository_id': int(git_repository_id), 'pipeline_id': None, 'status': status, 'jobs': {}})
+
+
+def _update(git_repository_id, branch, pipeline_id, update):
+    """ Apply update(pipeline) to the row of the branch. Events of branches without a row (e.g., of deleted branches,
+    polling adds the other branches) and of older pipelines of the branch (e.g., before a retry) are ignored. """
+    if not branch or branch == 'main':
+        return
+
+    with transaction.atomic():
+        pipeline = modeldb.GitPipeline.objects.select_for_update().filter(
+            branch=branch, git_repository_id=int(git_repository_id)).first()
+        if not pipeline:
+            logger.debug(f'Ignore the event of pipeline {pipeline_id} of the unknown branch {branch}.')
+            return
+        if pipeline.pipeline_id and pipeline_id and int(pipeline_id) < pipeline.pipeline_id:
+            return
+        if pipeline_id:
+            if pipeline.pipeline_id != int(pipeline_id):
+                pipeline.jobs = {}
+            pipeline.pipeline_id = int(pipeline_id)
+        update(pipeline)
+        pipeline.save()
+
+
+def update_from_pipeline_event(payload):
+    """ Process the payload of a GitLab "Pipeline Hook". """
+    attributes = payload['object_attributes']
+
+    def update(pipeline):
+        pipeline.status = attributes['status']
+        for build in payload.get('builds', []):
+            pipeline.jobs[build['name']] = {'id': build['id'], 'status': build['status']}
+
+    _update(payload['project']['id'], attributes['ref'], attributes['id'], update)
+
+
+def update_from_job_event(payload):
+    """ Process the payload of a GitLab "Job Hook". """
+    def update(pipeline):
+        pipeline.jobs[payload['build_name']] = {'id': payload['build_id'], 'status': payload['build_status']}
+
+    _update(payload['project_id'], payload['ref'], payload.get('pipeline_id'), update)
+
+
+def pipelines_of_repository(git_repository_id):
+    return modeldb.GitPipeline.objects.filter(git_repository_id=int(git_repository_id)).order_by('branch')
+
+
+def delete(branch):
+    """ Remove the pipeline state and the job configuration of the submission on the (deleted) branch. """
+    with transaction.atomic():
+        modeldb.GitPipeline.objects.filter(branch=branch).delete()
+        modeldb.GitJobConfiguration.objects.filter(branch=branch).delete()
+
+
+def reconcile(git_repository_id, started, pipelines, branches):
+    """ Overwrite the state of the repository with the result of polling GitLab (that started at the time "started"):
+    pipelines maps the branches of the running pipelines to (pipeline_id, status, jobs), branches are all other
+    branches. Rows that were updated since the polling started are kept, rows (and job configurations) of branches that
+    no longer exist are removed.
+    """
+    # the events of the webhook that arrived since the polling started are newer than the polled state
+    updated = set(modeldb.GitPipeline.objects.filter(branch__in=list(pipelines), last_update__gte=started)
+                  .values_list('branch', flat=True))
+    for branch, (pipeline_id, status, jobs) in pipelines.items():
+        if branch in updated:
+            continue
+        modeldb.GitPipeline.objects.update_or_create(branch=branch, defaults={
+            'git_repository_id': int(git_repository_id), 'pipeline_id': pipeline_id, 'status': status, 'jobs': jobs})
+
+    existing = {p.branch: p for p in pipelines_of_repository(git_repository_id)}
+    for branch in branches:
+        if branch not in existing:
+            # the branch exists without a running pipeline (and we missed its events)
+            modeldb.GitPipeline.objects.create(branch=branch, git_repository_id=int(git_repository_id),
+                                               status='failed')
+        elif existing[branch].status in ACTIVE_STATUSES and existing[branch].last_update < started:
+            existing[branch].status = 'failed'
+            existing[branch].save()
+
+    stale = [b for b, p in existing.items() if b not in pipelines and b not in branches and p.last_update < started]
+    if stale:
+        logger.info(f'Remove the pipeline states of {len(stale)} deleted branches of repository {git_repository_id}.')
+        modeldb.GitPipeline.objects.filter(branch__in=stale).delete()
+
+    # the job configurations of branches that no longer exist (e.g., deleted without stop_job_and_clean_up)
+    existing_branches = set(pipelines) | set(branches) | \
+        set(pipelines_of_repository(git_repository_id).values_list('branch', flat=True))
+    stale = [b for b in modeldb.GitJobConfiguration.objects.filter(git_repository_id=int(git_repository_id),
+                                                                   created__lt=started).values_list('branch', flat=True)
+             if b not in existing_branches]
+    for i in range(0, len(stale), 500):
+        modeldb.GitJobConfiguration.objects.filter(branch__in=stale[i:i + 500]).delete()
+
+
+def save_job_configuration(git_repository_id, branch, metadata, job_config):
+    modeldb.GitJobConfiguration.objects.update_or_create(branch=branch, defaults={
+        'run_id': metadata.get('TIRA_RUN_ID', ''), 'git_repository_id': int(git_repository_id), 'metadata': metadata,
+        'job_config': job_config})
+
+
+def job_configuration(branch):
+    """ The job_config of the submission on the branch, or None if it was not stored. """
+    ret = modeldb.GitJobConfiguration.objects.filter(branch=branch).values_list('job_config', flat=True).first()
+    return ret if ret else None
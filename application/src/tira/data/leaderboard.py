@@ -0,0 +1,212 @@
+"""
+These methods maintain the materialized leaderboards (modeldb.LeaderboardEntry).
+Each evaluation run with measures on a dataset has exactly one entry. The entries are updated incrementally when
+evaluations are parsed, reviews are changed, or runs are deleted, so that reading a leaderboard is a single query.
+"""
+from django.db import transaction
+import tira.model as modeldb
+import logging
+
+logger = logging.getLogger("tira_db")
+
+
+def _vm_of_input_run(run):
+    try:
+        input_run = run.input_run
+        if input_run.software:
+            return input_run.software.vm.vm_id
+        elif input_run.docker_software:
+            return input_run.docker_software.vm.vm_id
+        elif input_run.upload:
+            return input_run.upload.vm.vm_id
+
+        logger.error(f"The input run {run.run_id} has no vm assigned. Assigning None instead")
+    except AttributeError as e:
+        logger.error(f"The vm or software of run {run.run_id} does not exist. Maybe either was deleted?", e)
+
+    return "None"
+
+
+def _runs_with_input_run():
+    return modeldb.Run.objects.select_related(
+        'input_run', 'input_run__software__vm', 'input_run__docker_software__vm', 'input_run__upload__vm'
+    ).exclude(input_run__isnull=True).exclude(input_dataset__isnull=True)
+
+
+def _measures_by_run(evaluations):
+    """ Group evaluations by run, the first value of a measure wins if it was parsed multiple times. """
+    ret = {}
+    for ev in evaluations.order_by('id').values('run_id', 'measure_key', 'measure_value'):
+        measures = ret.setdefault(ev['run_id'], {})
+        if ev['measure_key'] not in measures:
+            measures[ev['measure_key']] = ev['measure_value']
+
+    return {run_id: [[k, v] for k, v in measures.items()] for run_id, measures in ret.items()}
+
+
+def _entries(runs, evaluations, reviews):
+    measures = _measures_by_run(evaluations)
+    reviews = {review['run_id']: review for review in reviews.values('run_id', 'published', 'blinded')}
+
+    ret = []
+    for run in runs:
+        if run.run_id not in measures:
+            continue
+        if run.run_id not in reviews:
+            logger.error(f"The evaluation run {run.run_id} has no review. It is not added to the leaderboard.")
+            continue
+
+        ret.append(modeldb.LeaderboardEntry(run_id=run.run_id, dataset_id=run.input_dataset_id,
+                                            vm_id=_vm_of_input_run(run), input_run_id=run.input_run_id,
+                                            published=reviews[run.run_id]['published'],
+                                            blinded=reviews[run.run_id]['blinded'],
+                                            has_software=run.software_id is not None,
+                                            measures=measures[run.run_id]))
+
+    return ret
+
+
+def build_entries(dataset_id=None):
+    """ Compute the (unsaved) leaderboard entries from the runs, reviews, and evaluations with a constant number of
+    queries.
+
+    @param dataset_id: only build the entries of this dataset. All datasets if None.
+    :returns: a list of modeldb.LeaderboardEntry
+    """
+    runs = _runs_with_input_run()
+    evaluations = modeldb.Evaluation.objects.exclude(run__input_dataset__isnull=True)
+    reviews = modeldb.Review.objects.all()
+    if dataset_id:
+        runs = runs.filter(input_dataset__dataset_id=dataset_id)
+        evaluations = evaluations.filter(run__input_dataset__dataset_id=dataset_id)
+        reviews = reviews.filter(run__input_dataset__dataset_id=dataset_id)
+
+    return _entries(runs, evaluations, reviews)
+
+
+def update_entry(run_id):
+    """ Create, update, or remove the leaderboard entry of the run so that it reflects the database. If the dataset
+    of the run has no entries yet, all entries of the dataset are built.
+    """
+    entries = _entries(_runs_with_input_run().filter(run_id=run_id),
+                       modeldb.Evaluation.objects.filter(run__run_id=run_id),
+                       modeldb.Review.objects.filter(run__run_id=run_id))
+
+    if not entries:
+        modeldb.LeaderboardEntry.objects.filter(run_id=run_id).delete()
+        return
+
+    entry = entries[0]
+    if not modeldb.LeaderboardEntry.objects.filter(dataset_id=entry.dataset_id).exists():
+        # get_leaderboard computes datasets without entries on the fly, so the first entry of a dataset must
+        # materialize its complete leaderboard, not only this run
+        rebuild(entry.dataset_id)
+        return
+
+    modeldb.LeaderboardEntry.objects.update_or_create(run_id=run_id, defaults={
+        'dataset_id': entry.dataset_id,
+        'vm_id': entry.vm_id,
+        'input_run_id': entry.input_run_id,
+        'published': entry.published,
+        'blinded': entry.blinded,
+        'has_software': entry.has_software,
+        'measures': entry.measures
+    })
+
+
+def update_entries_of_input_run(input_run_id):
+    """ The owner of an input run may only be known after it was parsed, so the entries evaluating it are refreshed. """
+    for run_id in modeldb.LeaderboardEntry.objects.filter(input_run_id=input_run_id).values_list('run_id', flat=True):
+        update_entry(run_id)
+
+
+def update_review(run_id, published, blinded):
+    modeldb.LeaderboardEntry.objects.filter(run_id=run_id).update(published=published, blinded=blinded)
+
+
+def delete_entry(run_id):
+    modeldb.LeaderboardEntry.objects.filter(run_id=run_id).delete()
+
+
+def rebuild(dataset_id=None):
+    """ Rebuild the leaderboard entries of the dataset (all datasets if None) from scratch.
+
+    :returns: the number of entries
+    """
+    entries = build_entries(dataset_id)
+    with transaction.atomic():
+        stored = modeldb.LeaderboardEntry.objects.all()
+        if dataset_id:
+            stored = stored.filter(dataset__dataset_id=dataset_id)
+        stored.delete()
+        modeldb.LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+
+    return len(entries)
+
+
+def _entry_as_tuple(entry):
+    return (entry.dataset_id, entry.vm_id, entry.input_run_id, entry.published, entry.blinded, entry.has_software,
+            [list(m) for m in entry.measures])
+
+
+def drift(dataset_id=None):
+    """ Compare the stored leaderboard entries with the entries computed from the database.
+
+    :returns: a dict {'missing': [run_id], 'outdated': [run_id], 'orphaned': [run_id]} where missing entries are not
+        stored, outdated entries differ from the database, and orphaned entries should not exist.
+    """
+    expected = {entry.run_id: _entry_as_tuple(entry) for entry in build_entries(dataset_id)}
+    stored = modeldb.LeaderboardEntry.objects.all()
+    if dataset_id:
+        stored = stored.filter(dataset__dataset_id=dataset_id)
+    stored = {entry.run_id: _entry_as_tuple(entry) for entry in stored}
+
+    return {'missing': sorted(set(expected.keys()) - set(stored.keys())),
+            'outdated': sorted([i for i in expected.keys() if i in stored and stored[i] != expected[i]]),
+            'orphaned': sorted(set(stored.keys()) - set(expected.keys()))}
+
+
+def leaderboard_from_entries(entries, include_unpublished=False, round_floats=True):
+    """ Format leaderboard entries as a tuple (ev_keys, evaluations) as used to render the leaderboards.
+
+    @param include_unpublished: If True, also contains evaluations that were not marked as 'published'
+    @param round_floats: If True, round float-valued scores to 3 digits.
+    """
+    def round_if_float(fl):
+        if not round_floats:
+            return fl
+        try:
+            return round(float(fl), 3)
+        except ValueError:
+            return fl
+
+    keys = []
+    for entry in entries:
+        keys += [k for k, _ in entry.measures if k not in keys]
+
+    ret = []
+    for entry in entries:
+        if not include_unpublished and not entry.published and not entry.has_software:
+            continue
+        measures = dict(entry.measures)
+        ret.append({"vm_id": entry.vm_id,
+                    "run_id": entry.run_id,
+                    'input_run_id': entry.input_run_id,
+                    'published': entry.published,
+                    'blinded': entry.blinded,
+                    "measures": [round_if_float(measures[k]) if k in measures else "-" for k in keys]})
+
+    return keys, ret
+
+
+def get_leaderboard(dataset_id, include_unpublished=False, round_floats=True):
+    """ Read the leaderboard of the dataset from the materialized entries. Datasets without entries (e.g., before the
+    first rebuild_leaderboards) are computed from the evaluations without storing them, reads never write.
+    """
+    entries = list(modeldb.LeaderboardEntry.objects.filter(dataset__dataset_id=dataset_id).order_by('run_id'))
+    if not entries:
+        entries = sorted(build_entries(dataset_id), key=lambda entry: entry.run_id)
+        if entries:
+            logger.info(f"No materialized leaderboard for dataset {dataset_id}, run rebuild_leaderboards to store it.")
+
+    return leaderboard_from_entries(entries, include_unpublished, round_floats)
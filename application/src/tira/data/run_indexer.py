@@ -0,0 +1,380 @@
+"""
+A bulk indexer for the runs in data/runs/<dataset>/<vm>/<run>.
+
+In contrast to data.parse_run, which issues several queries per run, the protobuf files are parsed in a process pool,
+the foreign keys are resolved from maps that are loaded once, and the runs, reviews, and evaluations are written with
+bulk_create/bulk_update in batched transactions. The semantics follow data._parse_run, data._parse_review, and
+data._parse_evalutions.
+"""
+from multiprocessing import Pool
+from google.protobuf.text_format import Parse
+from django.db import transaction, connections
+from tira.proto import TiraClientWebMessages_pb2 as modelpb
+from tira.util import auto_reviewer
+import tira.model as modeldb
+import tira.data.leaderboard as leaderboard
+from pathlib import Path
+from tqdm import tqdm
+import hashlib
+import logging
+import time
+import os
+
+logger = logging.getLogger("tira")
+
+RUN_FIELDS = ['software', 'docker_software', 'evaluator', 'upload', 'input_dataset', 'input_run', 'task',
+              'downloadable', 'deleted', 'access_token']
+REVIEW_FIELDS = ['reviewer_id', 'review_date', 'no_errors', 'missing_output', 'extraneous_output', 'invalid_output',
+                 'has_error_output', 'other_errors', 'comment', 'has_errors', 'has_warnings', 'has_no_errors',
+                 'published', 'blinded']
+
+
+class RunsDirectoryUnavailable(Exception):
+    """ The runs directory is missing, unreadable, or unexpectedly empty (e.g., the volume is not mounted). """
+    pass
+
+
+def all_run_dirs(runs_dir_path, vm_id=None):
+    """ Yield all run directories data/runs/<dataset>/<vm>/<run> (of the vm_id if given) """
+    for dataset_dir in runs_dir_path.glob("*"):
+        for vm_dir in ([dataset_dir / vm_id] if vm_id else dataset_dir.glob("*")):
+            for run_dir in vm_dir.glob("*"):
+                if run_dir.is_dir():
+                    yield run_dir
+
+
+def read_run_dir(run_dir):
+    """ Parse the protobuf files of a run directory into a picklable dict. Executed in the worker processes, so this
+    must not access the database. The files are normalized as in data.parse_run.
+    """
+    run_dir = Path(run_dir)
+    try:
+        if (run_dir / "run.prototext").exists():
+            run_proto = Parse(open(run_dir / "run.prototext", "r").read(), modelpb.Run())
+            open(run_dir / "run.bin", 'wb').write(run_proto.SerializeToString())
+        elif (run_dir / "run.bin").exists():
+            run_proto = modelpb.Run()
+            run_proto.ParseFromString(open(run_dir / "run.bin", "rb").read())
+        else:
+            return {'error': f'Skip run {run_dir.stem}: No "run.prototext" or "run.bin" exists in {run_dir}'}
+
+        if not (run_dir / "run-review.bin").exists():
+            review = auto_reviewer(run_dir, run_dir.stem)
+            open(run_dir / "run-review.prototext", 'w').write(str(review))
+            open(run_dir / "run-review.bin", 'wb').write(review.SerializeToString())
+        else:
+            review = modelpb.RunReview()
+            review.ParseFromString(open(run_dir / "run-review.bin", "rb").read())
+
+        measures = []
+        if (run_dir / "output/evaluation.prototext").exists() and not (run_dir / "output/evaluation.bin").exists():
+            evaluation = Parse(open(run_dir / "output/evaluation.prototext", "r").read(), modelpb.Evaluation())
+            open(run_dir / "output" / "evaluation.bin", 'wb').write(evaluation.SerializeToString())
+        if (run_dir / "output/evaluation.bin").exists():
+            evaluation = modelpb.Evaluation()
+            evaluation.ParseFromString(open(run_dir / "output/evaluation.bin", "rb").read())
+            measures = [(measure.key, measure.value) for measure in evaluation.measure]
+    except Exception as e:
+        return {'error': f'Skip run {run_dir.stem}: Could not parse the files in {run_dir}: {e}'}
+
+    return {
+        'run_dir': str(run_dir),
+        'vm_id': run_dir.parent.stem,
+        'run_id': run_proto.runId,
+        'software_id': run_proto.softwareId,
+        'input_dataset': run_proto.inputDataset,
+        'input_run': run_proto.inputRun,
+        'task_id': run_proto.taskId,
+        'downloadable': run_proto.downloadable,
+        'deleted': run_proto.deleted,
+        'access_token': run_proto.accessToken,
+        'review': {'reviewer_id': review.reviewerId, 'review_date': review.reviewDate, 'no_errors': review.noErrors,
+                   'missing_output': review.missingOutput, 'extraneous_output': review.extraneousOutput,
+                   'invalid_output': review.invalidOutput, 'has_error_output': review.hasErrorOutput,
+                   'other_errors': review.otherErrors, 'comment': review.comment, 'has_errors': review.hasErrors,
+                   'has_warnings': review.hasWarnings, 'has_no_errors': review.hasNoErrors,
+                   'published': review.published, 'blinded': review.blinded},
+        'measures': measures,
+    }
+
+
+class _ForeignKeys(object):
+    """ In-memory lookup tables for the foreign keys of runs, loaded once per indexing. """
+
+    def __init__(self):
+        self.vms = set(modeldb.VirtualMachine.objects.values_list('vm_id', flat=True))
+        self.tasks = set(modeldb.Task.objects.values_list('task_id', flat=True))
+        self.default_tasks = dict(modeldb.Dataset.objects.values_list('dataset_id', 'default_task_id'))
+        self.evaluators = set(modeldb.Evaluator.objects.values_list('evaluator_id', flat=True))
+        self.docker_softwares = set(modeldb.DockerSoftware.objects.values_list('docker_software_id', flat=True))
+        self.softwares = {(s['software_id'], s['vm_id'], s['task_id']): s['id'] for s in
+                          modeldb.Software.objects.values('id', 'software_id', 'vm_id', 'task_id')}
+        self.uploads = {}
+        for upload in modeldb.Upload.objects.values('id', 'vm_id', 'task_id').order_by('id'):
+            self.uploads.setdefault((upload['vm_id'], upload['task_id']), upload['id'])
+
+    def upload(self, vm_id, task_id):
+        if (vm_id, task_id) not in self.uploads:
+            upload, _ = modeldb.Upload.objects.get_or_create(vm_id=vm_id, task_id=task_id)
+            self.uploads[(vm_id, task_id)] = upload.id
+
+        return self.uploads[(vm_id, task_id)]
+
+    def resolve(self, parsed):
+        """ Resolve the foreign keys of a parsed run like data._parse_run.
+
+        :returns: a tuple (run, error) where run is an unsaved modeldb.Run or None if the run is skipped.
+        """
+        run_id, vm_id, software_id = parsed['run_id'], parsed['vm_id'], parsed['software_id']
+
+        if vm_id not in self.vms:
+            return None, f"Skip run {run_id}: VM {vm_id} does not exist"
+        if parsed['input_dataset'] not in self.default_tasks:
+            return None, f"Skip run {run_id}: Dataset {parsed['input_dataset']} does not exist"
+
+        task_id = parsed['task_id']
+        if not task_id or task_id == "None":
+            task_id = self.default_tasks[parsed['input_dataset']]
+        if task_id not in self.tasks:
+            return None, f"Skip run {run_id}: Task {task_id} does not exist"
+
+        run = modeldb.Run(run_id=run_id, input_dataset_id=parsed['input_dataset'], task_id=task_id,
+                          downloadable=parsed['downloadable'], deleted=parsed['deleted'],
+                          access_token=parsed['access_token'], input_run_id=parsed['input_run'] or None)
+
+        if 'docker-software-' in software_id:
+            try:
+                docker_software_id = int(software_id.split('docker-software-')[-1])
+                if docker_software_id in self.docker_softwares:
+                    run.docker_software_id = docker_software_id
+                    return run, None
+            except ValueError:
+                pass
+            logger.error(f"Run {run_id} lists a docker-software {software_id}, but None exists.")
+
+        if 'upload' in software_id:
+            run.upload_id = self.upload(vm_id, task_id)
+        elif 'eval' in software_id and software_id in self.evaluators:
+            run.evaluator_id = software_id
+        elif (software_id, vm_id, task_id) in self.softwares:
+            run.software_id = self.softwares[(software_id, vm_id, task_id)]
+        else:
+            logger.error(f"Run {run_id} is dangling: the software {software_id} does not exist.")
+
+        return run, None
+
+
+def _write_batch(batch):
+    """ Write a batch of (run, parsed) in one transaction with a constant number of queries. """
+    batch = list({run.run_id: (run, parsed) for run, parsed in batch}.values())
+    run_ids = [run.run_id for run, _ in batch]
+
+    with transaction.atomic():
+        # If a run has an input run, the input_run may be parsed later (or later in this batch), so we add a
+        # placeholder first. This way, no insert references a run that does not exist yet.
+        input_run_ids = {run.input_run_id for run, _ in batch if run.input_run_id}
+        modeldb.Run.objects.bulk_create([modeldb.Run(run_id=i) for i in input_run_ids], ignore_conflicts=True)
+
+        existing_runs = set(modeldb.Run.objects.filter(run_id__in=run_ids).values_list('run_id', flat=True))
+        modeldb.Run.objects.bulk_create([run for run, _ in batch if run.run_id not in existing_runs])
+        # like data._parse_run, an existing input run is not removed when the run file does not list one
+        updated_runs = [run for run, _ in batch if run.run_id in existing_runs]
+        modeldb.Run.objects.bulk_update([run for run in updated_runs if run.input_run_id], RUN_FIELDS)
+        modeldb.Run.objects.bulk_update([run for run in updated_runs if not run.input_run_id],
+                                        [i for i in RUN_FIELDS if i != 'input_run'])
+
+        existing_reviews = dict(modeldb.Review.objects.filter(run_id__in=run_ids).values_list('run_id', 'id'))
+        reviews = [modeldb.Review(id=existing_reviews.get(run.run_id), run_id=run.run_id, **parsed['review'])
+                   for run, parsed in batch]
+        modeldb.Review.objects.bulk_create([r for r in reviews if r.id is None])
+        modeldb.Review.objects.bulk_update([r for r in reviews if r.id is not None], REVIEW_FIELDS)
+
+        # The evaluation.bin of a run replaces its previous measures
+        evaluated_run_ids = [run.run_id for run, parsed in batch if parsed['measures']]
+        existing_evaluations = {(run_id, k, v): i for i, run_id, k, v in modeldb.Evaluation.objects.filter(
+            run_id__in=evaluated_run_ids).values_list('id', 'run_id', 'measure_key', 'measure_value')}
+        # a dict keeps the order of the measures in the files, the leaderboards order the measures by insertion
+        evaluations = dict.fromkeys((run.run_id, k, v) for run, parsed in batch for k, v in parsed['measures'])
+        modeldb.Evaluation.objects.filter(id__in=[i for k, i in existing_evaluations.items()
+                                                  if k not in evaluations]).delete()
+        modeldb.Evaluation.objects.bulk_create([modeldb.Evaluation(run_id=run_id, measure_key=k, measure_value=v)
+                                                for run_id, k, v in evaluations
+                                                if (run_id, k, v) not in existing_evaluations])
+
+
+def index_runs(runs_dir_path, run_dirs=None, processes=1, batch_size=500, verbose=False):
+    """ Index runs into the database.
+
+    @param runs_dir_path: the data/runs directory
+    @param run_dirs: the run directories to index. All run directories in runs_dir_path if None.
+    @param processes: the number of processes that parse the protobuf files, os.cpu_count() if None. With 1 (the
+        default), the files are parsed in this process. Use more processes only outside of requests (e.g., in the
+        management commands), since the pool is forked and the database connections of this process are closed.
+    @param batch_size: the number of runs that are written to the database in one transaction.
+    :returns: a dict with the statistics of the indexing {runs, skipped, seconds, runs_per_second} and the indexed
+        run directories {run_dirs: {run_dir: run_id}}
+    """
+    start = time.time()
+    run_dirs = [str(i) for i in (run_dirs if run_dirs is not None else all_run_dirs(runs_dir_path))]
+    foreign_keys = _ForeignKeys()
+    indexed, skipped, batch, dataset_ids = {}, 0, [], set()
+
+    def write_batch():
+        _write_batch(batch)
+        indexed.update({parsed['run_dir']: run.run_id for run, parsed in batch})
+
+    processes = min(processes or os.cpu_count(), max(len(run_dirs), 1))
+    pool = None
+    if processes > 1:
+        # the forked workers must not share the connections of this process
+        connections.close_all()
+        pool = Pool(processes)
+
+    try:
+        parsed_runs = pool.imap_unordered(read_run_dir, run_dirs, chunksize=16) if pool else map(read_run_dir, run_dirs)
+        for parsed in tqdm(parsed_runs, total=len(run_dirs), desc='index runs', disable=not verbose):
+            run, error = foreign_keys.resolve(parsed) if 'error' not in parsed else (None, parsed['error'])
+            if not run:
+                logger.warning(error)
+                skipped += 1
+                continue
+
+            batch.append((run, parsed))
+            dataset_ids.add(run.input_dataset_id)
+            if len(batch) >= batch_size:
+                write_batch()
+                batch = []
+    finally:
+        if pool:
+            pool.terminate()
+
+    if batch:
+        write_batch()
+
+    for dataset_id in dataset_ids:
+        leaderboard.rebuild(dataset_id)
+
+    seconds = time.time() - start
+    ret = {'runs': len(indexed), 'skipped': skipped, 'seconds': round(seconds, 2),
+           'runs_per_second': round(len(indexed) / seconds, 2) if seconds > 0 else len(indexed), 'run_dirs': indexed}
+    logger.info(f"Indexed {ret['runs']} runs ({ret['skipped']} skipped) in {ret['seconds']} seconds "
+                f"({ret['runs_per_second']} runs/sec).")
+
+    return ret
+
+
+MANIFEST_FILES = ['run.prototext', 'run.bin', 'run-review.bin', 'output/evaluation.prototext', 'output/evaluation.bin']
+
+
+def _stat_files(run_dir):
+    ret = {}
+    for name in MANIFEST_FILES:
+        try:
+            stat = os.stat(run_dir / name)
+            ret[name] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            pass
+
+    return ret
+
+
+def _sha1(file_name):
+    with open(file_name, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _fingerprints(run_dir, stat=None):
+    """ :returns: a dict {file name: [mtime_ns, size, sha1]} for the MANIFEST_FILES in the run directory """
+    stat = stat if stat is not None else _stat_files(run_dir)
+    return {name: mtime_and_size + [_sha1(run_dir / name)] for name, mtime_and_size in stat.items()}
+
+
+def _has_changed(run_dir, stat, files):
+    """ A run directory changed if files were added or removed, or if the content of a file with a different mtime or
+    size differs. The hashes are only computed if mtime or size differ.
+    """
+    if set(stat.keys()) != set(files.keys()):
+        return True
+
+    return any(stat[name] != files[name][:2] and _sha1(run_dir / name) != files[name][2] for name in stat)
+
+
+def is_indexed(runs_dir_path, run_dir):
+    """ True if the run directory did not change since it was last indexed. """
+    entry = modeldb.IndexedRunDirectory.objects.filter(run_dir=str(run_dir.relative_to(runs_dir_path))).first()
+    return entry is not None and not _has_changed(run_dir, _stat_files(run_dir), entry.files)
+
+
+def mark_as_indexed(runs_dir_path, run_dir, run_id):
+    """ Record the current fingerprints of the run directory in the manifest. """
+    modeldb.IndexedRunDirectory.objects.update_or_create(run_dir=str(run_dir.relative_to(runs_dir_path)), defaults={
+        'vm_id': run_dir.parent.stem,
+        'run_id': run_id,
+        'files': _fingerprints(run_dir)
+    })
+
+
+def incremental_index_runs(runs_dir_path, vm_id=None, full=False, processes=1, batch_size=500, verbose=False):
+    """ Index only the run directories that were added or changed since they were last indexed, and purge the runs of
+    run directories that disappeared. The state of the last indexing is kept in modeldb.IndexedRunDirectory.
+
+    @param runs_dir_path: the data/runs directory
+    @param vm_id: only index the runs of this vm. All runs if None.
+    @param full: If True, index all run directories, regardless of the manifest.
+    @param processes: see index_runs
+    :returns: the statistics of index_runs with the additional keys {unchanged, purged}
+    :raises RunsDirectoryUnavailable: if the runs directory is not readable, or if it contains no run directories
+        while the manifest is not empty. Nothing is purged in this case, since an unmounted volume would otherwise
+        delete all runs (and, by cascade, their evaluations).
+    """
+    runs_dir_path = Path(runs_dir_path)
+    if not runs_dir_path.is_dir() or not os.access(runs_dir_path, os.R_OK | os.X_OK):
+        raise RunsDirectoryUnavailable(f"The runs directory {runs_dir_path} does not exist or is not readable.")
+
+    manifest = modeldb.IndexedRunDirectory.objects.all()
+    if vm_id:
+        manifest = manifest.filter(vm_id=vm_id)
+    manifest = {i.run_dir: i for i in manifest}
+
+    run_dirs = list(all_run_dirs(runs_dir_path, vm_id))
+    if not run_dirs and manifest:
+        raise RunsDirectoryUnavailable(f"The runs directory {runs_dir_path} contains no run directories, but "
+                                       f"{len(manifest)} were indexed before. Refuse to purge them.")
+
+    to_index, unchanged, touched = [], 0, []
+    for run_dir in run_dirs:
+        entry = manifest.pop(str(run_dir.relative_to(runs_dir_path)), None)
+        stat = _stat_files(run_dir)
+
+        if full or not entry or _has_changed(run_dir, stat, entry.files):
+            to_index.append(run_dir)
+        else:
+            unchanged += 1
+            if any(stat[name] != entry.files[name][:2] for name in stat):
+                entry.files = {name: stat[name] + [entry.files[name][2]] for name in stat}
+                touched.append(entry)
+
+    ret = index_runs(runs_dir_path, to_index, processes, batch_size, verbose)
+
+    # The remaining entries of the manifest are run directories that disappeared. A run directory that was moved or
+    # renamed keeps its run_id and was just indexed at its new path, so its run must not be purged.
+    indexed_run_ids = set(ret['run_dirs'].values())
+    purged_run_ids = [entry.run_id for entry in manifest.values() if entry.run_id not in indexed_run_ids]
+    with transaction.atomic():
+        modeldb.Run.objects.filter(run_id__in=purged_run_ids).delete()
+        modeldb.IndexedRunDirectory.objects.filter(run_dir__in=list(manifest.keys())).delete()
+
+        modeldb.IndexedRunDirectory.objects.bulk_update(touched, ['files'], batch_size=batch_size)
+        indexed = [modeldb.IndexedRunDirectory(run_dir=str(Path(run_dir).relative_to(runs_dir_path)),
+                                               vm_id=Path(run_dir).parent.stem, run_id=run_id,
+                                               files=_fingerprints(Path(run_dir)))
+                   for run_dir, run_id in ret['run_dirs'].items()]
+        modeldb.IndexedRunDirectory.objects.bulk_create(indexed, batch_size=batch_size, update_conflicts=True,
+                                                        unique_fields=['run_dir'],
+                                                        update_fields=['vm_id', 'run_id', 'files', 'last_indexed'])
+
+    ret.update({'unchanged': unchanged, 'purged': len(purged_run_ids)})
+    logger.info(f"Incremental indexing: {ret['runs']} runs indexed, {ret['unchanged']} unchanged, "
+                f"{ret['purged']} purged.")
+
+    return ret
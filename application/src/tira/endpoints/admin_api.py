@@ -1,7 +1,6 @@
 import logging
 
 from django.conf import settings
-import traceback
 
 from tira.authentication import auth
 from tira.checks import check_permissions, check_resources_exist, check_conditional_permissions
@@ -12,6 +11,8 @@ from http import HTTPStatus
 import json
 from datetime import datetime as dt
 from tira.git_runner import check_that_git_integration_is_valid
+import tira.background_jobs as background_jobs
+import tira.gitlab_client as gitlab_client
 
 import tira.tira_model as model
 
@@ -38,10 +39,8 @@ def handle_get_model_exceptions(func):
 @check_permissions
 @handle_get_model_exceptions
 def admin_reload_data():
-    model.build_model()
-    if auth.get_auth_source() == 'legacy':
-        auth.load_legacy_users()
-    return "Model data was reloaded successfully"
+    job_id = background_jobs.start_job("Reload the model data", 'reload_data', {})
+    return f"The model data is reloaded in background job {job_id}."
 
 
 @check_permissions
@@ -68,8 +67,8 @@ def admin_reload_tasks():
 @check_conditional_permissions(restricted=True)
 @handle_get_model_exceptions
 def admin_reload_runs(vm_id):
-    model.reload_runs(vm_id)
-    return "Runs data was reloaded for {} on {} successfully"
+    job_id = background_jobs.start_job(f"Reload the runs of {vm_id}", 'index_runs', {'vm_id': vm_id})
+    return f"The runs of {vm_id} are reloaded in background job {job_id}."
 
 
 @check_permissions
@@ -169,6 +168,13 @@ def admin_delete_task(request, task_id):
     return JsonResponse({'status': 0, 'message': f"Deleted task {task_id}"})
 
 
+def _start_create_task_repository_job(task_id, dataset_id):
+    """ Creating a repository pushes an initial commit, so it runs as background job that sets the repository of the
+    evaluator of the dataset when it is done. """
+    return background_jobs.start_job(f"Create the git repository of task {task_id}", 'create_task_repository',
+                                     {'task_id': task_id, 'dataset_id': dataset_id})
+
+
 @check_permissions
 def admin_add_dataset(request):
     """ Create an entry in the model for the task. Use data supplied by a model.
@@ -193,9 +199,6 @@ def admin_add_dataset(request):
         git_runner_command = data.get("git_runner_command", "")
         git_repository_id = data.get("git_repository_id", "")
 
-        if not data.get("use_existing_repository", True):
-            git_repository_id = model.get_git_integration(task_id=task_id).create_task_repository(task_id)
-
         master_vm_id = model.get_task(task_id)["master_vm_id"]
 
         if not model.task_exists(task_id):
@@ -212,10 +215,12 @@ def admin_add_dataset(request):
             model.add_evaluator(master_vm_id, task_id, ds['dataset_id'], command, working_directory, not measures,
                                 is_git_runner, git_runner_image, git_runner_command, git_repository_id)
             path_string = '\n '.join(paths)
-            return JsonResponse(
-                {'status': 0, 'context': ds, 'message': f"Created new dataset with id {ds['dataset_id']}. "
-                                                        f"Store your datasets in the following Paths:\n"
-                                                        f"{path_string}"})
+            message = f"Created new dataset with id {ds['dataset_id']}. Store your datasets in the following " \
+                      f"Paths:\n{path_string}"
+            if not data.get("use_existing_repository", True):
+                job_id = _start_create_task_repository_job(task_id, ds['dataset_id'])
+                message += f"\nThe git repository of the task is created in background job {job_id}."
+            return JsonResponse({'status': 0, 'context': ds, 'message': message})
         except FileExistsError as e:
             logger.exception(e)
             return JsonResponse({'status': 1, 'message': f"A Dataset with this id already exists."})
@@ -264,9 +269,6 @@ def admin_edit_dataset(request, dataset_id):
 
         print(data["use_existing_repository"])
         print(data["git_repository_id"])
-        if not data["use_existing_repository"]:
-            git_repository_id = model.get_git_integration(task_id=task_id).create_task_repository(task_id)
-
         upload_name = data["upload_name"]
 
         if not model.task_exists(task_id):
@@ -276,41 +278,15 @@ def admin_edit_dataset(request, dataset_id):
                                 measures, upload_name, is_confidential, is_git_runner, git_runner_image,
                                 git_runner_command, git_repository_id)
 
-        return JsonResponse(
-            {'status': 0, 'context': ds, 'message': f"Updated Dataset {ds['dataset_id']}."})
+        message = f"Updated Dataset {ds['dataset_id']}."
+        if not data["use_existing_repository"]:
+            job_id = _start_create_task_repository_job(task_id, ds['dataset_id'])
+            message += f" The git repository of the task is created in background job {job_id}."
+        return JsonResponse({'status': 0, 'context': ds, 'message': message})
 
     return JsonResponse({'status': 1, 'message': f"GET is not implemented for add dataset"})
 
 
-def call_django_command_failsave(cmd, args):
-    from django.core.management import call_command
-    from io import StringIO
-    import sys
-    
-    captured_stdout = StringIO()
-    captured_stderr = StringIO()
-    
-    error = None
-    
-    sys.stdout = captured_stdout
-    sys.stderr = captured_stderr
-    
-    try:
-        call_command(cmd, **args)
-    except Exception as e:
-        error = str(e)
-        error += '\n\n' + traceback.format_exc()
-    
-    sys.stdout = sys.__stdout__
-    sys.stderr = sys.__stderr__
-    
-    return {
-        'stdout': str(captured_stdout.getvalue()),
-        'stderr': str(captured_stderr.getvalue()),
-        'error': error
-    }
-
-
 @check_permissions
 def admin_import_ir_dataset(request):
     """ Create multiple datasets for the pased ir-dataset.
@@ -335,7 +311,6 @@ def admin_import_ir_dataset(request):
             is_git_runner = data.get("is_git_runner", True)
             git_runner_image = data.get("git_runner_image", settings.IR_MEASURES_IMAGE)
             git_runner_command = data.get("git_runner_command", settings.IR_MEASURES_COMMAND)
-            git_repository_id = model.get_git_integration(task_id=task_id).create_task_repository(task_id)
             master_vm_id = None
 
             try:
@@ -349,17 +324,42 @@ def admin_import_ir_dataset(request):
                 return JsonResponse({'status': 1, 'message': f"A Dataset with this id already exists."})
             
             model.add_evaluator(master_vm_id, task_id, ds['dataset_id'], command, working_directory, not measures,
-                                is_git_runner, git_runner_image, git_runner_command, git_repository_id)
+                                is_git_runner, git_runner_image, git_runner_command, None)
 
-            command_out = call_django_command_failsave('ir_datasets_loader_cli', {'ir_datasets_id': data["dataset_id"], 'output_dataset_path': dataset_path, 'output_dataset_truth_path': dataset_truth_path})
+            _start_create_task_repository_job(task_id, ds['dataset_id'])
+            job_id = background_jobs.start_job(f"Import ir_datasets {data['dataset_id']} into {ds['dataset_id']}",
+                                               'ir_datasets_loader_cli',
+                                               {'ir_datasets_id': data["dataset_id"], 'output_dataset_path': dataset_path,
+                                                'output_dataset_truth_path': dataset_truth_path})
 
             return JsonResponse(
-                {'status': 1 if command_out['error'] else 0, 'context': {}, 'message': f"Created new dataset with id .... "
-                                                        f"..." + str(command_out)})
+                {'status': 0, 'context': {'job_id': job_id}, 'message': f"Created new dataset with id {ds['dataset_id']}. "
+                                                                         f"The data is imported in background job {job_id}."})
 
     return JsonResponse({'status': 1, 'message': f"GET is not implemented for add dataset"})
 
 
+@check_permissions
+def admin_background_jobs(request):
+    """ The status and progress of the latest background jobs """
+    return JsonResponse({'status': 0, 'context': {'jobs': background_jobs.get_jobs()}})
+
+
+@check_permissions
+def admin_git_metrics(request):
+    """ The latency per endpoint and the rate limiting of the requests of this process to gitlab """
+    return JsonResponse({'status': 0, 'context': {'gitlab': gitlab_client.get_metrics()}})
+
+
+@check_permissions
+def admin_background_job(request, job_id):
+    """ The status of the background job with the tail of its output """
+    job = background_jobs.get_job(job_id)
+    if not job:
+        return JsonResponse({'status': 1, 'message': f"The background job {job_id} does not exist."})
+
+    return JsonResponse({'status': 0, 'context': {'job': job}})
+
 
 @check_permissions
 @check_resources_exist('json')
@@ -2,8 +2,9 @@ import logging
 import json
 from tira.forms import *
 import tira.tira_model as model
-from tira.checks import check_permissions, check_resources_exist, check_conditional_permissions
-from tira.tira_data import get_run_runtime, get_run_file_list, get_stderr, get_stdout, get_tira_log
+import tira.data.git_pipelines as git_pipelines
+from tira.checks import check_permissions, check_resources_exist, check_conditional_permissions, security_context
+from tira.tira_data import get_run_runtime, get_run_file_list, get_output_chunk, get_tira_log, OUTPUT_TYPES
 from tira.views import add_context, _add_user_vms_to_context
 from tira.authentication import auth
 
@@ -57,7 +58,7 @@ def get_evaluations_by_dataset(request, context, task_id, dataset_id):
     """
     role = context["role"]
 
-    ev_keys, evaluations = model.get_evaluations_with_keys_by_dataset(dataset_id, True if role == "admin" else None)
+    ev_keys, evaluations = model.get_leaderboard(dataset_id, True if role == "admin" else None)
 
     context["task_id"] = task_id
     context["dataset_id"] = dataset_id
@@ -211,7 +212,11 @@ def get_running_software(request, context, task_id, user_id, force_cache_refresh
 
     for git_repository_id in sorted(list(repositories)):
         context['running_software'] += list(git_runner.yield_all_running_pipelines(int(git_repository_id), user_id, cache, force_cache_refresh=eval(force_cache_refresh)))
-        context['running_software_last_refresh'] = model.load_refresh_timestamp_for_cache_key(cache, 'all-running-pipelines-repo-' + str(git_repository_id))
+        if git_pipelines.webhooks_enabled():
+            # the pipeline states are kept up to date by the webhooks
+            context['running_software_last_refresh'] = datetime.datetime.now()
+        else:
+            context['running_software_last_refresh'] = model.load_refresh_timestamp_for_cache_key(cache, 'all-running-pipelines-repo-' + str(git_repository_id))
         context['running_software_next_refresh'] = str(context['running_software_last_refresh'] + datetime.timedelta(seconds=15))
         context['running_software_last_refresh'] = str(context['running_software_last_refresh'])
 
@@ -222,24 +227,37 @@ def get_running_software(request, context, task_id, user_id, force_cache_refresh
     return JsonResponse({'status': 0, "context": context})
 
 
+def _run_output_is_visible(context, dataset, review):
+    return context['role'] == 'admin' or ((context['role'] == auth.ROLE_PARTICIPANT) and
+                                          ((not dataset.get('is_confidential', True)) or not review['blinded']))
+
+
+def _add_run_output_to_context(context, dataset_id, vm_id, run_id):
+    """ Add the last lines of stdout and stderr. Earlier lines are loaded on demand via get_run_output. """
+    for output_type in OUTPUT_TYPES:
+        chunk = get_output_chunk(dataset_id, vm_id, run_id, output_type)
+        context[output_type] = chunk['text'] if chunk['text'] else f"No {output_type.capitalize()} recorded"
+        context[f"{output_type}_start"] = chunk['start']
+        context[f"{output_type}_more_lines"] = chunk['more_lines']
+
+
 @check_permissions
 @check_resources_exist("json")
 @add_context
 def get_review(request, context, dataset_id, vm_id, run_id):
-    context["dataset"] = model.get_dataset(dataset_id)
+    ctx = security_context(request)
+    context["dataset"] = ctx.dataset(dataset_id)
     context["run"] = model.get_run(None, None, run_id)
-    context["review"] = model.get_run_review(dataset_id, vm_id, run_id)
+    context["review"] = ctx.run_review(dataset_id, vm_id, run_id)
     context["runtime"] = get_run_runtime(dataset_id, vm_id, run_id)
     context["files"] = get_run_file_list(dataset_id, vm_id, run_id)
     if context['role'] == 'admin':
         context["files"]["file_list"][0] = "output/"
-        context["stdout"] = get_stdout(dataset_id, vm_id, run_id)
-        context["stderr"] = get_stderr(dataset_id, vm_id, run_id)
+        _add_run_output_to_context(context, dataset_id, vm_id, run_id)
         context["tira_log"] = get_tira_log(dataset_id, vm_id, run_id)
-    elif (context['role'] == auth.ROLE_PARTICIPANT) and ((not context['dataset'].get('is_confidential', True)) or not context["review"]['blinded']):
+    elif _run_output_is_visible(context, context['dataset'], context['review']):
         context["files"]["file_list"][0] = "output/"
-        context["stdout"] = get_stdout(dataset_id, vm_id, run_id)
-        context["stderr"] = get_stderr(dataset_id, vm_id, run_id)
+        _add_run_output_to_context(context, dataset_id, vm_id, run_id)
         context["review"]['blinded'] = False
         context["tira_log"] = "hidden"
     else:
@@ -251,6 +269,26 @@ def get_review(request, context, dataset_id, vm_id, run_id):
     return JsonResponse({'status': 0, "context": context})
 
 
+@check_permissions
+@check_resources_exist("json")
+@add_context
+def get_run_output(request, context, dataset_id, vm_id, run_id, output_type, end):
+    """ Page backwards through the stdout or stderr of a run: returns the chunk of lines that ends at the byte offset
+    end, i.e., the start of the previously loaded chunk. """
+    if output_type not in OUTPUT_TYPES or not str(end).isdigit():
+        return JsonResponse({'status': 1, 'message': f"Unknown output {output_type} or invalid offset {end}."},
+                            status=HTTPStatus.BAD_REQUEST)
+
+    ctx = security_context(request)
+    if not _run_output_is_visible(context, ctx.dataset(dataset_id), ctx.run_review(dataset_id, vm_id, run_id)):
+        return JsonResponse({'status': 1, 'message': f"The {output_type} of the run is hidden."},
+                            status=HTTPStatus.FORBIDDEN)
+
+    context['output'] = get_output_chunk(dataset_id, vm_id, run_id, output_type, int(end))
+
+    return JsonResponse({'status': 0, "context": context})
+
+
 @add_context
 def add_registration(request, context, task_id, vm_id):
     """ get the registration of a user on a task. If there is none """
@@ -1,43 +1,141 @@
 #!/usr/bin/env python3
+"""
+Render the ANSI colored stdout/stderr of runs as HTML in linear time. The styles are the ones of aha (which was
+called as a subprocess before): text is html-escaped, SGR sequences become <span style="...">, and all other escape
+sequences (e.g., cursor movements) are dropped. Logs where the escape character was lost (e.g., "[1;32m") are
+rendered as if it was present.
+"""
+from html import escape
 import re
-from subprocess import run, PIPE
-from bs4 import BeautifulSoup
-import os
 import logging
 
-ansi_color_code_regex = re.compile("\[(\\d)+(;)*(\\d)*m")
-aha_exec = os.path.abspath(__file__).replace('stdout_beautifier.py', 'aha')
-
 logger = logging.getLogger('tira')
 
-def is_start_of_ansi_code(txt, pos):
-    if txt[pos] != '[':
-        return False
-    
-    matches = ansi_color_code_regex.search(txt[pos: pos+8])
-    
-    return matches and matches.span()[0] == 0
+# An escape sequence with the escape character, or an SGR sequence where the escape character was lost.
+ansi_code_regex = re.compile('\x1b\\[([0-9;?]*)([@-~])|\\[(\\d+(?:;\\d+)*)m')
+
+COLORS = ['dimgray', 'red', 'green', 'olive', 'blue', 'purple', 'teal', 'gray']
+BRIGHT = 'filter: contrast(70%) brightness(190%);'
+
+
+def _color_256(code):
+    if code < 16:
+        return COLORS[code % 8]
+    if code < 232:
+        code -= 16
+        return '#' + ''.join(f'{[0, 95, 135, 175, 215, 255][i]:02x}' for i in (code // 36, (code // 6) % 6, code % 6))
+
+    return '#' + f'{8 + 10 * (code - 232):02x}' * 3
+
+
+class _SgrState(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.bold, self.italic, self.underline, self.blink, self.strike, self.inverse = [False] * 6
+        self.bright, self.fg, self.bg = False, None, None
+
+    def apply(self, params):
+        codes = [int(i) if i else 0 for i in params.split(';')] if params else [0]
+        i = 0
+        while i < len(codes):
+            code = codes[i]
+            if code == 0:
+                self.reset()
+            elif code in (1, 3, 4, 5, 7, 9):
+                setattr(self, {1: 'bold', 3: 'italic', 4: 'underline', 5: 'blink', 7: 'inverse', 9: 'strike'}[code],
+                        True)
+            elif code in (21, 22):
+                self.bold = False
+            elif code == 23:
+                self.italic = False
+            elif code == 24:
+                self.underline = False
+            elif code == 25:
+                self.blink = False
+            elif code == 27:
+                self.inverse = False
+            elif code == 29:
+                self.strike = False
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                self.fg, self.bright = COLORS[code % 10], code >= 90
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                self.bg, self.bright = COLORS[code % 10], code >= 100
+            elif code == 39:
+                self.fg = None
+            elif code == 49:
+                self.bg = None
+            elif code in (38, 48) and i + 2 < len(codes) and codes[i + 1] == 5:
+                setattr(self, 'fg' if code == 38 else 'bg', _color_256(codes[i + 2] % 256))
+                i += 2
+            elif code in (38, 48) and i + 4 < len(codes) and codes[i + 1] == 2:
+                setattr(self, 'fg' if code == 38 else 'bg',
+                        '#' + ''.join(f'{c % 256:02x}' for c in codes[i + 2:i + 5]))
+                i += 4
+            i += 1
+
+    def style(self):
+        fg, bg = (self.bg or 'white', self.fg or 'black') if self.inverse else (self.fg, self.bg)
+        decorations = [d for d, active in [('underline', self.underline), ('blink', self.blink),
+                                           ('line-through', self.strike)] if active]
+
+        return ''.join([BRIGHT if self.bright else '',
+                        'font-weight:bold;' if self.bold else '',
+                        'font-style:italic;' if self.italic else '',
+                        f'text-decoration:{" ".join(decorations)};' if decorations else '',
+                        f'color:{fg};' if fg else '',
+                        f'background-color:{bg};' if bg else ''])
+
+
+def ansi_to_html(chunks):
+    """ Convert an iterable of text chunks (e.g., the lines of a file) with ANSI escape sequences to HTML.
+    Yields the html fragments in a streaming fashion, the caller wraps them into a <pre>.
+    """
+    state, span_open, pending = _SgrState(), False, ''
+
+    for chunk in chunks:
+        text = pending + chunk
+        # an escape sequence may be split across chunks, keep the incomplete tail for the next chunk
+        tail = text.rfind('\x1b')
+        if tail >= 0 and not ansi_code_regex.match(text, tail):
+            text, pending = text[:tail], text[tail:]
+            if len(pending) > 64:
+                text, pending = text + pending, ''
+        else:
+            pending = ''
+
+        pos = 0
+        for match in ansi_code_regex.finditer(text):
+            if match.start() > pos:
+                yield escape(text[pos:match.start()].replace('\x1b', ''), quote=False)
+            pos = match.end()
+
+            params = match.group(3) if match.group(3) is not None else match.group(1)
+            if match.group(3) is None and match.group(2) != 'm':
+                continue  # not an SGR sequence, e.g., a cursor movement
+
+            state.apply(params)
+            if span_open:
+                yield '</span>'
+                span_open = False
+            style = state.style()
+            if style:
+                yield f'<span style="{style}">'
+                span_open = True
+
+        if pos < len(text):
+            yield escape(text[pos:].replace('\x1b', ''), quote=False)
+
+    if pending:
+        yield escape(pending.replace('\x1b', ''), quote=False)
+    if span_open:
+        yield '</span>'
+
 
 def beautify_ansi_text(txt):
-#    try:
-        ret = ''
-        for i in range(len(txt)):
-            if is_start_of_ansi_code(txt, i):
-                ret += '\033['
-            else:
-                ret += txt[i]
-        p = run([aha_exec], stdout=PIPE, input=ret, encoding='utf8')
-        ret = p.stdout
-        if p.returncode != 0:
-            raise ValueError(f'Returncode invalid: {p.returncode}. Got {ret}.')
-
-        ret = BeautifulSoup(ret, 'html.parser')
-        return '\n\n'.join([str(i) for i in ret.select('pre')])
-#    except Exception as e:
-#        print(f'Failed to beautify with {e}. Return original text')
-#        logger.warn(f'Failed to beautify with {e}. Return original text', e)
-#        
-#        return txt
+    return '<pre>\n' + ''.join(ansi_to_html(txt.splitlines(keepends=True))) + '</pre>'
+
 
 if __name__ == '__main__':
     print(beautify_ansi_text('''  [[92mo[0m] The file local-copy-of-input-run/run.jsonl is in JSONL format.
@@ -7,17 +7,22 @@ from grpc import RpcError, StatusCode
 from tira.authentication import auth
 from tira.checks import check_permissions, check_resources_exist, check_conditional_permissions
 from tira.forms import *
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from http import HTTPStatus
 
 from tira.model import TransitionLog, EvaluationLog, TransactionLog
-from tira.grpc_client import GrpcClient
+from tira.grpc_client import GrpcClient, get_metrics
 import tira.tira_model as model
+import tira.data.git_pipelines as git_pipelines
 from tira.util import get_tira_id, reroute_host
 from tira.views import add_context
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from functools import wraps
+import hmac
 import json
+import time
 
 include_navigation = True if settings.DEPLOYMENT == "legacy" else False
 
@@ -175,7 +180,6 @@ def vm_info(request, vm_id):
         grpc_client = GrpcClient(host)
         response_vm_info = grpc_client.vm_info(vm_id=vm_id)
         _ = TransitionLog.objects.update_or_create(vm_id=vm_id, defaults={'vm_state': response_vm_info.state})
-        del grpc_client
     except RpcError as e:
         ex_message = "FAILED"
         try:
@@ -192,7 +196,11 @@ def vm_info(request, vm_id):
         logger.exception(f"/grpc/{vm_id}/vm-info: connection to {host} failed with {e}")
         return JsonResponse({'status': 1, 'message': "SERVER_ERROR"}, status=HTTPStatus.INTERNAL_SERVER_ERROR)
 
-    return JsonResponse({'status': 0, 'context': {
+    return JsonResponse({'status': 0, 'context': _vm_info_to_dict(response_vm_info)})
+
+
+def _vm_info_to_dict(response_vm_info):
+    return {
         "guestOs": response_vm_info.guestOs,
         "memorySize": response_vm_info.memorySize,
         "numberOfCpus": response_vm_info.numberOfCpus,
@@ -202,7 +210,92 @@ def vm_info(request, vm_id):
         "sshPortStatus": response_vm_info.sshPortStatus,
         "rdpPortStatus": response_vm_info.rdpPortStatus,
         "state": response_vm_info.state,
-    }})
+    }
+
+
+def _query_host(host, vm_ids, deadline):
+    """ Query the state of all vms on one host until the deadline (a time.time()): one vm_list call, or concurrent
+    vm_info calls per vm if the host does not implement vm_list. Returns the vm infos by vm_id and the vm_ids that
+    failed. """
+    def client():
+        return GrpcClient(reroute_host(host), timeout=max(deadline - time.time(), 0.1))
+
+    try:
+        response = client().vm_list()
+        if response.transaction.status == 0 and response.vmsInfo:
+            return {i.vmId: dict(_vm_info_to_dict(i), vm_id=i.vmId) for i in response.vmsInfo}, {}
+    except RpcError as e:
+        if e.code() not in (StatusCode.UNIMPLEMENTED, StatusCode.UNKNOWN):
+            raise
+
+    def vm_info(vm_id):
+        try:
+            return dict(_vm_info_to_dict(client().vm_info(vm_id=vm_id)), vm_id=vm_id), None
+        except RpcError as e:
+            return None, 'VM is archived' if e.code() == StatusCode.INVALID_ARGUMENT else str(e.code())
+
+    vms, failed = {}, {}
+    if vm_ids:
+        with ThreadPoolExecutor(max_workers=min(len(vm_ids), settings.GRPC_FANOUT_WORKERS)) as executor:
+            for vm_id, (vm, error) in zip(vm_ids, executor.map(vm_info, vm_ids)):
+                if vm:
+                    vms[vm_id] = vm
+                else:
+                    failed[vm_id] = error
+    return vms, failed
+
+
+@check_permissions
+def vm_overview(request):
+    """ The state of all vms on all hosts in virtual-machine-hosts.txt. The hosts are queried concurrently (at most
+    settings.GRPC_FANOUT_WORKERS at once), all calls to the hosts end within settings.GRPC_DEADLINE seconds, so the
+    overview takes at most as long as the deadline. Hosts that fail or do not answer in time are reported in
+    failed_hosts, the vms of the other hosts are returned nevertheless.
+    """
+    start = time.time()
+    deadline = start + settings.GRPC_DEADLINE
+
+    vms_by_host = {host: [] for host in model.get_host_list() if host}
+    for host, vm_id, _ in model.get_vm_list():
+        vms_by_host.setdefault(host, []).append(vm_id)
+
+    vms, hosts, failed_hosts = [], {}, {}
+
+    def collect(host, future):
+        try:
+            host_vms, failed_vms = future.result()
+            vms.extend(host_vms.values())
+            hosts[host] = {'vms': len(host_vms), 'failed_vms': failed_vms}
+        except RpcError as e:
+            failed_hosts[host] = "Host Unavailable" if e.code() == StatusCode.UNAVAILABLE else str(e.code())
+            logger.warning(f"vm-overview: querying {host} failed with {e.code()}")
+        except Exception as e:
+            failed_hosts[host] = "SERVER_ERROR"
+            logger.exception(f"vm-overview: querying {host} failed with {e}")
+
+    if vms_by_host:
+        executor = ThreadPoolExecutor(max_workers=min(len(vms_by_host), settings.GRPC_FANOUT_WORKERS))
+        futures = {executor.submit(_query_host, host, vm_ids, deadline): host for host, vm_ids in vms_by_host.items()}
+        pending = dict(futures)
+        try:
+            # a second of slack for the calls that end at the deadline
+            for future in as_completed(futures, timeout=max(deadline - time.time(), 0) + 1):
+                collect(pending.pop(future), future)
+        except TimeoutError:
+            for future, host in pending.items():
+                if future.done():
+                    collect(host, future)
+                else:
+                    future.cancel()
+                    failed_hosts[host] = str(StatusCode.DEADLINE_EXCEEDED)
+                    logger.warning(f"vm-overview: querying {host} did not finish before the deadline")
+        finally:
+            # do not wait for the calls that exceed the deadline, they end on their own
+            executor.shutdown(wait=False)
+
+    return JsonResponse({'status': 0, 'context': {
+        'vms': sorted(vms, key=lambda i: i['vm_id']), 'hosts': hosts, 'failed_hosts': failed_hosts,
+        'seconds': round(time.time() - start, 3), 'grpc': get_metrics()}})
 
 
 # ---------------------------------------------------------------------
@@ -296,7 +389,6 @@ def run_execute(request, task_id, vm_id, software_id):
                                        optional_parameters="",
                                        task_id=task_id,
                                        software_id=software_id)
-    del grpc_client
     return response
 
 
@@ -313,7 +405,6 @@ def _master_vm_eval_call(vm_id, dataset_id, run_id, evaluator):
                                     input_run_dataset_id=dataset_id,
                                     input_run_run_id=run_id,
                                     optional_parameters="")
-    del grpc_client
     return response
 
 
@@ -377,7 +468,75 @@ def run_abort(request, vm_id):
 
     grpc_client = GrpcClient(host)
     response = grpc_client.run_abort(vm_id=vm_id)
-    del grpc_client
+    return response
+
+
+class _OutputStream(object):
+    """ The events of a run_output response. Closing it (Django closes the response, also when it was not iterated)
+    releases the slot of the stream. """
+    def __init__(self, events, slot):
+        self.events = events
+        self.slot = slot
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.events)
+
+    def close(self):
+        try:
+            self.events.close()
+        finally:
+            if self.slot:
+                cache.delete(self.slot)
+                self.slot = None
+
+
+def _acquire_output_stream_slot():
+    """ Each web worker that relays a run_output stream is blocked until the stream ends, so at most
+    settings.GRPC_MAX_OUTPUT_STREAMS streams run at once (across all processes, the slots are kept in the cache and
+    expire with the deadline of the stream, e.g., if a worker was killed). Returns the cache key of the slot or None.
+    """
+    for i in range(settings.GRPC_MAX_OUTPUT_STREAMS):
+        slot = f'tira-run-output-stream-{i}'
+        if cache.add(slot, True, timeout=settings.GRPC_STREAM_DEADLINE + 30):
+            return slot
+
+    return None
+
+
+@check_permissions
+@check_resources_exist('json')
+def run_output(request, vm_id):
+    """ Relay the output of the running execution of the vm from the host (run_output stream of the host) as
+    server-sent events, so that viewers see new lines as they are written instead of polling stdout.txt.
+    Each response ends after settings.GRPC_STREAM_DEADLINE seconds and the EventSource of the viewer reconnects (the
+    host sends the lines in its buffer again). If too many streams run, the request is answered with 503.
+    """
+    vm = model.get_vm(vm_id)
+    host = reroute_host(vm['host'])
+    slot = _acquire_output_stream_slot()
+    if not slot:
+        return JsonResponse({'status': 1, 'message': "Too many viewers follow the output of runs, please try again "
+                                                     "later."}, status=HTTPStatus.SERVICE_UNAVAILABLE)
+
+    def events():
+        yield 'retry: 2000\n\n'
+        try:
+            for chunk in GrpcClient(host).run_output(vm_id=vm_id):
+                yield ''.join(f'data: {line}\n' for line in chunk.splitlines()) + '\n'
+            yield 'event: end\ndata: \n\n'
+        except RpcError as e:
+            if e.code() == StatusCode.DEADLINE_EXCEEDED:
+                return  # the viewer reconnects
+            if e.code() != StatusCode.CANCELLED:
+                logger.warning(f"/grpc/{vm_id}/run_output: stream from {host} failed with {e.code()}")
+            yield f'event: failed\ndata: {e.code()}\n\n'
+
+    response = StreamingHttpResponse(_OutputStream(events(), slot), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
     return response
 
 
@@ -488,6 +647,104 @@ def run_execute_docker_software(request, task_id, vm_id, dataset_id, docker_soft
     
     return JsonResponse({'status': 0}, status=HTTPStatus.ACCEPTED)
 
+
+@check_permissions
+@check_resources_exist('json')
+def run_execute_docker_software_batch(request, task_id, vm_id):
+    """ Submit a batch of docker softwares of the vm_id to datasets. The body is a json object with a list of at most
+    settings.GIT_MAX_BATCH_SIZE jobs: {"jobs": [{"docker_software_id": ..., "dataset_id": ..., "resources": ...}, ...]}
+    Returns for each job (in the same order) its dataset_id, tira_software_id, resources, and status: 'submitted' with
+    the run_id and transaction_id, or 'duplicate'/'failed' with a message why it was not submitted. """
+    if request.method != 'POST':
+        return JsonResponse({"status": 1, "message": "Only POST is allowed here"})
+
+    try:
+        jobs = json.loads(request.body)['jobs']
+    except (ValueError, KeyError, TypeError):
+        jobs = None
+    if not isinstance(jobs, list):
+        return JsonResponse({"status": 1, "message": "Please pass the jobs as json: {\"jobs\": [...]}."})
+    if len(jobs) > settings.GIT_MAX_BATCH_SIZE:
+        return JsonResponse({"status": 1, "message": f"Please submit at most {settings.GIT_MAX_BATCH_SIZE} jobs at once."})
+
+    git_runner = model.get_git_integration(task_id=task_id)
+    if not git_runner:
+        return JsonResponse({"status": 1, "message": f"No git integration found for task {task_id}"})
+
+    evaluators, docker_softwares, to_submit, ret = {}, {}, [], [None] * len(jobs)
+    for i, job in enumerate(jobs):
+        job = job if isinstance(job, dict) else {}
+        dataset_id = job.get('dataset_id')
+        docker_software_id = str(job.get('docker_software_id'))
+        resources = job.get('resources')
+        status = {'dataset_id': dataset_id, 'tira_software_id': 'docker-software-' + docker_software_id,
+                  'resources': resources}
+
+        if not isinstance(dataset_id, str) or not model.dataset_exists(dataset_id) or \
+                not isinstance(resources, str) or resources not in settings.GIT_CI_AVAILABLE_RESOURCES:
+            ret[i] = {**status, 'status': 'failed', 'message': 'Unknown dataset_id or resources.'}
+            continue
+
+        if dataset_id not in evaluators:
+            evaluators[dataset_id] = model.get_evaluator(dataset_id)
+        evaluator = evaluators[dataset_id]
+        if not evaluator.get('is_git_runner') or not evaluator.get('git_runner_image') or \
+                not evaluator.get('git_runner_command') or not evaluator.get('git_repository_id'):
+            ret[i] = {**status, 'status': 'failed',
+                      'message': "The dataset is misconfigured. Docker-execute only available for git-evaluators"}
+            continue
+
+        if docker_software_id not in docker_softwares:
+            try:
+                docker_softwares[docker_software_id] = model.get_docker_software(docker_software_id)
+            except Exception:
+                docker_softwares[docker_software_id] = {}
+        docker_software = docker_softwares[docker_software_id]
+        if not docker_software or docker_software['vm_id'] != vm_id:
+            ret[i] = {**status, 'status': 'failed', 'message': f"There is no docker image with id {docker_software_id}"}
+            continue
+
+        to_submit += [(i, {'dataset_id': dataset_id, 'git_runner_image': evaluator['git_runner_image'],
+                           'git_runner_command': evaluator['git_runner_command'],
+                           'git_repository_id': evaluator['git_repository_id'],
+                           'evaluator_id': evaluator['evaluator_id'],
+                           'user_image_to_execute': docker_software['tira_image_name'],
+                           'user_command_to_execute': docker_software['command'],
+                           'tira_software_id': status['tira_software_id'], 'resources': resources})]
+
+    submitted = git_runner.run_docker_softwares_with_git_workflow(task_id, vm_id, [job for _, job in to_submit], cache)
+    for (i, _), job_status in zip(to_submit, submitted):
+        ret[i] = job_status
+
+    return JsonResponse({'status': 0, 'context': {'jobs': ret}}, status=HTTPStatus.ACCEPTED)
+
+
+@csrf_exempt
+def git_webhook(request):
+    """ Receives the pipeline and job events of the GitLab webhooks (authenticated by the secret token
+    GIT_WEBHOOK_TOKEN) and updates the pipeline states from which the running softwares are read. """
+    if request.method != 'POST':
+        return JsonResponse({"status": 1, "message": "Only POST is allowed here"})
+
+    if not git_pipelines.webhooks_enabled() or \
+            not hmac.compare_digest(request.headers.get('X-Gitlab-Token', ''), settings.GIT_WEBHOOK_TOKEN):
+        return JsonResponse({"status": 1, "message": "Invalid token."}, status=HTTPStatus.FORBIDDEN)
+
+    event = request.headers.get('X-Gitlab-Event')
+    try:
+        if event == 'Pipeline Hook':
+            git_pipelines.update_from_pipeline_event(json.loads(request.body))
+        elif event == 'Job Hook':
+            git_pipelines.update_from_job_event(json.loads(request.body))
+        else:
+            return JsonResponse({'status': 0, 'message': f'Ignored the event {event}.'})
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f'Could not process the {event}: {e}')
+        return JsonResponse({'status': 1, 'message': f'Invalid payload: {e}'}, status=HTTPStatus.BAD_REQUEST)
+
+    return JsonResponse({'status': 0})
+
+
 @check_permissions
 @check_resources_exist('json')
 def stop_docker_software(request, task_id, user_id, run_id):
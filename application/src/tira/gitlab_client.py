@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""
+    The shared client layer of the GitLabRunners: all requests of this process to GitLab (and its container registry)
+    go through one pooled http session per host, are rate-limited by a token bucket per host (with a backoff on 429
+    Too Many Requests), and are recorded in per-endpoint latency metrics. Independent calls (e.g., the jobs of each
+    pipeline or the manifest of each image) run concurrently in a bounded thread pool via fan_out.
+    The token buckets, pools, and metrics are per process: each uWSGI worker and daemon (e.g., the cache_daemon) has
+    its own, so all processes together send up to GITLAB_RATE_LIMIT requests per second times the number of processes.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+import logging
+import re
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+import gitlab
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("tira")
+max_workers = getattr(settings, 'GITLAB_MAX_WORKERS', 8)
+rate_limit = getattr(settings, 'GITLAB_RATE_LIMIT', 10)
+rate_burst = getattr(settings, 'GITLAB_RATE_BURST', 20)
+max_retries_on_429 = 5
+
+_sessions = {}
+_lock = threading.Lock()
+_metrics = {'rate_limited': 0, 'endpoints': {}}
+_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gitlab-client')
+_in_executor = threading.local()
+
+
+class TokenBucket(object):
+    """ Allows rate requests per second on average and bursts of up to burst requests. """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """ Take a token, waits until one is available (tokens are reserved in order of the calls). """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = max(-self.tokens / self.rate, self.paused_until - now)
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """ No requests for the next seconds, e.g., after the server answered with 429. """
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+def _endpoint(method, url):
+    """ The endpoint of a request for the metrics, ids and names in the path are replaced by placeholders. """
+    url = urlparse(url)
+    path = re.sub('/v2/.+/(manifests|blobs)/[^/]+$', '/v2/:repository/\\1/:reference', url.path)
+    path = re.sub('/(\\d+|[^/]*%2F[^/]*)(?=/|$)', '/:id', path)
+
+    return f'{method.upper()} {url.hostname}{path}'
+
+
+def _record_call(endpoint, seconds, failed):
+    with _lock:
+        stats = _metrics['endpoints'].setdefault(endpoint, {'count': 0, 'failed': 0, 'total_seconds': 0.0,
+                                                            'max_seconds': 0.0})
+        stats['count'] += 1
+        stats['failed'] += 1 if failed else 0
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+
+class RateLimitedSession(requests.Session):
+    def __init__(self, bucket):
+        super().__init__()
+        self.bucket = bucket
+        # the session is shared by the runners of all git integrations (i.e., tokens), so it must not keep cookies
+        self.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers * 2)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        endpoint = _endpoint(method, url)
+
+        for attempt in range(max_retries_on_429 + 1):
+            self.bucket.acquire()
+            start, response = time.time(), None
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            finally:
+                _record_call(endpoint, time.time() - start, response is None or response.status_code >= 400)
+
+            if response.status_code != 429 or attempt == max_retries_on_429:
+                return response
+
+            try:
+                backoff = float(response.headers.get('Retry-After', 2 ** attempt))
+            except ValueError:
+                backoff = 2 ** attempt
+            # release the connection of the rate-limited response to the pool
+            response.close()
+            with _lock:
+                _metrics['rate_limited'] += 1
+            logger.warning(f'{endpoint} was rate limited, retry in {backoff} seconds.')
+            self.bucket.pause(backoff)
+
+
+def get_session(host):
+    """ The pooled session for requests to the host, shared by all GitLabRunners of this process. """
+    with _lock:
+        if host not in _sessions:
+            _sessions[host] = RateLimitedSession(TokenBucket(rate_limit, rate_burst))
+
+        return _sessions[host]
+
+
+class _Gitlab(gitlab.Gitlab):
+    """ The session retries rate-limited requests (and pauses the other requests to the host), so python-gitlab must
+    not retry them again (by default up to 10 times). """
+    def http_request(self, *args, **kwargs):
+        kwargs['obey_rate_limit'] = False
+        return super().http_request(*args, **kwargs)
+
+
+def get_gitlab(host, private_token):
+    return _Gitlab('https://' + host, private_token=private_token, session=get_session(host),
+                   retry_transient_errors=False)
+
+
+def fan_out(func, items):
+    """ Apply func to all items concurrently in the bounded thread pool and return the results in the order of the
+    items. The first exception of a call is raised. Calls from within the pool run sequentially (a task that waits
+    for other tasks of the same bounded pool could deadlock). """
+    items = list(items)
+    if len(items) <= 1 or getattr(_in_executor, 'active', False):
+        return [func(i) for i in items]
+
+    def call(item):
+        _in_executor.active = True
+        try:
+            return func(item)
+        finally:
+            _in_executor.active = False
+            # the database connections are per thread, do not keep them open in the pool
+            connections.close_all()
+
+    return list(_executor.map(call, items))
+
+
+def get_metrics():
+    """ Return the number of rate-limited (429) responses and the latency per endpoint (count, failed, mean/max
+    seconds) of the GitLab requests of this process. """
+    with _lock:
+        return {'sessions': len(_sessions),
+                'rate_limited': _metrics['rate_limited'],
+                'endpoints': {endpoint: {'count': i['count'], 'failed': i['failed'],
+                                         'mean_seconds': round(i['total_seconds'] / i['count'], 4),
+                                         'max_seconds': round(i['max_seconds'], 4)}
+                              for endpoint, i in sorted(_metrics['endpoints'].items())}}
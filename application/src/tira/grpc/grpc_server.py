@@ -20,12 +20,15 @@ class TiraApplicationService(tira_host_pb2_grpc.TiraApplicationService):
         logger.debug(f" Application Server received vm-state {request.state} for {request.vmId}")
         print(f"Application Server received vm-state {request.state} for {request.vmId}. Transaction: {request.transaction.transactionId}")
         try:
-            TransactionLog.objects.filter(transaction_id=request.transaction.transactionId).update(
-                last_status=request.transaction.status,
-                last_message=f"TiraApplicationService:set_state:{request.transaction.message}"
-            )
-
-            t = TransactionLog.objects.get(transaction_id=request.transaction.transactionId)
+            t = None
+            # The heartbeat of the host reports state changes outside of transactions (without transactionId)
+            if request.transaction.transactionId:
+                TransactionLog.objects.filter(transaction_id=request.transaction.transactionId).update(
+                    last_status=request.transaction.status,
+                    last_message=f"TiraApplicationService:set_state:{request.transaction.message}"
+                )
+
+                t = TransactionLog.objects.get(transaction_id=request.transaction.transactionId)
 
             _ = TransitionLog.objects.update_or_create(vm_id=request.vmId, defaults={'vm_state': request.state,
                                                                                      'transaction': t})
@@ -2,7 +2,10 @@
 """
     GrpcClient to make gRPC calls to the dockerized host running a VM.
 """
+import json
 import logging
+import threading
+import time
 
 from django.conf import settings
 import grpc
@@ -15,6 +18,146 @@ from .proto import tira_host_pb2, tira_host_pb2_grpc
 
 logger = logging.getLogger("tira")
 grpc_port = settings.HOST_GRPC_PORT
+grpc_deadline = getattr(settings, 'GRPC_DEADLINE', 15)
+grpc_stream_deadline = getattr(settings, 'GRPC_STREAM_DEADLINE', 60)
+
+# Only idempotent calls are retried (by grpc itself, within the deadline of the call).
+_retry_policy = {
+    "methodConfig": [{
+        "name": [{"service": "tira.generated.TiraHostService", "method": "vm_info"},
+                 {"service": "tira.generated.TiraHostService", "method": "vm_list"}],
+        "retryPolicy": {
+            "maxAttempts": 3,
+            "initialBackoff": "0.2s",
+            "maxBackoff": "2s",
+            "backoffMultiplier": 2,
+            "retryableStatusCodes": ["UNAVAILABLE"],
+        },
+    }]
+}
+
+# The hosts (tira_host.grpc_service.serve) permit pings every 30 seconds, also without calls. Servers with the default
+# settings close channels that ping more often than every 5 minutes without calls (GOAWAY too_many_pings).
+_channel_options = [
+    ("grpc.keepalive_time_ms", 60000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.enable_retries", 1),
+    ("grpc.service_config", json.dumps(_retry_policy)),
+]
+
+_channels = {}
+_channels_lock = threading.Lock()
+_metrics = {'channels_created': 0, 'channels_reused': 0, 'calls': {}}
+
+
+def get_channel(hostname):
+    """ Return the channel to the host :@param hostname:. Channels are long-lived and shared by all GrpcClients of
+    this process (a channel is thread-safe and reconnects on its own), so that no request pays for a new connection.
+    """
+    with _channels_lock:
+        channel = _channels.get(hostname)
+        if channel is None:
+            channel = grpc.insecure_channel(hostname + ':' + str(grpc_port), options=_channel_options)
+            _channels[hostname] = channel
+            _metrics['channels_created'] += 1
+        else:
+            _metrics['channels_reused'] += 1
+
+        return channel
+
+
+def close_channels():
+    """ Close all pooled channels, e.g., when the host configuration changed. """
+    with _channels_lock:
+        for channel in _channels.values():
+            channel.close()
+        _channels.clear()
+
+
+def _record_call(method, seconds, failed):
+    with _channels_lock:
+        stats = _metrics['calls'].setdefault(method, {'count': 0, 'failed': 0, 'total_seconds': 0.0,
+                                                      'max_seconds': 0.0})
+        stats['count'] += 1
+        stats['failed'] += 1 if failed else 0
+        stats['total_seconds'] += seconds
+        stats['max_seconds'] = max(stats['max_seconds'], seconds)
+
+
+def get_metrics():
+    """ Return the channel reuse and the latency per gRPC method (count, failed, mean/max seconds) of this process. """
+    with _channels_lock:
+        return {'channels': len(_channels),
+                'channels_created': _metrics['channels_created'],
+                'channels_reused': _metrics['channels_reused'],
+                'calls': {method: {'count': i['count'], 'failed': i['failed'],
+                                   'mean_seconds': round(i['total_seconds'] / i['count'], 4),
+                                   'max_seconds': round(i['max_seconds'], 4)}
+                          for method, i in _metrics['calls'].items()}}
+
+
+class _TimedStream(object):
+    """ Wraps the response stream of a call, so that the call is recorded in the metrics when the stream ends or is
+    cancelled, i.e., with the duration of the whole stream instead of its setup. """
+    def __init__(self, method, responses, start):
+        self.method = method
+        self.responses = responses
+        self.start = start
+        self.recorded = False
+
+    def _record(self, failed):
+        if not self.recorded:
+            self.recorded = True
+            _record_call(self.method, time.time() - self.start, failed)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.responses)
+        except StopIteration:
+            self._record(False)
+            raise
+        except grpc.RpcError as e:
+            # streams end regularly when they are cancelled or reach their deadline
+            self._record(e.code() not in {grpc.StatusCode.CANCELLED, grpc.StatusCode.DEADLINE_EXCEEDED})
+            raise
+
+    def cancel(self):
+        self._record(False)
+        return self.responses.cancel()
+
+    def __getattr__(self, name):
+        return getattr(self.responses, name)
+
+
+class _TimedStub(object):
+    """ Wraps the generated stub: every call gets the deadline and is recorded in the metrics (streams when they
+    end). """
+    def __init__(self, stub, timeout):
+        self.stub = stub
+        self.timeout = timeout
+
+    def __getattr__(self, method):
+        rpc = getattr(self.stub, method)
+
+        def timed_call(request, **kwargs):
+            kwargs.setdefault('timeout', self.timeout)
+            start, failed, stream = time.time(), True, False
+            try:
+                ret = rpc(request, **kwargs)
+                failed = False
+                # unary calls return the response, streaming calls return the call, which iterates the responses
+                stream = isinstance(ret, grpc.Call)
+                return _TimedStream(method, ret, start) if stream else ret
+            finally:
+                if not stream:
+                    _record_call(method, time.time() - start, failed)
+
+        return timed_call
 
 
 def new_transaction(message, in_grpc=True):
@@ -54,14 +197,14 @@ def auto_transaction(msg):
 class GrpcClient:
     """ Main class for the Application's GRPC client. This client makes calls to a server running on a host specified
     by it's hostname """
-    def __init__(self, hostname):
-        """ A channel is opened at init time and closed on deletion. Try not to store these objects for long. """
+    def __init__(self, hostname, timeout=None):
+        """ The client uses the pooled channel to the host, so it is cheap to create one per request.
+        @param timeout: the deadline in seconds for each call (defaults to settings.GRPC_DEADLINE).
+        """
         self.hostname = hostname
-        self.channel = grpc.insecure_channel(hostname + ':' + str(grpc_port))
-        self.stub = tira_host_pb2_grpc.TiraHostServiceStub(self.channel)
-
-    def __del__(self):
-        self.channel.close()
+        self.channel = get_channel(hostname)
+        self.stub = _TimedStub(tira_host_pb2_grpc.TiraHostServiceStub(self.channel),
+                               timeout if timeout else grpc_deadline)
 
     def vm_create(self, vm_id, ova_file, user_id, hostname):
         """ TODO test and comment """
@@ -98,7 +241,7 @@ class GrpcClient:
         return response
 
     def vm_list(self):
-        response = self.stub.vm_list(Empty)
+        response = self.stub.vm_list(Empty())
         logger.debug("Application received vm-list response: " + str(response.transaction.message))
         return response
 
@@ -157,6 +300,18 @@ class GrpcClient:
         logger.debug("Application received run-eval response: " + str(response.message))
         return response
 
+    def run_output(self, vm_id, timeout=None):
+        """ Stream the output of the running transaction on the vm (beginning with the lines that the host still has
+        in its buffer) as chunks of text. The stream ends when the transaction ends.
+        @param timeout: seconds until the stream is closed (defaults to settings.GRPC_STREAM_DEADLINE)
+        """
+        responses = self.stub.run_output(tira_host_pb2.VmId(vmId=vm_id), timeout=timeout or grpc_stream_deadline)
+        try:
+            for response in responses:
+                yield response.message
+        finally:
+            responses.cancel()  # e.g., when the viewer disconnected
+
     @auto_transaction("run-abort")
     def run_abort(self, vm_id, transaction):
         """ Abort a currently ongoing run."""
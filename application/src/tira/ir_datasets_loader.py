@@ -1,7 +1,24 @@
+import os
 import sys
 import json
+import gzip
+import logging
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
 from pathlib import Path
 from typing import Iterable
+from tqdm import tqdm
+
+logger = logging.getLogger("tira")
+
+
+def _map_docs(args) -> str:
+    """ Map a batch of documents to jsonl lines. Executed in the worker processes of IrDatasetsLoader.export_docs """
+    docs, include_original = args
+    loader = IrDatasetsLoader()
+    return ''.join(loader.map_doc(doc, include_original) + '\n' for doc in docs)
 
 
 class IrDatasetsLoader(object):
@@ -14,7 +31,8 @@ class IrDatasetsLoader(object):
         except:
             raise ValueError(f'Could not load the dataset {ir_datasets_id}. Does it exist?')
 
-    def load_dataset_for_fullrank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path,  include_original=False) -> None:
+    def load_dataset_for_fullrank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path,  include_original=False,
+                                  processes=None, batch_size=10000, docs_per_shard=None, compression=None) -> dict:
         """ Loads a dataset through the ir_datasets package by the given ir_datasets ID.
         Maps documents, queries, qrels to a standardized format in preparation for full-rank operations with PyTerrier.
         
@@ -22,18 +40,115 @@ class IrDatasetsLoader(object):
         @param output_dataset_path: the path to the directory where the output files will be stored
         @param output_dataset_truth_path: the path to the directory where the output files will be stored
         @param include_original {False}: flag which signals if the original data of documents and queries should be included 
+        @param processes, batch_size, docs_per_shard, compression: see export_docs
+        :return: the statistics of the export of the documents, see export_docs
         """
         dataset = self.load_irds(ir_datasets_id)
         
-        docs_mapped = (self.map_doc(doc, include_original) for doc in dataset.docs_iter())
         queries_mapped = [self.map_query(query, include_original) for query in dataset.queries_iter()]
         qrels_mapped = [self.map_qrel(qrel) for qrel in dataset.qrels_iter()]
         
-        self.write_lines_to_file(docs_mapped, output_dataset_path/"documents.jsonl")
+        try:
+            docs_count = dataset.docs_count()
+        except Exception:
+            docs_count = None
+
+        ret = self.export_docs(dataset.docs_iter(), output_dataset_path, include_original, processes, batch_size,
+                               docs_per_shard, compression, docs_count)
         self.write_lines_to_file(queries_mapped, output_dataset_path/"queries.jsonl")
         self.write_lines_to_file(qrels_mapped, output_dataset_truth_path/"qrels.txt")
         self.write_lines_to_file(queries_mapped, output_dataset_truth_path/"queries.jsonl")
 
+        return ret
+
+
+    def export_docs(self, docs: Iterable, output_dataset_path: Path, include_original=False, processes=None,
+                    batch_size=10000, docs_per_shard=None, compression=None, docs_count=None) -> dict:
+        """ Export documents to documents.jsonl in a pipeline: batches of documents are read from the iterator, mapped
+        to json in a pool of worker processes, and written in their original order with large buffered writes.
+        At most 2 batches per process are in flight, so the memory is bounded regardless of the size of the corpus.
+
+        @param docs: the documents, e.g., dataset.docs_iter()
+        @param processes: the number of worker processes, os.cpu_count() if None
+        @param batch_size: the number of documents per batch
+        @param docs_per_shard: if set, write documents-00000.jsonl, documents-00001.jsonl, ... with this many documents each
+        @param compression: None, 'gzip', or 'zstd' (requires the zstandard package)
+        @param docs_count: the number of documents to show the progress, if known
+        :return: a dict {docs, seconds, docs_per_second, files}
+        """
+        start = time.time()
+        processes = processes or os.cpu_count() or 1
+        docs = iter(docs)
+        batches = iter(lambda: list(islice(docs, batch_size)), [])
+        shard, docs_in_shard, exported, files = 0, 0, 0, []
+
+        def file_name(shard):
+            return output_dataset_path / (f"documents-{shard:05d}.jsonl" if docs_per_shard else "documents.jsonl")
+
+        out = self.open_output_file(file_name(shard), compression)
+        files.append(out.name)
+
+        def write(text, count):
+            nonlocal out, shard, docs_in_shard
+            while docs_per_shard and docs_in_shard + count > docs_per_shard:
+                # JSON escapes line breaks in strings, so each line is exactly one document
+                needed = docs_per_shard - docs_in_shard
+                lines = text.split('\n', needed)
+                if needed:
+                    out.write('\n'.join(lines[:needed]) + '\n')
+                text = lines[needed]
+                out.close()
+                shard, docs_in_shard, count = shard + 1, 0, count - needed
+                out = self.open_output_file(file_name(shard), compression)
+                files.append(out.name)
+
+            out.write(text)
+            docs_in_shard += count
+
+        try:
+            with Pool(processes) as pool, tqdm(total=docs_count, desc='export documents', unit='docs') as progress:
+                pending = deque()
+                for batch in batches:
+                    pending.append((len(batch), pool.apply_async(_map_docs, ((batch, include_original),))))
+                    while len(pending) > 2 * processes:
+                        count, result = pending.popleft()
+                        write(result.get(), count)
+                        exported += count
+                        progress.update(count)
+
+                while pending:
+                    count, result = pending.popleft()
+                    write(result.get(), count)
+                    exported += count
+                    progress.update(count)
+        finally:
+            out.close()
+
+        seconds = time.time() - start
+        ret = {'docs': exported, 'seconds': round(seconds, 2),
+               'docs_per_second': round(exported / seconds, 2) if seconds > 0 else exported, 'files': [str(i) for i in files]}
+        logger.info(f"Exported {ret['docs']} documents to {len(files)} files in {ret['seconds']} seconds "
+                    f"({ret['docs_per_second']} docs/sec).")
+
+        return ret
+
+
+    def open_output_file(self, path: Path, compression=None):
+        """ Open a text file for large buffered writes, optionally compressed with gzip or zstd """
+        if compression:
+            path = path.with_name(path.name + {'gzip': '.gz', 'zstd': '.zst'}[compression])
+        if path.exists():
+            raise RuntimeError(f"File already exists: {path}")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if compression == 'gzip':
+            return gzip.open(path, 'wt', compresslevel=6)
+        elif compression == 'zstd':
+            import zstandard
+            return zstandard.open(path, 'wt')
+
+        return path.open('wt', buffering=1024*1024)
+
 
     def load_dataset_for_rerank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path, include_original: bool, run_file: Path) -> None:
         """ Loads a dataset through ir_datasets package by the given ir_datasets ID.
@@ -47,9 +162,8 @@ class IrDatasetsLoader(object):
         """
         dataset = self.load_irds(ir_datasets_id)
         
-        id_pairs = self.extract_ids_from_run_file(run_file)
-        docs = self.get_docs_by_ids(dataset, [id[1] for id in id_pairs])
-        rerank = (self.construct_rerank_row(dataset, docs, id_pair[0], id_pair[1]) for id_pair in id_pairs)
+        queries = self.get_queries_by_ids(dataset)
+        rerank = self.yield_rerank_rows(dataset, queries, run_file)
         
         qrels_mapped = (self.map_qrel(qrel) for qrel in dataset.qrels_iter())
         
@@ -91,18 +205,49 @@ class IrDatasetsLoader(object):
 
 
     def extract_ids_from_run_file(self, run_file: Path) -> list:
+        return list(self.yield_ids_from_run_file(run_file))
+
+
+    def yield_ids_from_run_file(self, run_file: Path) -> Iterable[list]:
         with run_file.open('r') as file:
-            id_pairs = [line.split()[:3:2] for line in file]
-            return id_pairs
-        
+            for line in file:
+                if line.strip():
+                    yield line.split()[:3:2]
+
 
     def get_docs_by_ids(self, dataset, doc_ids: list) -> dict:
         docstore = dataset.docs_store()
         return docstore.get_many(doc_ids)
-        
 
-    def construct_rerank_row(self, dataset, docs: dict, query_id: str, doc_id: str) -> str:
-        query = [query for query in dataset.queries_iter() if query.query_id == query_id][0]
+
+    def get_queries_by_ids(self, dataset) -> dict:
+        """ Index the queries of the dataset by their id, so that each query is looked up in constant time. """
+        return {query.query_id: query for query in dataset.queries_iter()}
+
+
+    def yield_rerank_rows(self, dataset, queries: dict, run_file: Path) -> Iterable[str]:
+        """ Stream the rerank rows for the (qid, docno) pairs of the run file in the order of the run file.
+        The documents are fetched per query (the run file lists the documents of a query consecutively), so that only
+        the documents of one query are in memory at once.
+        """
+        def rows(query_id, doc_ids):
+            docs = self.get_docs_by_ids(dataset, doc_ids)
+            return (self.construct_rerank_row(queries, docs, query_id, doc_id) for doc_id in doc_ids)
+
+        current_query_id, doc_ids = None, []
+        for query_id, doc_id in self.yield_ids_from_run_file(run_file):
+            if query_id != current_query_id and doc_ids:
+                yield from rows(current_query_id, doc_ids)
+                doc_ids = []
+            current_query_id = query_id
+            doc_ids.append(doc_id)
+
+        if doc_ids:
+            yield from rows(current_query_id, doc_ids)
+
+
+    def construct_rerank_row(self, queries: dict, docs: dict, query_id: str, doc_id: str) -> str:
+        query = queries[query_id]
         doc = docs[doc_id]     
         ret = {
             "qid": query_id,
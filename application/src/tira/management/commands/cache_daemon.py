@@ -4,6 +4,7 @@ import logging
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management import call_command
 import tira.tira_model as model
+import tira.data.git_pipelines as git_pipelines
 
 import time
 import datetime
@@ -17,6 +18,10 @@ class Command(BaseCommand):
     help = 'cache daemon'
 
     def keep_running_softwares_fresh(self, sleep_time):
+        if git_pipelines.webhooks_enabled():
+            # the webhooks keep the running softwares fresh, polling only reconciles missed events
+            sleep_time = max(int(sleep_time), settings.GIT_PIPELINE_RECONCILE_INTERVAL)
+
         while True:
             time.sleep(int(sleep_time))
             print(str(datetime.datetime.now()) + ': Start loop to keep the running softwares fresh (sleeped ' + str(int(sleep_time)) + ' seconds) ...')
@@ -31,7 +36,7 @@ class Command(BaseCommand):
                         try:
                             print(task['task_id'] + '--->' + str(git_repository_id))
                             git_integration = get_git_integration(task_id=task['task_id'])
-                            running_pipelines = git_integration.all_running_pipelines_for_repository(git_repository_id, cache, force_cache_refresh=True)
+                            running_pipelines = git_integration.all_running_pipelines_for_repository(git_repository_id, cache, force_cache_refresh=True, reconcile=True)
                             print('Refreshed Cache: ' + task['task_id'] + ' on repo ' + str(git_repository_id) + ' has ' + str(len(running_pipelines)) + ' jobs.')
                         except Exception as e:
                             print(f'Exception during refreshing the repository {git_repository_id}: e')
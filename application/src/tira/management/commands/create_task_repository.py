@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+import tira.tira_model as model
+
+
+class Command(BaseCommand):
+    help = 'create the git repository of a task and let the evaluator of the dataset run in it'
+
+    def handle(self, *args, **options):
+        task_id, dataset_id = options['task_id'], options['dataset_id']
+        git_repository_id = model.get_git_integration(task_id=task_id).create_task_repository(task_id)
+        model.set_evaluator_git_repository(task_id, dataset_id, str(git_repository_id))
+        print(f'Created the git repository {git_repository_id} of task {task_id} for dataset {dataset_id}.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--task_id', default=None, type=str)
+        parser.add_argument('--dataset_id', default=None, type=str)
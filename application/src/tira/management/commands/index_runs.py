@@ -0,0 +1,29 @@
+from django.conf import settings
+import logging
+from django.core.management.base import BaseCommand
+from pathlib import Path
+
+from tira.data.run_indexer import incremental_index_runs
+
+logger = logging.getLogger("tira")
+
+
+class Command(BaseCommand):
+    help = 'bulk index the added and changed runs in data/runs into the database'
+
+    def handle(self, *args, **options):
+        runs_dir_path = settings.TIRA_ROOT / Path("data/runs")
+        # outside of requests, the files are parsed in a process pool (os.cpu_count() processes by default)
+        processes = int(options['processes']) if options['processes'] else None
+        stats = incremental_index_runs(runs_dir_path, vm_id=options['vm_id'], full=options['full'],
+                                       processes=processes, batch_size=int(options['batch_size']), verbose=True)
+
+        print(f"Indexed {stats['runs']} runs ({stats['skipped']} skipped, {stats['unchanged']} unchanged, "
+              f"{stats['purged']} purged) in {stats['seconds']} seconds ({stats['runs_per_second']} runs/sec).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vm_id', default=None, type=str)
+        parser.add_argument('--processes', default=None, type=str)
+        parser.add_argument('--batch_size', default='500', type=str)
+        parser.add_argument('--full', default=False, action='store_true',
+                            help='Index all runs, also the runs that did not change since they were last indexed.')
@@ -26,12 +26,20 @@ class Command(BaseCommand):
        @param --include_original {False}: optional, boolean: flag to signal, if the original data should be included
        @param --rerank: optional, string: if used, mapping will be in preparation for re-ranking operations and a path to file 
                         with TREC-run formatted data is required
+       @param --processes: optional, int: the number of worker processes that map the documents (full-rank only)
+       @param --batch_size {10000}: optional, int: the number of documents per batch (full-rank only)
+       @param --docs_per_shard: optional, int: write documents-00000.jsonl, ... with this many documents each (full-rank only)
+       @param --compression: optional, gzip or zstd: compress the documents (full-rank only)
     """
 
-    def import_dataset_for_fullrank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path, include_original: bool):
+    def import_dataset_for_fullrank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path, include_original: bool,
+                                    processes=None, batch_size=10000, docs_per_shard=None, compression=None):
         print(f'Task: Full-Rank -> create files: \n documents.jsonl \n queries.jsonl \n qrels.txt \n at {output_dataset_path}/')
         datasets_loader = IrDatasetsLoader()
-        datasets_loader.load_dataset_for_fullrank(ir_datasets_id, output_dataset_path, output_dataset_truth_path, include_original)
+        stats = datasets_loader.load_dataset_for_fullrank(ir_datasets_id, output_dataset_path, output_dataset_truth_path, include_original,
+                                                          processes, batch_size, docs_per_shard, compression)
+        print(f'Exported {stats["docs"]} documents to {len(stats["files"])} files in {stats["seconds"]} seconds '
+              f'({stats["docs_per_second"]} docs/sec).')
 
 
     def import_dataset_for_rerank(self, ir_datasets_id: str, output_dataset_path: Path, output_dataset_truth_path: Path, include_original: bool, run_file: Path):
@@ -63,7 +71,11 @@ class Command(BaseCommand):
                 options['ir_datasets_id'],
                 Path(options['output_dataset_path']),
                 Path(options['output_dataset_truth_path']),
-                options['include_original']
+                options['include_original'],
+                options['processes'],
+                options['batch_size'],
+                options['docs_per_shard'],
+                options['compression']
             )
 
     def add_arguments(self, parser):
@@ -72,4 +84,8 @@ class Command(BaseCommand):
         parser.add_argument('--output_dataset_truth_path', default=None, type=Path)
         parser.add_argument('--include_original', default=False, type=bool)
         parser.add_argument('--rerank', default=None, type=Path)
+        parser.add_argument('--processes', default=None, type=int)
+        parser.add_argument('--batch_size', default=10000, type=int)
+        parser.add_argument('--docs_per_shard', default=None, type=int)
+        parser.add_argument('--compression', default=None, type=str, choices=['gzip', 'zstd'])
 
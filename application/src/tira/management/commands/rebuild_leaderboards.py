@@ -0,0 +1,30 @@
+import logging
+from django.core.management.base import BaseCommand, CommandError
+
+import tira.data.leaderboard as leaderboard
+
+logger = logging.getLogger("tira")
+
+
+class Command(BaseCommand):
+    help = 'rebuild the materialized leaderboards from the runs, reviews, and evaluations or check them for drift'
+
+    def handle(self, *args, **options):
+        dataset_id = options['dataset_id']
+
+        if options['check']:
+            drift = leaderboard.drift(dataset_id)
+            for kind, run_ids in drift.items():
+                print(f'{kind}: {len(run_ids)} entries' + (f' ({", ".join(run_ids[:10])} ...)' if run_ids else ''))
+
+            if any(drift.values()):
+                raise CommandError('The materialized leaderboards drifted. Run this command without --check to rebuild them.')
+            return
+
+        count = leaderboard.rebuild(dataset_id)
+        print(f'Rebuilt {count} leaderboard entries' + (f' for dataset {dataset_id}.' if dataset_id else '.'))
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dataset_id', default=None, type=str)
+        parser.add_argument('--check', default=False, action='store_true',
+                            help='Only report missing, outdated, and orphaned entries, fail if there are any.')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tira.authentication import auth
+import tira.tira_model as model
+
+
+class Command(BaseCommand):
+    help = 'reload the model data (organizers, vms, tasks, datasets, softwares, and runs) from the files of the model'
+
+    def handle(self, *args, **options):
+        model.build_model()
+        if auth.get_auth_source() == 'legacy':
+            auth.load_legacy_users()
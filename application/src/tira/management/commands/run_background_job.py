@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from tira.background_jobs import run_job
+
+
+class Command(BaseCommand):
+    help = 'execute a background job, this is called by tira.background_jobs.start_job'
+
+    def handle(self, *args, **options):
+        run_job(int(options['job_id']))
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job_id', default=None, type=str)
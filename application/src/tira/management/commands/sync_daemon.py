@@ -0,0 +1,150 @@
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from pathlib import Path
+import logging
+import threading
+import datetime
+import time
+
+import tira.data.data as dbops
+from tira.data.run_indexer import incremental_index_runs, RunsDirectoryUnavailable
+from tira.tira_model import model
+
+logger = logging.getLogger("sync_daemon")
+
+
+class Command(BaseCommand):
+    """ Keep the database in sync with data/runs and model/ in TIRA_ROOT, so that new runs and evaluations show up
+    without an admin reload. Uses inotify (via watchdog) where available, and polls otherwise.
+    """
+    help = 'sync daemon'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lock = threading.Lock()
+        self.changed_paths = set()
+        self.first_event, self.last_event = 0, 0
+
+    def on_any_event(self, event):
+        with self.lock:
+            if not self.changed_paths:
+                self.first_event = time.time()
+            self.changed_paths.add(event.src_path)
+            if getattr(event, 'dest_path', None):
+                self.changed_paths.add(event.dest_path)
+            self.last_event = time.time()
+
+    def drain(self, debounce):
+        """ Return the changed paths once no event arrived for debounce seconds. During a storm of events, the paths
+        are returned at the latest 10 * debounce seconds after the first event.
+        """
+        with self.lock:
+            now = time.time()
+            if not self.changed_paths or (now - self.last_event < debounce and now - self.first_event < 10 * debounce):
+                return set()
+            ret, self.changed_paths = self.changed_paths, set()
+            return ret
+
+    def sync_runs(self, run_dirs):
+        for dataset_id, vm_id, run_id in sorted(run_dirs):
+            try:
+                print(f'{datetime.datetime.now()}: Sync run {dataset_id}/{vm_id}/{run_id}: ' +
+                      str(dbops.sync_run_dir(model.runs_dir_path, dataset_id, vm_id, run_id)))
+            except Exception as e:
+                logger.exception(f'Exception during syncing the run {dataset_id}/{vm_id}/{run_id}: {e}')
+
+    def sync_model(self, model_dirs):
+        reloads = {
+            'users': model.reload_vms,
+            'virtual-machines': model.reload_vms,
+            'tasks': model.reload_tasks,
+            'datasets': model.reload_datasets,
+            'organizers': lambda: dbops._parse_organizer_list(model.organizers_file_path),
+            'softwares': lambda: dbops._parse_software_list(model.softwares_dir_path),
+        }
+        for reload in {reloads[i] for i in model_dirs if i in reloads}:
+            try:
+                print(f'{datetime.datetime.now()}: Reload {", ".join(sorted(model_dirs))} ...')
+                reload()
+            except Exception as e:
+                logger.exception(f'Exception during reloading the model {model_dirs}: {e}')
+
+    @staticmethod
+    def parts_relative_to(path, directory):
+        try:
+            return Path(path).relative_to(directory).parts
+        except ValueError:
+            return ()
+
+    def sync(self, paths):
+        """ Map the changed paths to the run directories data/runs/<dataset>/<vm>/<run> and the directories in model/
+        that they belong to, and sync those.
+        """
+        run_dirs, model_dirs = set(), set()
+        model_path = model.tira_root / 'model'
+        for path in paths:
+            runs_parts, model_parts = self.parts_relative_to(path, model.runs_dir_path), \
+                self.parts_relative_to(path, model_path)
+            if len(runs_parts) >= 3:
+                run_dirs.add(runs_parts[:3])
+            elif model_parts:
+                model_dirs.add(model_parts[0])
+
+        close_old_connections()
+        # the runs depend on the model, so it is synced first
+        self.sync_model(model_dirs)
+        self.sync_runs(run_dirs)
+
+    def watch(self, polling, debounce):
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+        from watchdog.observers.polling import PollingObserver
+
+        handler = FileSystemEventHandler()
+        handler.on_any_event = self.on_any_event
+        observer = PollingObserver() if polling else Observer()
+        observer.schedule(handler, path=str(model.runs_dir_path), recursive=True)
+        observer.schedule(handler, path=str(model.tira_root / 'model'), recursive=True)
+        observer.start()
+        print(f'{datetime.datetime.now()}: Watch {model.runs_dir_path} and {model.tira_root / "model"} '
+              f'with {type(observer).__name__} ...')
+
+        try:
+            while observer.is_alive():
+                time.sleep(min(debounce, 1))
+                paths = self.drain(debounce)
+                if paths:
+                    self.sync(paths)
+        finally:
+            observer.stop()
+            observer.join()
+
+    def poll(self, sleep_time):
+        """ Fallback without watchdog: index the added and changed runs via the manifest of the incremental indexer """
+        while True:
+            close_old_connections()
+            try:
+                stats = incremental_index_runs(model.runs_dir_path)
+            except RunsDirectoryUnavailable as e:
+                # e.g., the volume is not mounted (yet): keep the runs and try again
+                logger.error(e)
+                time.sleep(sleep_time)
+                continue
+            print(f'{datetime.datetime.now()}: Indexed {stats["runs"]} runs, {stats["purged"]} purged '
+                  f'(sleep {sleep_time} seconds) ...')
+            time.sleep(sleep_time)
+
+    def handle(self, *args, **options):
+        try:
+            self.watch(options['polling'], float(options['debounce']))
+        except ImportError:
+            logger.warning('watchdog is not installed. Fall back to polling with the incremental indexer.')
+            self.poll(int(options['poll_interval']))
+
+    def add_arguments(self, parser):
+        parser.add_argument('--debounce', default='2', type=str,
+                            help='Sync only after no file changed for this many seconds.')
+        parser.add_argument('--polling', default=False, action='store_true',
+                            help='Use polling instead of inotify, e.g., for network file systems.')
+        parser.add_argument('--poll_interval', default='60', type=str,
+                            help='Seconds between two indexings if watchdog is not installed.')
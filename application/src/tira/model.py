@@ -173,6 +173,7 @@ class Software(models.Model):
 
     class Meta:
         unique_together = (("software_id", "vm", 'task'),)
+        indexes = [models.Index(fields=['task', 'vm'])]
 
 
 class Upload(models.Model):
@@ -202,6 +203,9 @@ class DockerSoftware(models.Model):
     description = models.TextField(default="")
     paper_link = models.TextField(default="")
 
+    class Meta:
+        indexes = [models.Index(fields=['task', 'vm'])]
+
 
 class Run(models.Model):
     run_id = models.CharField(max_length=150, primary_key=True)
@@ -274,3 +278,65 @@ class Review(models.Model):
     published = models.BooleanField(default=False)
     blinded = models.BooleanField(default=True)
 
+
+
+class LeaderboardEntry(models.Model):
+    """ Materialized leaderboard: one row per evaluation run on a dataset, maintained by tira.data.leaderboard """
+    run = models.OneToOneField(Run, on_delete=models.CASCADE, primary_key=True)
+    dataset = models.ForeignKey(Dataset, on_delete=models.CASCADE)
+    vm_id = models.CharField(max_length=150)  # the owner of the evaluated input run
+    input_run_id = models.CharField(max_length=150)
+    published = models.BooleanField(default=False)
+    blinded = models.BooleanField(default=True)
+    # unpublished evaluations are hidden from non-admins, unless the evaluation run itself belongs to a software
+    has_software = models.BooleanField(default=False)
+    measures = models.JSONField(default=list)  # list of [measure_key, measure_value] in the order of the evaluation
+
+
+class IndexedRunDirectory(models.Model):
+    """ The manifest of the incremental indexing: the fingerprints of the files of a run directory when it was indexed.
+    """
+    run_dir = models.CharField(max_length=500, primary_key=True)  # <dataset>/<vm>/<run> relative to data/runs
+    vm_id = models.CharField(max_length=280, db_index=True)
+    run_id = models.CharField(max_length=150)
+    files = models.JSONField(default=dict)  # file name -> [mtime_ns, size, sha1]
+    last_indexed = models.DateTimeField(auto_now=True)
+
+
+class BackgroundJob(models.Model):
+    """ A long-running admin operation (e.g., a dataset import) that tira.background_jobs executes in its own process.
+    The output of the job is written to TIRA_ROOT/state/background-jobs/<job_id>.log
+    """
+    job_id = models.AutoField(primary_key=True)
+    title = models.CharField(max_length=250)
+    cmd = models.CharField(max_length=150)  # the django management command
+    args = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, default='queued')  # queued, running, finished, or failed
+    pid = models.IntegerField(null=True, default=None)
+    error = models.TextField(default="")
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, default=None)
+    heartbeat = models.DateTimeField(null=True, default=None)  # updated regularly while the job runs
+    finished = models.DateTimeField(null=True, default=None)
+
+
+class GitPipeline(models.Model):
+    """ The state of the CI pipeline of a submission to the git runner (one row per branch), maintained by
+    tira.data.git_pipelines from the GitLab webhooks. """
+    branch = models.CharField(max_length=500, primary_key=True)
+    git_repository_id = models.IntegerField(db_index=True)
+    pipeline_id = models.BigIntegerField(null=True, default=None)
+    status = models.CharField(max_length=30, default='submitted')  # submitted (no pipeline yet) or the gitlab status
+    jobs = models.JSONField(default=dict)  # job name -> {'id': job_id, 'status': status}
+    last_update = models.DateTimeField(auto_now=True)
+
+
+class GitJobConfiguration(models.Model):
+    """ The configuration (i.e., the content of the job-to-execute.txt) of a submission to the git runner, stored at
+    submission time so that it does not have to be read from the commits of the branch. """
+    branch = models.CharField(max_length=500, primary_key=True)
+    run_id = models.CharField(max_length=150, db_index=True)
+    git_repository_id = models.IntegerField()
+    metadata = models.JSONField(default=dict)  # the key-value pairs of the job-to-execute.txt
+    job_config = models.JSONField(default=dict)  # the job_config of the running softwares
+    created = models.DateTimeField(auto_now_add=True)
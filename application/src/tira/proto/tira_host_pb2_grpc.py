@@ -89,6 +89,11 @@ class TiraHostServiceStub(object):
                 request_serializer=tira__host__pb2.VmId.SerializeToString,
                 response_deserializer=tira__host__pb2.Transaction.FromString,
                 )
+        self.run_output = channel.unary_stream(
+                '/tira.generated.TiraHostService/run_output',
+                request_serializer=tira__host__pb2.VmId.SerializeToString,
+                response_deserializer=tira__host__pb2.Transaction.FromString,
+                )
         self.run_eval = channel.unary_unary(
                 '/tira.generated.TiraHostService/run_eval',
                 request_serializer=tira__host__pb2.RunDetails.SerializeToString,
@@ -193,6 +198,12 @@ class TiraHostServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def run_output(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def run_eval(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -278,6 +289,11 @@ def add_TiraHostServiceServicer_to_server(servicer, server):
                     request_deserializer=tira__host__pb2.VmId.FromString,
                     response_serializer=tira__host__pb2.Transaction.SerializeToString,
             ),
+            'run_output': grpc.unary_stream_rpc_method_handler(
+                    servicer.run_output,
+                    request_deserializer=tira__host__pb2.VmId.FromString,
+                    response_serializer=tira__host__pb2.Transaction.SerializeToString,
+            ),
             'run_eval': grpc.unary_unary_rpc_method_handler(
                     servicer.run_eval,
                     request_deserializer=tira__host__pb2.RunDetails.FromString,
@@ -541,6 +557,23 @@ class TiraHostService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def run_output(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/tira.generated.TiraHostService/run_output',
+            tira__host__pb2.VmId.SerializeToString,
+            tira__host__pb2.Transaction.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def run_eval(request,
             target,
@@ -605,6 +638,11 @@ class TiraApplicationServiceStub(object):
                 request_serializer=tira__host__pb2.EvaluationResults.SerializeToString,
                 response_deserializer=tira__host__pb2.Transaction.FromString,
                 )
+        self.confirm_run_execute = channel.unary_unary(
+                '/tira.generated.TiraApplicationService/confirm_run_execute',
+                request_serializer=tira__host__pb2.ExecutionResults.SerializeToString,
+                response_deserializer=tira__host__pb2.Transaction.FromString,
+                )
         self.complete_transaction = channel.unary_unary(
                 '/tira.generated.TiraApplicationService/complete_transaction',
                 request_serializer=tira__host__pb2.Transaction.SerializeToString,
@@ -639,9 +677,14 @@ class TiraApplicationServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def confirm_run_execute(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def complete_transaction(self, request, context):
-        """rpc confirm_run_execute (VmState) returns (Transaction) {} // TODO transmit the results of the run that should be displayed on the website (i.e. runDir without output)
-        """
+        """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
@@ -669,6 +712,11 @@ def add_TiraApplicationServiceServicer_to_server(servicer, server):
                     request_deserializer=tira__host__pb2.EvaluationResults.FromString,
                     response_serializer=tira__host__pb2.Transaction.SerializeToString,
             ),
+            'confirm_run_execute': grpc.unary_unary_rpc_method_handler(
+                    servicer.confirm_run_execute,
+                    request_deserializer=tira__host__pb2.ExecutionResults.FromString,
+                    response_serializer=tira__host__pb2.Transaction.SerializeToString,
+            ),
             'complete_transaction': grpc.unary_unary_rpc_method_handler(
                     servicer.complete_transaction,
                     request_deserializer=tira__host__pb2.Transaction.FromString,
@@ -752,6 +800,23 @@ class TiraApplicationService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def confirm_run_execute(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/tira.generated.TiraApplicationService/confirm_run_execute',
+            tira__host__pb2.ExecutionResults.SerializeToString,
+            tira__host__pb2.Transaction.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def complete_transaction(request,
             target,
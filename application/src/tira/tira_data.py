@@ -1,5 +1,8 @@
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 import logging
+import threading
 from django.conf import settings
 from tira.endpoints.stdout_beautifier import beautify_ansi_text
 
@@ -54,29 +57,134 @@ def get_run_file_list(dataset_id, vm_id, run_id):
     return {"size": size[1], "lines": size[2], "files": size[3], "dirs": size[4], "file_list": file_list}
 
 
+OUTPUT_TYPES = {"stdout": "stdout.txt", "stderr": "stderr.txt"}
+OUTPUT_MAX_LINES = 100
+OUTPUT_MAX_BYTES = 256 * 1024
+_BLOCK_SIZE = 64 * 1024
+
+
+def tail_file(file_path, max_lines=OUTPUT_MAX_LINES, max_bytes=OUTPUT_MAX_BYTES, end=None):
+    """ Read the last max_lines lines (but at most max_bytes) before the byte offset end (the end of the file if None)
+    by seeking backwards from the end, so that the size of the file does not matter.
+
+    :returns: a tuple (text, start, end) with the byte offsets of the text in the file.
+    """
+    with open(file_path, 'rb') as f:
+        size = f.seek(0, 2)
+        end = size if end is None else max(0, min(end, size))
+        start, data = end, b''
+        while start > 0 and end - start < max_bytes and data.count(b'\n') <= max_lines:
+            block = min(_BLOCK_SIZE, start, max_bytes - (end - start))
+            start -= block
+            f.seek(start)
+            data = f.read(block) + data
+
+    # a trailing line break terminates the last line, it does not start a new one
+    pos = len(data) - 1 if data.endswith(b'\n') else len(data)
+    for _ in range(max_lines):
+        pos = data.rfind(b'\n', 0, pos)
+        if pos < 0:
+            break
+    cut = pos + 1
+    if pos < 0 and start > 0:
+        # the byte cap was reached, so the first line is incomplete. It is kept if it is the only line, so that
+        # paging backwards always makes progress.
+        first = data.find(b'\n') + 1
+        cut = first if first < len(data) else 0
+
+    return data[cut:].decode('utf-8', errors='replace'), start + cut, end
+
+
+_line_counts = OrderedDict()  # file_path -> (inode, size, {offset: the number of lines before the offset})
+_line_counts_lock = threading.Lock()
+_MAX_COUNTED_FILES = 1024
+_MAX_OFFSETS_PER_FILE = 64
+
+
+def _count_lines(file_path, start, end):
+    ret, pos = 0, start
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        while pos < end:
+            block = f.read(min(1024 * 1024, end - pos))
+            if not block:
+                break
+            ret += block.count(b'\n')
+            pos += len(block)
+
+    return ret
+
+
+def count_lines(file_path, end=None):
+    """ Count the lines before the byte offset end (the whole file if None) in blocks of constant memory.
+    The outputs of runs only grow, so the counts are cached per (file, offset) and only the bytes after the closest
+    cached offset before end are counted. The counts of a file are dropped if it is replaced or shrinks. """
+    file_path, stat = str(file_path), Path(file_path).stat()
+    end = stat.st_size if end is None else min(end, stat.st_size)
+
+    with _line_counts_lock:
+        inode, size, counts = _line_counts.get(file_path, (None, 0, {}))
+        if inode != stat.st_ino or stat.st_size < size:
+            counts = {}
+        start = max([offset for offset in counts if offset <= end], default=0)
+        lines = counts.get(start, 0)
+
+    lines += _count_lines(file_path, start, end)
+
+    with _line_counts_lock:
+        counts = dict(counts)
+        counts[end] = lines
+        while len(counts) > _MAX_OFFSETS_PER_FILE:
+            del counts[min(counts)]
+        _line_counts[file_path] = (stat.st_ino, stat.st_size, counts)
+        _line_counts.move_to_end(file_path)
+        while len(_line_counts) > _MAX_COUNTED_FILES:
+            _line_counts.popitem(last=False)
+
+    return lines
+
+
+@lru_cache(maxsize=64)
+def _render_chunk(file_path, end, max_lines, max_bytes, mtime_ns, size):
+    text, start, end = tail_file(file_path, max_lines, max_bytes, end)
+    return beautify_ansi_text(text) if text else "", start, end
+
+
+def get_output_chunk(dataset_id, vm_id, run_id, output_type, end=None, max_lines=OUTPUT_MAX_LINES,
+                     max_bytes=OUTPUT_MAX_BYTES):
+    """ Load a chunk of the stdout or stderr of a run that ends at the byte offset end (the end of the file if None).
+    Earlier chunks can be loaded by passing the start of the current chunk as end.
+    The rendered chunks are cached per (run, file, modification time).
+
+    returns a dict with the variables: text (beautified), start, end, more_lines (the number of lines before start)
+    """
+    output_file = RUNS_DIR_PATH / dataset_id / vm_id / run_id / OUTPUT_TYPES[output_type]
+    if not output_file.exists():
+        return {"text": "", "start": 0, "end": 0, "more_lines": 0}
+
+    stat = output_file.stat()
+    text, start, end = _render_chunk(str(output_file), end, max_lines, max_bytes, stat.st_mtime_ns, stat.st_size)
+
+    return {"text": text, "start": start, "end": end,
+            "more_lines": count_lines(output_file, start) if start > 0 else 0}
+
+
+def _get_output(dataset_id, vm_id, run_id, output_type):
+    chunk = get_output_chunk(dataset_id, vm_id, run_id, output_type)
+    if not chunk["text"]:
+        return f"No {output_type.capitalize()} recorded"
+    if chunk["more_lines"]:
+        return beautify_ansi_text(f"[{chunk['more_lines']} more lines]") + "\n\n" + chunk["text"]
+
+    return chunk["text"]
+
+
 def get_stdout(dataset_id, vm_id, run_id):
-    # TODO: Don't open whole file but only read the n last lines to not have a full xGB file in memory
-    output_lines = 100
-    run_dir = (RUNS_DIR_PATH / dataset_id / vm_id / run_id)
-    if not (run_dir / "stdout.txt").exists():
-        return "No Stdout recorded"
-    with open(run_dir / "stdout.txt", 'r') as stdout_file:
-        stdout = stdout_file.readlines()
-        stdout_len = len(stdout)
-        stdout = ''.join([f"[{max(stdout_len - output_lines, 0)} more lines]\n"] + stdout[-output_lines:])
-    if not stdout:
-        return "No Stdout recorded"
-    return beautify_ansi_text(stdout)
+    return _get_output(dataset_id, vm_id, run_id, "stdout")
 
 
 def get_stderr(dataset_id, vm_id, run_id):
-    run_dir = (RUNS_DIR_PATH / dataset_id / vm_id / run_id)
-    if not (run_dir / "stderr.txt").exists():
-        return "No Stderr recorded"
-    stderr = open(run_dir / "stderr.txt", 'r').read()
-    if not stderr:
-        return "No Stderr recorded"
-    return beautify_ansi_text(stderr)
+    return _get_output(dataset_id, vm_id, run_id, "stderr")
 
 
 def get_tira_log(dataset_id, vm_id, run_id):
@@ -20,7 +20,7 @@ model = HybridDatabase()
 # reloading and reindexing
 def build_model():
     """ reconstruct the caches and the database. """
-    model.build_model()
+    model.index_model_from_files()
 
 
 def reload_vms():
@@ -55,6 +55,11 @@ def get_vm(vm_id: str, create_if_none=False):
     return model.get_vm(vm_id, create_if_none)
 
 
+def create_missing_vms(vm_ids) -> list:
+    """ Create the vms (with default values) that do not exist yet. Returns the ids of the created vms. """
+    return model.create_missing_vms(vm_ids)
+
+
 def get_tasks(include_dataset_stats=False) -> list:
     return model.get_tasks(include_dataset_stats)
 
@@ -260,6 +265,15 @@ def get_evaluations_with_keys_by_dataset(dataset_id, include_unpublished=False):
     return model.get_evaluations_with_keys_by_dataset(dataset_id, include_unpublished)
 
 
+def get_leaderboard(dataset_id, include_unpublished=False):
+    """ Get the materialized leaderboard of the dataset. Same result as get_evaluations_with_keys_by_dataset, but it
+    does not compute the leaderboard from the runs and evaluations.
+
+    :returns: a tuple (ev_keys, evaluation), see get_evaluations_with_keys_by_dataset
+    """
+    return model.get_leaderboard(dataset_id, include_unpublished)
+
+
 def get_evaluation(run_id: str):
     """ Get the evaluation of this run
 
@@ -412,6 +426,16 @@ def add_evaluator(vm_id: str, task_id: str, dataset_id: str, command: str, worki
     return ret
 
 
+def set_evaluator_git_repository(task_id: str, dataset_id: str, git_repository_id: str):
+    """ Set the git repository in which the evaluator of the dataset runs. """
+    ret = model.set_evaluator_git_repository(dataset_id, git_repository_id)
+
+    from django.core.cache import cache
+    get_evaluators_for_task(task_id=task_id, cache=cache, force_cache_refresh=True)
+
+    return ret
+
+
 def add_run(dataset_id, vm_id, run_id):
     """ Add a new run to the model. Currently, this initiates the caching on the application side of things. """
     return model.add_run(dataset_id, vm_id, run_id)
@@ -27,6 +27,7 @@ urlpatterns = [
     path('task/<str:task_id>/vm/<str:vm_id>/delete_software/docker/<str:docker_software_id>', vm_api.docker_software_delete, name='docker_delete'),
     path('task/<str:task_id>/vm/<str:vm_id>/upload/<str:dataset_id>', vm_api.upload, name='upload'),
 
+    path('grpc/vm-overview', vm_api.vm_overview, name='vm_overview'),
     path('grpc/<str:vm_id>/vm_info', vm_api.vm_info, name='vm_info'),
     path('grpc/<str:vm_id>/vm_state', vm_api.vm_state, name='vm_state'),
     path('grpc/<str:vm_id>/vm_start', vm_api.vm_start, name='vm_start'),
@@ -34,10 +35,13 @@ urlpatterns = [
     path('grpc/<str:vm_id>/vm_stop', vm_api.vm_stop, name="vm_stop"),
     path('grpc/<str:vm_id>/vm_shutdown', vm_api.vm_shutdown, name="vm_shutdown"),
     path('grpc/<str:vm_id>/run_abort', vm_api.run_abort, name="run_abort"),
+    path('grpc/<str:vm_id>/run_output', vm_api.run_output, name="run_output"),
     path('grpc/<str:vm_id>/vm_running_evaluations', vm_api.vm_running_evaluations, name="vm_running_evaluations"),
     path('grpc/<str:vm_id>/get_running_evaluations', vm_api.get_running_evaluations, name="get_running_evaluations"),
     path('grpc/<str:task_id>/<str:vm_id>/run_execute/vm/<str:software_id>', vm_api.run_execute, name="run_execute"),
     path('grpc/<str:task_id>/<str:vm_id>/run_execute/docker/<str:dataset_id>/<str:docker_software_id>/<str:docker_resources>', vm_api.run_execute_docker_software, name='run_execute_docker_software'),
+    path('grpc/<str:task_id>/<str:vm_id>/run_execute/docker-batch', vm_api.run_execute_docker_software_batch, name='run_execute_docker_software_batch'),
+    path('git/webhook', vm_api.git_webhook, name='git_webhook'),
 
     path('grpc/<str:vm_id>/run_eval/<str:dataset_id>/<str:run_id>', vm_api.run_eval, name="run_eval"),
     path('grpc/<str:vm_id>/run_delete/<str:dataset_id>/<str:run_id>', vm_api.run_delete, name="run_delete"),
@@ -59,6 +63,9 @@ urlpatterns = [
     path('tira-admin/delete-task/<str:task_id>', admin_api.admin_delete_task, name='tira-admin-delete-task'),
     path('tira-admin/add-dataset', admin_api.admin_add_dataset, name='tira-admin-add-dataset'),
     path('tira-admin/import-irds-dataset', admin_api.admin_import_ir_dataset, name='tira-admin-import-irds-dataset'),
+    path('tira-admin/background-jobs', admin_api.admin_background_jobs, name='tira-admin-background-jobs'),
+    path('tira-admin/background-jobs/<int:job_id>', admin_api.admin_background_job, name='tira-admin-background-job'),
+    path('tira-admin/git-metrics', admin_api.admin_git_metrics, name='tira-admin-git-metrics'),
     path('tira-admin/edit-dataset/<str:dataset_id>', admin_api.admin_edit_dataset, name='tira-admin-edit-dataset'),
     path('tira-admin/delete-dataset/<str:dataset_id>', admin_api.admin_delete_dataset, name='tira-admin-delete-dataset'),
     path('tira-admin/add-organizer/<str:organizer_id>', admin_api.admin_add_organizer, name='tira-admin-add-organizer'),
@@ -85,6 +92,7 @@ urlpatterns = [
     path('api/task/<str:task_id>/user/<str:user_id>/refresh-docker-images', data_api.update_docker_images, name="get_updated_docker_images"),
     path('api/task/<str:task_id>/user/<str:user_id>/software/running/<str:force_cache_refresh>', data_api.get_running_software, name='get_running_software'),
     path('api/review/<str:dataset_id>/<str:vm_id>/<str:run_id>', data_api.get_review, name='get_review'),
+    path('api/review/<str:dataset_id>/<str:vm_id>/<str:run_id>/output/<str:output_type>/<str:end>', data_api.get_run_output, name='get_run_output'),
     path('api/registration/add_registration/<str:vm_id>/<str:task_id>', data_api.add_registration, name='add_registration'),
 ]
 
@@ -8,7 +8,7 @@ import logging
 import tira.tira_model as model
 from .tira_data import get_run_runtime, get_run_file_list, get_stderr, get_stdout, get_tira_log
 from .authentication import auth
-from .checks import check_permissions, check_resources_exist, check_conditional_permissions
+from .checks import check_permissions, check_resources_exist, check_conditional_permissions, security_context
 from .forms import *
 from pathlib import Path
 from datetime import datetime as dt
@@ -23,7 +23,8 @@ logger.info("Views: Logger active")
 
 def add_context(func):
     def func_wrapper(request, *args, **kwargs):
-        uid = auth.get_user_id(request)
+        ctx = security_context(request)
+        uid = ctx.user_id
         vm_id = None
 
         if args and 'vm_id' in args:
@@ -34,7 +35,7 @@ def add_context(func):
         context = {
             "include_navigation": True if settings.DEPLOYMENT == "legacy" else False,
             "user_id": uid,
-            "role": auth.get_role(request, user_id=uid, vm_id=vm_id)
+            "role": ctx.role(vm_id)
         }
         return func(request, context, *args, **kwargs, )
 
@@ -381,6 +381,16 @@ API_ACCESS_MATRIX = [
             ORGANIZER: 302,
         },
     ),
+    route_to_test(
+        url_pattern='grpc/vm-overview',
+        params={},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 405,
+            PARTICIPANT: 405,
+            ORGANIZER: 405,
+        },
+    ),
     route_to_test(
         url_pattern='grpc/<str:vm_id>/vm_info',
         params={'vm_id': 'does-not-exist'},
@@ -506,6 +516,16 @@ API_ACCESS_MATRIX = [
     #        ORGANIZER: 302,
     #    },
     #),
+    route_to_test(
+        url_pattern='grpc/<str:vm_id>/run_output',
+        params={'vm_id': 'does-not-exist'},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 302,
+            PARTICIPANT: 302,
+            ORGANIZER: 302,
+        },
+    ),
     route_to_test(
         url_pattern='grpc/<str:vm_id>/vm_running_evaluations',
         params={'vm_id': 'does-not-exist'},
@@ -588,6 +608,48 @@ API_ACCESS_MATRIX = [
             ORGANIZER: 302,
         },
     ),
+    route_to_test(
+        url_pattern='grpc/<str:task_id>/<str:vm_id>/run_execute/docker-batch',
+        params={'task_id': 'shared-task-1', 'vm_id': 'does-not-exist'},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 302,
+            PARTICIPANT: 302,
+            ORGANIZER: 302,
+        },
+    ),
+    route_to_test(
+        url_pattern='grpc/<str:task_id>/<str:vm_id>/run_execute/docker-batch',
+        params={'task_id': 'shared-task-1', 'vm_id': PARTICIPANT.split('_')[-1]},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 302,
+            PARTICIPANT: 200,
+            ORGANIZER: 302,
+        },
+    ),
+    route_to_test(
+        url_pattern='git/webhook',
+        params={},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 200,
+            PARTICIPANT: 200,
+            ORGANIZER: 200,
+        },
+    ),
+    route_to_test(
+        url_pattern='git/webhook',
+        params={},
+        method='POST',
+        body='{}',
+        group_to_expected_status_code={
+            ADMIN: 403,
+            GUEST: 403,
+            PARTICIPANT: 403,
+            ORGANIZER: 403,
+        },
+    ),
     route_to_test(
         url_pattern='grpc/<str:vm_id>/run_eval/<str:dataset_id>/<str:run_id>',
         params={'vm_id': 'does-not-exist', 'dataset_id': f'dataset-1-{now}-training', 'run_id': 'run-1'},
@@ -739,6 +801,36 @@ API_ACCESS_MATRIX = [
             ORGANIZER: 405,
         },
     ),
+    route_to_test(
+        url_pattern='tira-admin/background-jobs',
+        params={},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 405,
+            PARTICIPANT: 405,
+            ORGANIZER: 405,
+        },
+    ),
+    route_to_test(
+        url_pattern='tira-admin/git-metrics',
+        params={},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 405,
+            PARTICIPANT: 405,
+            ORGANIZER: 405,
+        },
+    ),
+    route_to_test(
+        url_pattern='tira-admin/background-jobs/<int:job_id>',
+        params={'job_id': 1},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 405,
+            PARTICIPANT: 405,
+            ORGANIZER: 405,
+        },
+    ),
     route_to_test(
         url_pattern='tira-admin/edit-dataset/<str:dataset_id>',
         params={'dataset_id': 'does-not-exist'},
@@ -1069,13 +1161,45 @@ API_ACCESS_MATRIX = [
             ORGANIZER: 302, # TODO: Is this inconsistent with api/review/<str:dataset_id>/<str:vm_id>/<str:run_id> above?
         },
     ),
+    route_to_test(
+        url_pattern='api/review/<str:dataset_id>/<str:vm_id>/<str:run_id>/output/<str:output_type>/<str:end>',
+        params={'dataset_id': 'dataset-id-does-not-exist', 'vm_id': 'example_participant', 'run_id': 'run-1',
+                'output_type': 'stdout', 'end': '0'},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 405,
+            PARTICIPANT: 405,
+            ORGANIZER: 405,
+        },
+    ),
+    route_to_test(
+        url_pattern='api/review/<str:dataset_id>/<str:vm_id>/<str:run_id>/output/<str:output_type>/<str:end>',
+        params={'dataset_id': f'dataset-1-{now}-training', 'vm_id': 'example_participant', 'run_id': 'run-1',
+                'output_type': 'stdout', 'end': '0'},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 302,
+            PARTICIPANT: 302,
+            ORGANIZER: 302,
+        },
+    ),
+    route_to_test(
+        url_pattern='api/review/<str:dataset_id>/<str:vm_id>/<str:run_id>/output/<str:output_type>/<str:end>',
+        params={'dataset_id': f'dataset-1-{now}-training', 'vm_id': PARTICIPANT.split('_')[-1], 'run_id': 'run-1',
+                'output_type': 'stderr', 'end': '0'},
+        group_to_expected_status_code={
+            ADMIN: 200,
+            GUEST: 302,
+            PARTICIPANT: 200,
+            ORGANIZER: 302,
+        },
+    ),
     
-    # TODO: The following methods return 50X at the moment, we should improve the setup so that it returns 200. But for the moment 50X is enough to separate authenticated from unauthenticated.
     route_to_test(
         url_pattern='tira-admin/reload-data',
         params={},
         group_to_expected_status_code={
-            ADMIN: 500,
+            ADMIN: 200,
             GUEST: 405,
             PARTICIPANT: 405,
             ORGANIZER: 405,
@@ -1086,13 +1210,14 @@ API_ACCESS_MATRIX = [
         url_pattern='tira-admin/reload-runs/<str:vm_id>',
         params={'vm_id': 'does-not-exist'},
         group_to_expected_status_code={
-            ADMIN: 500,
+            ADMIN: 200,
             GUEST: 405,
             PARTICIPANT: 405,
             ORGANIZER: 405,
         },
         hide_stdout=True
     ),
+    # TODO: The following methods return 50X at the moment, we should improve the setup so that it returns 200. But for the moment 50X is enough to separate authenticated from unauthenticated.
     route_to_test(
         url_pattern='tira-admin/archive-vm',
         params={},
@@ -0,0 +1,87 @@
+"""
+Benchmark of IrDatasetsLoader.load_dataset_for_rerank on a synthetic dataset (no ir_datasets download needed).
+
+Usage (from application/test): PYTHONPATH=../src python3 benchmarks/benchmark_rerank.py --queries 250 --docs-per-query 1000
+"""
+from collections import namedtuple
+from pathlib import Path
+import argparse
+import tempfile
+import time
+
+from tira.ir_datasets_loader import IrDatasetsLoader
+
+Query = namedtuple('Query', ['query_id', 'title', 'description'])
+Doc = namedtuple('Doc', ['doc_id', 'text'])
+Qrel = namedtuple('Qrel', ['query_id', 'doc_id', 'relevance', 'iteration'])
+
+
+class SyntheticDocsStore(object):
+    def __init__(self, num_docs):
+        self.num_docs = num_docs
+
+    def get_many(self, doc_ids):
+        return {doc_id: Doc(doc_id, f'text of document {doc_id}') for doc_id in doc_ids}
+
+
+class SyntheticDataset(object):
+    def __init__(self, num_queries, num_docs):
+        self.num_queries = num_queries
+        self.num_docs = num_docs
+
+    def queries_iter(self):
+        return (Query(str(i), f'query {i}', f'description of query {i}') for i in range(self.num_queries))
+
+    def docs_store(self):
+        return SyntheticDocsStore(self.num_docs)
+
+    def qrels_iter(self):
+        return (Qrel(str(i), f'doc-{i}', 1, '0') for i in range(self.num_queries))
+
+
+def legacy_rerank_rows(dataset, run_file):
+    """ The previous implementation: a scan over all queries per row of the run file. """
+    loader = IrDatasetsLoader()
+    id_pairs = loader.extract_ids_from_run_file(run_file)
+    docs = loader.get_docs_by_ids(dataset, [i[1] for i in id_pairs])
+    for query_id, doc_id in id_pairs:
+        query = [query for query in dataset.queries_iter() if query.query_id == query_id][0]
+        yield loader.construct_rerank_row({query_id: query}, docs, query_id, doc_id)
+
+
+def main(num_queries, docs_per_query, legacy_rows):
+    dataset = SyntheticDataset(num_queries, num_queries * docs_per_query)
+    loader = IrDatasetsLoader()
+    loader.load_irds = lambda ir_datasets_id: dataset
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        run_file = Path(tmp_dir) / 'run.txt'
+        with run_file.open('w') as f:
+            for qid in range(num_queries):
+                for rank in range(docs_per_query):
+                    f.write(f'{qid} Q0 doc-{qid}-{rank} {rank + 1} {1000 - rank} benchmark\n')
+
+        rows = num_queries * docs_per_query
+        start = time.time()
+        loader.load_dataset_for_rerank('synthetic', Path(tmp_dir) / 'out', Path(tmp_dir) / 'truth', False, run_file)
+        seconds = time.time() - start
+        print(f'load_dataset_for_rerank: {rows} rows in {seconds:.2f} seconds ({rows / seconds:.0f} rows/sec).')
+
+        if legacy_rows:
+            start = time.time()
+            for i, _ in enumerate(legacy_rerank_rows(dataset, run_file)):
+                if i + 1 >= legacy_rows:
+                    break
+            seconds = time.time() - start
+            print(f'legacy implementation: {legacy_rows} rows in {seconds:.2f} seconds '
+                  f'({legacy_rows / seconds:.0f} rows/sec).')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the rerank import of the IrDatasetsLoader.')
+    parser.add_argument('--queries', default=250, type=int)
+    parser.add_argument('--docs-per-query', default=1000, type=int)
+    parser.add_argument('--legacy-rows', default=2000, type=int,
+                        help='Measure the previous implementation on the first rows only (0 to skip).')
+    args = parser.parse_args()
+    main(args.queries, args.docs_per_query, args.legacy_rows)
@@ -0,0 +1,60 @@
+"""
+Benchmark of the overhead of check_resources_exist per request, without (before) and with (after) the cache of the
+existence checks in tira.data.existence. Runs against a temporary test database.
+
+Usage (from application/test, after makemigrations): PYTHONPATH=../src:. DJANGO_SETTINGS_MODULE=settings_test \
+    python3 benchmarks/benchmark_resource_checks.py --requests 5000
+"""
+import argparse
+import time
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from mockito import mock
+
+
+def measure(view, requests, kwargs):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.time()
+        for _ in range(requests):
+            # a fresh request per call, so that the request-scoped security context does not memoize the checks
+            view(mock({'path_info': '/benchmark'}), **kwargs)
+        seconds = time.time() - start
+
+    return seconds / requests * 1000000, len(queries) / requests
+
+
+def main(requests):
+    from utils_for_testing import set_up_tira_environment, now
+    from tira.checks import check_resources_exist
+    import tira.data.existence as existence
+
+    set_up_tira_environment()
+    view = check_resources_exist('json')(lambda request, **kwargs: None)
+    kwargs = {'vm_id': 'example_participant', 'task_id': 'shared-task-1', 'dataset_id': f'dataset-1-{now}-training',
+              'run_id': 'run-1'}
+
+    maxsize = existence.cache.maxsize
+    existence.cache.maxsize = 0
+    existence.cache.invalidate()
+    micros, queries = measure(view, requests, kwargs)
+    print(f'without cache: {micros:.0f} microseconds and {queries:.1f} queries per request.')
+
+    existence.cache.maxsize = maxsize
+    micros, queries = measure(view, requests, kwargs)
+    print(f'with cache: {micros:.0f} microseconds and {queries:.1f} queries per request.')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the existence checks of check_resources_exist.')
+    parser.add_argument('--requests', default=5000, type=int)
+    args = parser.parse_args()
+
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        main(args.requests)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -2,6 +2,7 @@ from django.test import TestCase
 from api_access_matrix import access_matrix_for_user, GUEST
 from utils_for_testing import set_up_tira_environment, assert_all_url_patterns_are_tested, execute_method_behind_url_and_return_status_code
 from parameterized import parameterized
+from mockito import unstub
 
 
 class TestAccessibilityOfEndpointsForGuestUser(TestCase):
@@ -25,5 +26,6 @@ class TestAccessibilityOfEndpointsForGuestUser(TestCase):
 
     @classmethod
     def tearDownClass(cls):
+        unstub()
         assert_all_url_patterns_are_tested(cls.tested_urls)    
 
@@ -0,0 +1,24 @@
+from django.core.management import call_command
+from django.test import TestCase
+from mockito import when, mock, unstub
+
+import tira.tira_model as model
+import tira.model as modeldb
+
+
+class TestCreateTaskRepository(TestCase):
+    def tearDown(self):
+        unstub()
+
+    def test_the_evaluator_of_the_dataset_runs_in_the_created_repository(self):
+        task = modeldb.Task.objects.create(task_id='task-with-repository')
+        evaluator = modeldb.Evaluator.objects.create(evaluator_id='dataset-with-repository-evaluator',
+                                                     is_git_runner=True)
+        modeldb.Dataset.objects.create(dataset_id='dataset-with-repository', default_task=task, evaluator=evaluator)
+        git_integration = mock()
+        when(git_integration).create_task_repository('task-with-repository').thenReturn(42)
+        when(model).get_git_integration(task_id='task-with-repository').thenReturn(git_integration)
+
+        call_command('create_task_repository', task_id='task-with-repository', dataset_id='dataset-with-repository')
+
+        assert modeldb.Evaluator.objects.get(evaluator_id='dataset-with-repository-evaluator').git_repository_id == '42'
@@ -0,0 +1,192 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import time
+
+from django.test import TestCase, override_settings
+from mockito import when, mock, verify, unstub
+import gitlab
+
+import tira.git_runner_integration as git_runner_integration
+from tira.git_runner_integration import GitLabRunner
+import tira.model as modeldb
+
+TASK = 'task-1'
+VM = 'participant-1'
+RESOURCES = {'small-resources': {'cores': 1, 'ram': 10, 'gpu': 0},
+             'small-resources-gpu': {'cores': 1, 'ram': 10, 'gpu': '1-nvidia-1080'}}
+
+
+def gitlab_runner():
+    return GitLabRunner('private-token', 'git.example.com', 'tira', 'password', '1', 'registry.example.com/tira',
+                        'main')
+
+
+def job(dataset_id, tira_software_id='docker-software-1', resources='small-resources', git_repository_id=1):
+    return {'dataset_id': dataset_id, 'tira_software_id': tira_software_id, 'resources': resources,
+            'git_repository_id': git_repository_id, 'git_runner_image': 'evaluator-image',
+            'git_runner_command': 'evaluate', 'evaluator_id': f'{dataset_id}-evaluator',
+            'user_image_to_execute': 'user-image', 'user_command_to_execute': 'run'}
+
+
+def running_pipeline(dataset_id, software_id, scheduling='running'):
+    return {'job_config': {'dataset': dataset_id, 'software_id': software_id}, 'execution': {'scheduling': scheduling}}
+
+
+class TestRunDockerSoftwaresWithGitWorkflow(TestCase):
+    def setUp(self):
+        self.runner = gitlab_runner()
+        self.started = []
+        when(git_runner_integration).get_tira_id().thenReturn('2023-01-01-00-00-00')
+        when(self.runner).yield_all_running_pipelines(...).thenReturn([])
+        when(self.runner).start_git_workflow(...).thenAnswer(self.start_git_workflow)
+
+    def tearDown(self):
+        unstub()
+
+    def start_git_workflow(self, task_id, dataset_id, vm_id, run_id, git_runner_image, git_runner_command,
+                           git_repository_id, evaluator_id, user_image_to_execute, user_command_to_execute,
+                           tira_software_id, resources):
+        if dataset_id == 'dataset-that-fails':
+            raise ValueError('The branch could not be created.')
+        self.started += [(dataset_id, tira_software_id, resources, run_id)]
+        return f'transaction-of-{run_id}'
+
+    def submit(self, jobs):
+        return self.runner.run_docker_softwares_with_git_workflow(TASK, VM, jobs)
+
+    def test_jobs_are_answered_in_input_order_with_unique_run_ids(self):
+        actual = self.submit([job('dataset-3'), job('dataset-1'), job('dataset-2')])
+
+        assert [(i['dataset_id'], i['status'], i['run_id'], i['transaction_id']) for i in actual] == [
+            ('dataset-3', 'submitted', '2023-01-01-00-00-00', 'transaction-of-2023-01-01-00-00-00'),
+            ('dataset-1', 'submitted', '2023-01-01-00-00-00-1', 'transaction-of-2023-01-01-00-00-00-1'),
+            ('dataset-2', 'submitted', '2023-01-01-00-00-00-2', 'transaction-of-2023-01-01-00-00-00-2')]
+        assert [i[3] for i in self.started] == ['2023-01-01-00-00-00', '2023-01-01-00-00-00-1',
+                                                '2023-01-01-00-00-00-2']
+
+    def test_duplicates_in_the_batch_are_submitted_once(self):
+        actual = self.submit([job('dataset-1'), job('dataset-1'), job('dataset-1', resources='large-resources'),
+                              job('dataset-1', tira_software_id='docker-software-2')])
+
+        assert [(i['status'], i.get('message')) for i in actual] == [
+            ('submitted', None), ('duplicate', 'Same job as run 2023-01-01-00-00-00.'), ('submitted', None),
+            ('submitted', None)]
+        assert [i[:3] for i in self.started] == [('dataset-1', 'docker-software-1', 'small-resources'),
+                                                 ('dataset-1', 'docker-software-1', 'large-resources'),
+                                                 ('dataset-1', 'docker-software-2', 'small-resources')]
+
+    def test_jobs_that_are_already_pending_are_not_submitted(self):
+        when(self.runner).yield_all_running_pipelines(1, VM, None).thenReturn([
+            running_pipeline('dataset-1', 'docker-software-1'),
+            running_pipeline('dataset-2', 'docker-software-1', scheduling='failed')])
+
+        actual = self.submit([job('dataset-1'), job('dataset-2'), job('dataset-1', resources='large-resources')])
+
+        assert [(i['dataset_id'], i['status'], i.get('message')) for i in actual] == [
+            ('dataset-1', 'duplicate', 'The software is already running on the dataset.'),
+            ('dataset-2', 'submitted', None),
+            ('dataset-1', 'duplicate', 'The software is already running on the dataset.')]
+        # one listing of the running pipelines for the whole batch
+        verify(self.runner, times=1).yield_all_running_pipelines(...)
+
+    def test_a_failing_job_does_not_stop_the_batch(self):
+        actual = self.submit([job('dataset-that-fails'), job('dataset-1'), job('dataset-that-fails')])
+
+        assert [(i['dataset_id'], i['status'], i.get('message')) for i in actual] == [
+            ('dataset-that-fails', 'failed', 'The branch could not be created.'),
+            ('dataset-1', 'submitted', None),
+            ('dataset-that-fails', 'failed', 'The branch could not be created.')]
+        assert [i[0] for i in self.started] == ['dataset-1']
+
+
+@override_settings(GIT_CI_AVAILABLE_RESOURCES=RESOURCES)
+class TestStartGitWorkflow(TestCase):
+    def setUp(self):
+        self.runner = gitlab_runner()
+        self.commits, self.pipelines = [], []
+        self.commits_error, self.pipelines_error = None, None
+        project = mock({'commits': mock(), 'pipelines': mock()})
+        when(project.commits).create(...).thenAnswer(lambda payload: self.create(self.commits, self.commits_error,
+                                                                                 payload))
+        when(project.pipelines).create(...).thenAnswer(lambda payload: self.create(self.pipelines,
+                                                                                   self.pipelines_error, payload))
+        projects = mock()
+        when(projects).get(1, lazy=True).thenReturn(project)
+        self.runner.gitHoster_client = mock({'projects': projects})
+        when(time).sleep(...)
+
+    def tearDown(self):
+        unstub()
+
+    def create(self, created, error, payload):
+        created += [payload]
+        if error:
+            raise error
+
+    def start(self, resources='small-resources', dataset_id='dataset-1'):
+        return self.runner.start_git_workflow(TASK, dataset_id, VM, 'run-1', 'evaluator-image', 'evaluate', 1,
+                                              f'{dataset_id}-evaluator', 'user-image', 'run', 'docker-software-1',
+                                              resources)
+
+    def expected_job_file(self, transaction_id, identifier, resources='small-resources'):
+        with TemporaryDirectory() as tmp_dir:
+            self.runner.write_metadata_for_ci_job_to_repository(tmp_dir, TASK, transaction_id, 'dataset-1', VM,
+                                                                'run-1', identifier, 'evaluator-image', 'evaluate',
+                                                                'dataset-1-evaluator', 'user-image', 'run',
+                                                                'docker-software-1', resources)
+            return open(Path(tmp_dir) / 'dataset-1' / VM / 'run-1' / 'job-to-execute.txt').read()
+
+    def pipeline(self, identifier):
+        return modeldb.GitPipeline.objects.get(branch=identifier)
+
+    def test_the_branch_is_created_with_the_job_file(self):
+        transaction_id = self.start()
+
+        assert len(self.commits) == 1 and not self.pipelines
+        identifier = self.commits[0]['branch']
+        assert identifier.startswith(f'eval---dataset-1---{VM}---run-1---started-')
+        assert self.commits[0] == {
+            'branch': identifier, 'start_branch': 'main', 'commit_message': f'Evaluate software: {identifier}',
+            'actions': [{'action': 'create', 'file_path': f'dataset-1/{VM}/run-1/job-to-execute.txt',
+                         'content': self.expected_job_file(transaction_id, identifier)}]}
+        assert self.pipeline(identifier).status == 'submitted'
+        assert modeldb.EvaluationLog.objects.get(vm_id=VM, run_id='run-1').transaction_id == transaction_id
+
+    def test_the_pipeline_of_a_gpu_job_is_started_with_the_gpu(self):
+        transaction_id = self.start('small-resources-gpu')
+
+        identifier = self.commits[0]['branch']
+        assert self.commits[0]['commit_message'] == f'Evaluate software: {identifier} [ci skip]'
+        assert self.commits[0]['actions'][0]['content'] == self.expected_job_file(transaction_id, identifier,
+                                                                                  'small-resources-gpu')
+        assert self.pipelines == [{'ref': identifier, 'variables': [{'key': 'TIRA_GPU', 'value': '1-nvidia-1080'}]}]
+        assert self.pipeline(identifier).status == 'submitted'
+
+    def test_clone_and_push_if_the_branch_could_not_be_created(self):
+        self.commits_error = gitlab.exceptions.GitlabCreateError('A file with this name already exists', 400)
+        repo = mock()
+        when(self.runner).repo_url(1).thenReturn('https://git.example.com/task-1.git')
+        when(self.runner).clone_repository_and_create_new_branch(...).thenReturn(repo)
+        when(self.runner).commit_and_push(...)
+
+        self.start()
+
+        identifier = self.commits[0]['branch']
+        verify(self.runner, times=1).clone_repository_and_create_new_branch('https://git.example.com/task-1.git',
+                                                                            identifier, ...)
+        verify(self.runner, times=1).commit_and_push(repo, 'dataset-1', VM, 'run-1', identifier, 1,
+                                                     'small-resources')
+        assert not self.pipelines
+        assert self.pipeline(identifier).status == 'submitted'
+
+    def test_a_pipeline_that_can_not_be_started_fails_the_submission(self):
+        self.pipelines_error = gitlab.exceptions.GitlabCreateError('Service unavailable', 503)
+
+        with self.assertRaises(gitlab.exceptions.GitlabCreateError):
+            self.start('small-resources-gpu')
+
+        identifier = self.commits[0]['branch']
+        # the branch exists, so there is no fall back to clone and push, but the start of the pipeline is retried
+        assert len(self.commits) == 1 and len(self.pipelines) == 3
+        assert self.pipeline(identifier).status == 'failed'
+        assert git_runner_integration.git_pipelines.job_configuration(identifier) is not None
@@ -0,0 +1,165 @@
+from datetime import timedelta
+import json
+
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+
+from tira.endpoints.vm_api import git_webhook
+import tira.data.git_pipelines as git_pipelines
+import tira.model as modeldb
+
+TOKEN = 'my-webhook-token'
+BRANCH = 'eval---dataset-1---participant-1---run-1---started-2023-01-01-00-00-00'
+
+
+def pipeline_event(pipeline_id, status, builds=(), branch=BRANCH, project_id=1):
+    return {'object_kind': 'pipeline', 'project': {'id': project_id},
+            'object_attributes': {'id': pipeline_id, 'ref': branch, 'status': status},
+            'builds': [{'id': job_id, 'name': name, 'status': job_status} for job_id, name, job_status in builds]}
+
+
+def job_event(pipeline_id, job_id, name, status, branch=BRANCH, project_id=1):
+    return {'object_kind': 'build', 'project_id': project_id, 'ref': branch, 'pipeline_id': pipeline_id,
+            'build_id': job_id, 'build_name': name, 'build_status': status}
+
+
+@override_settings(GIT_WEBHOOK_TOKEN=TOKEN)
+class TestGitWebhook(TestCase):
+    def post(self, event, payload, token=TOKEN):
+        headers = {'HTTP_X_GITLAB_EVENT': event}
+        if token is not None:
+            headers['HTTP_X_GITLAB_TOKEN'] = token
+        request = RequestFactory().post('/git/webhook', data=json.dumps(payload), content_type='application/json',
+                                        **headers)
+        return git_webhook(request)
+
+    def pipeline(self, branch=BRANCH):
+        return modeldb.GitPipeline.objects.filter(branch=branch).first()
+
+    def setUp(self):
+        git_pipelines.record_submission(1, BRANCH)
+
+    def test_events_without_valid_token_are_forbidden(self):
+        for token in [None, '', 'wrong-token']:
+            response = self.post('Pipeline Hook', pipeline_event(10, 'running'), token=token)
+            assert response.status_code == 403, f'Expected 403 for token {token}, but got {response.status_code}'
+
+        assert self.pipeline().status == 'submitted'
+
+    def test_events_are_forbidden_without_configured_token(self):
+        with override_settings(GIT_WEBHOOK_TOKEN=None):
+            response = self.post('Pipeline Hook', pipeline_event(10, 'running'), token='')
+
+        assert response.status_code == 403
+        assert self.pipeline().status == 'submitted'
+
+    def test_pipeline_event_updates_the_pipeline_and_its_jobs(self):
+        response = self.post('Pipeline Hook', pipeline_event(10, 'running', [(100, 'run-user-software', 'running'),
+                                                                              (101, 'evaluate-software', 'created')]))
+
+        assert response.status_code == 200
+        pipeline = self.pipeline()
+        assert pipeline.pipeline_id == 10
+        assert pipeline.status == 'running'
+        assert pipeline.jobs == {'run-user-software': {'id': 100, 'status': 'running'},
+                                 'evaluate-software': {'id': 101, 'status': 'created'}}
+
+    def test_job_event_updates_the_job(self):
+        self.post('Pipeline Hook', pipeline_event(10, 'running', [(100, 'run-user-software', 'running')]))
+        response = self.post('Job Hook', job_event(10, 100, 'run-user-software', 'success'))
+
+        assert response.status_code == 200
+        pipeline = self.pipeline()
+        assert pipeline.status == 'running'
+        assert pipeline.jobs == {'run-user-software': {'id': 100, 'status': 'success'}}
+
+    def test_events_of_a_new_pipeline_replace_the_jobs(self):
+        self.post('Pipeline Hook', pipeline_event(10, 'failed', [(100, 'run-user-software', 'failed')]))
+        self.post('Job Hook', job_event(11, 110, 'run-user-software', 'pending'))
+
+        pipeline = self.pipeline()
+        assert pipeline.pipeline_id == 11
+        assert pipeline.jobs == {'run-user-software': {'id': 110, 'status': 'pending'}}
+
+    def test_events_of_older_pipelines_are_ignored(self):
+        self.post('Pipeline Hook', pipeline_event(11, 'running', [(110, 'run-user-software', 'running')]))
+        self.post('Pipeline Hook', pipeline_event(10, 'failed', [(100, 'run-user-software', 'failed')]))
+        self.post('Job Hook', job_event(10, 100, 'run-user-software', 'failed'))
+
+        pipeline = self.pipeline()
+        assert pipeline.pipeline_id == 11
+        assert pipeline.status == 'running'
+        assert pipeline.jobs == {'run-user-software': {'id': 110, 'status': 'running'}}
+
+    def test_events_of_unknown_branches_are_ignored(self):
+        # e.g., the pipeline was canceled by stop_job_and_clean_up, which deleted the branch and its row
+        git_pipelines.delete(BRANCH)
+        response = self.post('Pipeline Hook', pipeline_event(10, 'canceled'))
+
+        assert response.status_code == 200
+        assert self.pipeline() is None
+
+    def test_other_events_and_invalid_payloads(self):
+        assert self.post('Push Hook', {}).status_code == 200
+        assert self.post('Pipeline Hook', {'object_kind': 'pipeline'}).status_code == 400
+        assert self.pipeline().status == 'submitted'
+
+
+class TestReconcileGitPipelines(TestCase):
+    def test_reconcile_overwrites_the_state_with_the_polled_pipelines(self):
+        git_pipelines.record_submission(1, 'running-branch')
+        git_pipelines.record_submission(1, 'stale-running-branch', 'running')
+        git_pipelines.record_submission(1, 'deleted-branch', 'failed')
+        git_pipelines.record_submission(2, 'branch-of-other-repository', 'failed')
+        modeldb.GitPipeline.objects.update(last_update=timezone.now() - timedelta(minutes=5))
+        # updated by a webhook while the polling was running
+        git_pipelines.record_submission(1, 'new-branch')
+
+        git_pipelines.reconcile(1, timezone.now() - timedelta(minutes=1),
+                                {'running-branch': (10, 'running', {'run-user-software': {'id': 100,
+                                                                                          'status': 'running'}})},
+                                ['stale-running-branch', 'branch-without-events'])
+
+        actual = {p.branch: (p.pipeline_id, p.status) for p in modeldb.GitPipeline.objects.all()}
+        assert actual == {'running-branch': (10, 'running'), 'stale-running-branch': (None, 'failed'),
+                          'branch-without-events': (None, 'failed'), 'new-branch': (None, 'submitted'),
+                          'branch-of-other-repository': (None, 'failed')}
+
+    def test_reconcile_keeps_the_pipelines_that_were_updated_while_polling(self):
+        git_pipelines.record_submission(1, BRANCH)
+        modeldb.GitPipeline.objects.update(last_update=timezone.now() - timedelta(minutes=5))
+        started = timezone.now() - timedelta(minutes=1)
+        # the pipeline finished after the polling listed it as running
+        git_pipelines.update_from_pipeline_event(pipeline_event(10, 'success', [(100, 'run-user-software',
+                                                                                 'success')]))
+
+        git_pipelines.reconcile(1, started, {BRANCH: (10, 'running', {'run-user-software': {'id': 100,
+                                                                                          'status': 'running'}})},
+                                [])
+
+        pipeline = modeldb.GitPipeline.objects.get(branch=BRANCH)
+        assert (pipeline.pipeline_id, pipeline.status) == (10, 'success')
+        assert pipeline.jobs == {'run-user-software': {'id': 100, 'status': 'success'}}
+
+    def test_reconcile_removes_the_job_configurations_of_deleted_branches(self):
+        for branch in ['running-branch', 'failed-branch', 'deleted-branch']:
+            git_pipelines.save_job_configuration(1, branch, {'TIRA_RUN_ID': branch}, {})
+        git_pipelines.save_job_configuration(2, 'branch-of-other-repository', {}, {})
+        modeldb.GitJobConfiguration.objects.update(created=timezone.now() - timedelta(minutes=5))
+        # submitted while the polling was running
+        git_pipelines.save_job_configuration(1, 'new-branch', {}, {})
+
+        git_pipelines.reconcile(1, timezone.now() - timedelta(minutes=1), {'running-branch': (10, 'running', {})},
+                                ['failed-branch'])
+
+        actual = set(modeldb.GitJobConfiguration.objects.values_list('branch', flat=True))
+        assert actual == {'running-branch', 'failed-branch', 'new-branch', 'branch-of-other-repository'}
+
+    def test_delete_removes_the_pipeline_and_the_job_configuration(self):
+        git_pipelines.record_submission(1, BRANCH)
+        git_pipelines.save_job_configuration(1, BRANCH, {'TIRA_RUN_ID': 'run-1'}, {'run_id': 'run-1'})
+
+        git_pipelines.delete(BRANCH)
+
+        assert not modeldb.GitPipeline.objects.filter(branch=BRANCH).exists()
+        assert git_pipelines.job_configuration(BRANCH) is None
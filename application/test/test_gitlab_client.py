@@ -0,0 +1,139 @@
+import io
+import threading
+import time
+
+from django.test import SimpleTestCase
+from mockito import when, unstub
+from requests.adapters import BaseAdapter
+import requests
+
+import tira.gitlab_client as gitlab_client
+from tira.gitlab_client import RateLimitedSession, TokenBucket, fan_out
+
+
+class FakeConnection(io.BytesIO):
+    released = False
+
+    def release_conn(self):
+        self.released = True
+
+
+class FakeAdapter(BaseAdapter):
+    """ Answers the requests with the given status codes and headers, in order. """
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = []
+
+    def send(self, request, **kwargs):
+        status_code, headers = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code, response.request, response.url = status_code, request, request.url
+        response.headers.update(headers)
+        response.raw = FakeConnection()
+        self.sent += [response]
+        return response
+
+    def close(self):
+        pass
+
+
+class TestRateLimitedSession(SimpleTestCase):
+    def setUp(self):
+        self.sleeps = []
+        when(time).sleep(...).thenAnswer(self.sleeps.append)
+
+    def tearDown(self):
+        unstub()
+
+    def session(self, responses):
+        adapter = FakeAdapter(responses)
+        session = RateLimitedSession(TokenBucket(rate=1000, burst=1000))
+        session.mount('https://', adapter)
+        return session, adapter
+
+    def test_rate_limited_requests_are_retried_after_retry_after(self):
+        session, adapter = self.session([(429, {'Retry-After': '3'}), (200, {})])
+        rate_limited = gitlab_client.get_metrics()['rate_limited']
+
+        response = session.get('https://git.example.com/api/v4/projects/1')
+
+        assert response.status_code == 200
+        assert len(adapter.sent) == 2
+        # the connection of the rate-limited response is released, the other requests to the host pause
+        assert adapter.sent[0].raw.released
+        assert len(self.sleeps) == 1 and 2.5 < self.sleeps[0] <= 3
+        assert gitlab_client.get_metrics()['rate_limited'] == rate_limited + 1
+
+    def test_invalid_retry_after_backs_off_exponentially(self):
+        session, adapter = self.session([(429, {'Retry-After': 'soon'}), (429, {}), (200, {})])
+
+        assert session.get('https://git.example.com/api/v4/projects/1').status_code == 200
+        assert [round(i) for i in self.sleeps] == [1, 2]
+
+    def test_the_last_rate_limited_response_is_returned(self):
+        session, adapter = self.session([(429, {'Retry-After': '1'})] * (gitlab_client.max_retries_on_429 + 1))
+
+        assert session.get('https://git.example.com/api/v4/projects/1').status_code == 429
+        assert len(adapter.sent) == gitlab_client.max_retries_on_429 + 1
+        assert not adapter.sent[-1].raw.released
+
+
+class TestTokenBucket(SimpleTestCase):
+    def setUp(self):
+        self.sleeps = []
+        when(time).sleep(...).thenAnswer(self.sleeps.append)
+        when(time).monotonic().thenReturn(100.0)
+
+    def tearDown(self):
+        unstub()
+
+    def test_bursts_and_rate(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        for _ in range(4):
+            bucket.acquire()
+
+        assert [round(i, 2) for i in self.sleeps] == [0.1, 0.2]
+
+    def test_tokens_are_refilled_up_to_the_burst(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.acquire()
+        when(time).monotonic().thenReturn(200.0)
+        for _ in range(2):
+            bucket.acquire()
+
+        assert self.sleeps == []
+
+    def test_pause(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.pause(5)
+        bucket.acquire()
+
+        assert self.sleeps == [5]
+
+
+class TestFanOut(SimpleTestCase):
+    def test_results_are_in_the_order_of_the_items(self):
+        def slow_for_small_items(i):
+            time.sleep(0.01 * (5 - i))
+            return i * i, threading.current_thread().name
+
+        actual = fan_out(slow_for_small_items, range(5))
+
+        assert [i for i, _ in actual] == [0, 1, 4, 9, 16]
+        assert all(name.startswith('gitlab-client') for _, name in actual)
+
+    def test_errors_of_the_calls_are_raised(self):
+        def fail_on_3(i):
+            if i == 3:
+                raise ValueError(f'Item {i} failed.')
+            return i
+
+        with self.assertRaisesRegex(ValueError, 'Item 3 failed.'):
+            fan_out(fail_on_3, range(5))
+
+    def test_nested_calls_run_sequentially(self):
+        actual = fan_out(lambda i: fan_out(lambda j: (i, j, threading.current_thread().name), range(2)), range(3))
+
+        assert [[(i, j) for i, j, _ in inner] for inner in actual] == [[(i, 0), (i, 1)] for i in range(3)]
+        assert all(len({name for _, _, name in inner}) == 1 for inner in actual)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+
+import tira.data.leaderboard as leaderboard
+import tira.model as modeldb
+
+DATASET = 'dataset-of-leaderboard'
+
+
+class TestLeaderboard(TestCase):
+    def setUp(self):
+        vm = modeldb.VirtualMachine.objects.create(vm_id='participant-of-leaderboard')
+        task = modeldb.Task.objects.create(task_id='task-of-leaderboard', vm=vm)
+        dataset = modeldb.Dataset.objects.create(dataset_id=DATASET, default_task=task)
+        evaluator = modeldb.Evaluator.objects.create(evaluator_id='eval-of-leaderboard')
+        upload = modeldb.Upload.objects.create(vm=vm, task=task)
+
+        for i in [1, 2]:
+            input_run = modeldb.Run.objects.create(run_id=f'lb-run-{i}', upload=upload, input_dataset=dataset,
+                                                   task=task)
+            run = modeldb.Run.objects.create(run_id=f'lb-eval-run-{i}', evaluator=evaluator, input_run=input_run,
+                                             input_dataset=dataset, task=task)
+            modeldb.Review.objects.create(run=run, published=True)
+            modeldb.Evaluation.objects.create(run=run, measure_key='accuracy', measure_value=f'0.{i}')
+
+    def test_leaderboard_without_entries_is_computed(self):
+        keys, evaluations = leaderboard.get_leaderboard(DATASET)
+
+        assert keys == ['accuracy']
+        assert [(i['run_id'], i['input_run_id'], i['measures']) for i in evaluations] == \
+               [('lb-eval-run-1', 'lb-run-1', [0.1]), ('lb-eval-run-2', 'lb-run-2', [0.2])]
+        assert not modeldb.LeaderboardEntry.objects.exists()
+
+    def test_leaderboard_after_a_single_incremental_update(self):
+        modeldb.Evaluation.objects.filter(run_id='lb-eval-run-2').update(measure_value='0.3')
+        leaderboard.update_entry('lb-eval-run-2')
+
+        _, evaluations = leaderboard.get_leaderboard(DATASET)
+
+        assert [(i['run_id'], i['measures']) for i in evaluations] == \
+               [('lb-eval-run-1', [0.1]), ('lb-eval-run-2', [0.3])]
+        assert leaderboard.drift(DATASET) == {'missing': [], 'outdated': [], 'orphaned': []}
+
+    def test_incremental_updates_of_a_materialized_leaderboard(self):
+        leaderboard.rebuild(DATASET)
+        modeldb.Review.objects.filter(run_id='lb-eval-run-1').update(published=False)
+        leaderboard.update_entry('lb-eval-run-1')
+
+        _, evaluations = leaderboard.get_leaderboard(DATASET)
+
+        assert [i['run_id'] for i in evaluations] == ['lb-eval-run-2']
+        assert leaderboard.drift(DATASET) == {'missing': [], 'outdated': [], 'orphaned': []}
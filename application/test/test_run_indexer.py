@@ -0,0 +1,120 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import TestCase
+
+from tira.data.run_indexer import incremental_index_runs, RunsDirectoryUnavailable
+import tira.data.leaderboard as leaderboard
+import tira.model as modeldb
+
+DATASET = 'dataset-of-indexer'
+VM = 'participant-of-indexer'
+
+
+def write_run(runs_dir_path, run_id, measures=None, software_id='upload', input_run=None):
+    run_dir = runs_dir_path / DATASET / VM / run_id
+    (run_dir / 'output').mkdir(parents=True, exist_ok=True)
+    run = f'softwareId: "{software_id}"\nrunId: "{run_id}"\ninputDataset: "{DATASET}"\ndownloadable: true\n' \
+          'deleted: false\n'
+    if input_run:
+        run += f'inputRun: "{input_run}"\n'
+    open(run_dir / 'run.prototext', 'w').write(run)
+
+    for name in ['evaluation.prototext', 'evaluation.bin']:
+        if (run_dir / 'output' / name).exists():
+            (run_dir / 'output' / name).unlink()
+    if measures:
+        open(run_dir / 'output' / 'evaluation.prototext', 'w').write(
+            ''.join(f'measure {{\n  key: "{k}"\n  value: "{v}"\n}}\n' for k, v in measures))
+
+    return run_dir
+
+
+def remove_run(run_dir):
+    for f in sorted(run_dir.rglob('*'), reverse=True):
+        f.rmdir() if f.is_dir() else f.unlink()
+    run_dir.rmdir()
+
+
+class TestIncrementalIndexRuns(TestCase):
+    def setUp(self):
+        vm = modeldb.VirtualMachine.objects.create(vm_id=VM)
+        task = modeldb.Task.objects.create(task_id='task-of-indexer', vm=vm)
+        modeldb.Dataset.objects.create(dataset_id=DATASET, default_task=task)
+        self.tmp_dir = TemporaryDirectory()
+        self.runs_dir_path = Path(self.tmp_dir.name) / 'runs'
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def runs(self):
+        return set(modeldb.Run.objects.values_list('run_id', flat=True))
+
+    def test_added_changed_and_deleted_runs(self):
+        write_run(self.runs_dir_path, 'run-1')
+        run_dir_2 = write_run(self.runs_dir_path, 'run-2')
+        stats = incremental_index_runs(self.runs_dir_path)
+
+        assert (stats['runs'], stats['unchanged'], stats['purged']) == (2, 0, 0)
+        assert self.runs() == {'run-1', 'run-2'}
+
+        stats = incremental_index_runs(self.runs_dir_path)
+        assert (stats['runs'], stats['unchanged'], stats['purged']) == (0, 2, 0)
+
+        write_run(self.runs_dir_path, 'run-1', measures=[('accuracy', '0.5')])
+        write_run(self.runs_dir_path, 'run-3')
+        remove_run(run_dir_2)
+        stats = incremental_index_runs(self.runs_dir_path)
+
+        assert (stats['runs'], stats['unchanged'], stats['purged']) == (2, 0, 1)
+        assert self.runs() == {'run-1', 'run-3'}
+        assert list(modeldb.Evaluation.objects.values_list('run_id', 'measure_key', 'measure_value')) == \
+               [('run-1', 'accuracy', '0.5')]
+        assert set(modeldb.IndexedRunDirectory.objects.values_list('run_id', flat=True)) == {'run-1', 'run-3'}
+
+    def test_runs_evaluations_and_the_order_of_the_measures(self):
+        modeldb.Evaluator.objects.create(evaluator_id='eval-of-indexer')
+        measures = [(f'measure-{i}', f'0.{i}') for i in [7, 3, 9, 1, 5, 8, 2, 6, 4]]
+        write_run(self.runs_dir_path, 'run-1')
+        write_run(self.runs_dir_path, 'run-2', measures, software_id='eval-of-indexer', input_run='run-1')
+
+        incremental_index_runs(self.runs_dir_path)
+
+        run = modeldb.Run.objects.get(run_id='run-2')
+        assert (run.evaluator_id, run.input_run_id, run.input_dataset_id) == ('eval-of-indexer', 'run-1', DATASET)
+        assert modeldb.Run.objects.get(run_id='run-1').upload.vm_id == VM
+        assert list(modeldb.Evaluation.objects.filter(run_id='run-2').order_by('id')
+                    .values_list('measure_key', 'measure_value')) == measures
+        keys, evaluations = leaderboard.get_leaderboard(DATASET, include_unpublished=True, round_floats=False)
+        assert keys == [k for k, _ in measures]
+        assert [(i['run_id'], i['vm_id'], i['measures']) for i in evaluations] == \
+               [('run-2', VM, [v for _, v in measures])]
+
+    def test_missing_runs_directory_does_not_purge_the_runs(self):
+        write_run(self.runs_dir_path, 'run-1')
+        write_run(self.runs_dir_path, 'run-2', software_id='eval', input_run='run-1')
+        incremental_index_runs(self.runs_dir_path)
+        assert self.runs() == {'run-1', 'run-2'}
+
+        # e.g., the volume is not mounted
+        self.tmp_dir.cleanup()
+        with self.assertRaises(RunsDirectoryUnavailable):
+            incremental_index_runs(self.runs_dir_path)
+
+        assert self.runs() == {'run-1', 'run-2'}
+        assert modeldb.IndexedRunDirectory.objects.count() == 2
+
+    def test_empty_runs_directory_does_not_purge_the_runs(self):
+        # nothing was indexed before, so an empty runs directory is fine
+        self.runs_dir_path.mkdir()
+        assert incremental_index_runs(self.runs_dir_path)['runs'] == 0
+
+        run_dir = write_run(self.runs_dir_path, 'run-1')
+        incremental_index_runs(self.runs_dir_path)
+
+        # e.g., an empty mount point
+        remove_run(run_dir)
+        with self.assertRaises(RunsDirectoryUnavailable):
+            incremental_index_runs(self.runs_dir_path)
+
+        assert self.runs() == {'run-1'}
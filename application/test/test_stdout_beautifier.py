@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase
+
+from tira.endpoints.stdout_beautifier import ansi_to_html, beautify_ansi_text, BRIGHT
+
+
+def to_html(*chunks):
+    return ''.join(ansi_to_html(chunks))
+
+
+class TestAnsiToHtml(SimpleTestCase):
+    def test_text_is_html_escaped(self):
+        assert to_html('</pre><script>alert("x") & more</script>') == \
+               '&lt;/pre&gt;&lt;script&gt;alert("x") &amp; more&lt;/script&gt;'
+
+    def test_escaped_text_in_a_colored_span(self):
+        assert to_html('\x1b[31m<b>\x1b[0m') == '<span style="color:red;">&lt;b&gt;</span>'
+
+    def test_sgr_colors_and_attributes(self):
+        assert to_html('\x1b[1;32mok\x1b[0m done') == '<span style="font-weight:bold;color:green;">ok</span> done'
+        assert to_html('\x1b[92mo\x1b[0m') == f'<span style="{BRIGHT}color:green;">o</span>'
+        assert to_html('\x1b[44;4mx') == '<span style="text-decoration:underline;background-color:blue;">x</span>'
+        assert to_html('\x1b[7mx') == '<span style="color:white;background-color:black;">x</span>'
+
+    def test_256_and_true_colors(self):
+        assert to_html('\x1b[38;5;196mx\x1b[48;2;1;2;3my') == \
+               '<span style="color:#ff0000;">x</span><span style="color:#ff0000;background-color:#010203;">y</span>'
+        assert to_html('\x1b[38;5;232mx') == '<span style="color:#080808;">x</span>'
+
+    def test_resets(self):
+        assert to_html('\x1b[1;31ma\x1b[22mb\x1b[39mc\x1b[mdef') == \
+               '<span style="font-weight:bold;color:red;">a</span><span style="color:red;">b</span>cdef'
+
+    def test_other_escape_sequences_are_dropped(self):
+        assert to_html('\x1b[2Kline\x1b[?25h\x1b[1A') == 'line'
+
+    def test_sgr_sequences_without_escape_character(self):
+        assert to_html('  [[92mo[0m] The file is valid.') == \
+               f'  [<span style="{BRIGHT}color:green;">o</span>] The file is valid.'
+
+    def test_sequences_split_across_chunks(self):
+        expected = 'a<span style="color:red;">red</span> b'
+        assert to_html('a\x1b[31mred\x1b[0m b') == expected
+        assert to_html('a\x1b[3', '1mred\x1b', '[0m b') == expected
+        assert to_html('a\x1b', '[', '31', 'mred\x1b[0', 'm b') == expected
+
+    def test_incomplete_sequence_at_the_end(self):
+        assert to_html('\x1b[31mred', '\x1b[') == '<span style="color:red;">red[</span>'
+
+    def test_beautify_ansi_text(self):
+        assert beautify_ansi_text('a\n\x1b[31mb\n') == '<pre>\na\n<span style="color:red;">b\n</span></pre>'
@@ -9,6 +9,8 @@ from contextlib import redirect_stdout, redirect_stderr
 from datetime import datetime
 import json
 from tira.tira_model import model as tira_model
+from tira import background_jobs
+import tira.model as modeldb
 
 #Used for some tests
 now = datetime.now().strftime("%Y%m%d")
@@ -55,6 +57,13 @@ def set_up_tira_environment():
         f.write(f'\nsoftwareId: "upload"\nrunId: "run-1"\ninputDataset: "dataset-1-{now}-training"\ndownloadable: true\ndeleted: false\n')
         
     tira_model.add_run(dataset_id='dataset-1', vm_id='example_participant', run_id='run-1')
+    mock_background_jobs()
+
+def mock_background_jobs():
+    """ Record the background jobs as queued without starting the processes of the jobs. Undo with mockito.unstub. """
+    when(background_jobs).start_job(...).thenAnswer(
+        lambda title, cmd, args: modeldb.BackgroundJob.objects.create(title=title, cmd=cmd, args=args).job_id)
+
 
 def mock_request(groups, url_pattern, method='GET', body=None, params=None):
     if 'DISRAPTOR_APP_SECRET_KEY' not in os.environ:
@@ -21,6 +21,7 @@ from proto import tira_host_pb2, tira_host_pb2_grpc
 from proto import TiraClientWebMessages_pb2 as modelpb
 from tira_model import FileDatabase
 from grpc_client import TiraHostClient
+from scheduler import scheduler
 import vm_manage
 
 
@@ -30,6 +31,7 @@ grpc_port = config.get('main', 'grpc_port')
 tira_application_host = config.get('main', 'tira_application_host')
 tira_application_grpc_port = config.get('main', 'tira_application_grpc_port')
 tira_log_path = config.get('main', 'tira_log_path')
+vm_info_refresh_interval = config.getint('main', 'vm_info_refresh_interval', fallback=30)
 
 fileConfig("conf/logging_config.ini", defaults={'filename': f"{tira_log_path}{socket.gethostname()}.log"},
            disable_existing_loggers=False)
@@ -51,19 +53,45 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
     def __init__(self):
         def call():
             """
-            Start a background thread that makes heartbeat calls to tira-application.
+            Start a background thread that refreshes the vm snapshots and makes heartbeat calls to tira-application.
             """
             while True:
-                time.sleep(2 * 60)
-                self.heartbeat()
-
-        self.model = FileDatabase(on_modified_callback=self.load_vms_list)
+                time.sleep(vm_info_refresh_interval)
+                try:
+                    self.heartbeat()
+                except Exception as e:
+                    logger.error(f"Heartbeat failed: {e}")
+
+        self.model = FileDatabase(on_modified_callback=self.reconcile_vms)
+        self.reported_states = {}
         self.load_vms_list()
 
-        thread = threading.Thread(target=call)
+        thread = threading.Thread(target=call, daemon=True)
         thread.start()
 
-    def load_vms_list(self):
+    def reconcile_vms(self, changes):
+        """
+        Apply a change set of users.prototext (see FileDatabase.reload_vms): changed vms take over their new
+        configuration, removed vms are dropped (unless they run a transaction), and only added vms are looked up via
+        vboxmanage.
+        """
+        for vm_id in changes['changed']:
+            if vm_id in vms:
+                vms[vm_id].update(self.model.get_vm_by_id(vm_id))
+                logger.info(f"VM '{vm_id}' was updated")
+
+        for vm_id in changes['removed']:
+            if vm_id in vms and vms[vm_id].transaction_id is None:
+                vms.pop(vm_id)
+                logger.info(f"VM '{vm_id}' was removed")
+
+        if changes['added']:
+            self.load_vms_list(changes['added'])
+
+    def load_vms_list(self, vm_ids=None):
+        """
+        Load the vms known to vboxmanage that are not loaded yet (only those in vm_ids, if given).
+        """
         logger.info("Loading existing vms from vboxmanage, this may take a while...")
         vm_id_list =  []
 
@@ -79,8 +107,8 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
             if not line: continue
             vm_name_full = line.split(' ')[0].strip('\"')
             vm_id = vm_name_full.split("-tira-")[0][:-3]
-            if vm_id not in vms:
-                vm_id_list.append(vm_name_full.split("-tira-")[0][:-3])
+            if vm_id not in vms and (vm_ids is None or vm_id in vm_ids):
+                vm_id_list.append(vm_id)
 
         for vm_id in vm_id_list:
             if vm_id in vms:
@@ -93,8 +121,22 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
             logger.info(f"VM '{vm_id}' (state: {vms[vm_id].state}) was loaded")
 
     def heartbeat(self):
-        # todo: call tira-application.set_state(state, vmId) for all vms on the current host?
-        pass
+        """
+        Refresh the snapshot of all vms on this host (concurrently, since each refresh runs vm-info and probes the
+        ports) and report the vms whose state changed to tira-application via set_state.
+        """
+        current_vms = list(vms.values())
+        if not current_vms:
+            return
+
+        with futures.ThreadPoolExecutor(max_workers=min(len(current_vms), 8)) as executor:
+            list(executor.map(lambda vm: vm.info(), current_vms))
+
+        for vm in current_vms:
+            if vm.transaction_id is None and self.reported_states.get(vm.vm_id) != vm.state:
+                # set_state is called without transaction, the running transactions report their states themselves
+                if grpc_client.set_state(vm.vm_id, vm.state, "") is not None:
+                    self.reported_states[vm.vm_id] = vm.state
 
     def _get_vm(self, vm_id, context) -> vm_manage.VirtualMachine:
         if vm_id not in vms:
@@ -169,21 +211,29 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
 
         return response
 
-    def vm_info(self, request, context, cached=False):
+    def vm_info(self, request, context):
         """
-
+        Answer from the snapshot of the vm that the heartbeat refreshes in the background. The message of the
+        transaction contains the time of the snapshot.
         :param request:
         :param context:
         :return:
         """
         vm = self._get_vm(request.vmId, context)
 
-        if not cached:
-            vm.info()
+        return self._vm_info_message(vm)
+
+    @staticmethod
+    def _vm_info_message(vm):
+        if vm.info_updated is None or time.time() - vm.info_updated > 2 * vm_info_refresh_interval:
+            vm.info()  # the snapshot is missing or the heartbeat is behind
 
+        updated = datetime.fromtimestamp(vm.info_updated).isoformat() if vm.info_updated else 'never'
+        position = scheduler.position(vm.transaction_id) if vm.transaction_id else None
+        queued = f" Transaction {vm.transaction_id} is waiting at position {position} in the queue." if position else ""
         response = tira_host_pb2.VmInfo(transaction=tira_host_pb2.Transaction(
             status=tira_host_pb2.Status.SUCCESS,
-            message="Host received vm-info request",
+            message=f"Host received vm-info request. Snapshot updated at {updated}.{queued}",
             transactionId=str(uuid.uuid4())
         ))
 
@@ -204,8 +254,11 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
         return response
 
     def vm_list(self, request, context):
-        response = tira_host_pb2.VmList(transaction=request.transaction,
-                                        vmsInfo=[self.vm_info({'vmId': vm.vm_id}, context, cached=True) for vm in vms])
+        response = tira_host_pb2.VmList(transaction=tira_host_pb2.Transaction(
+            status=tira_host_pb2.Status.SUCCESS,
+            message="Host received vm-list request",
+            transactionId=str(uuid.uuid4())
+        ), vmsInfo=[self._vm_info_message(vm) for vm in list(vms.values())])
         return response
 
     def vm_shutdown(self, request, context):
@@ -292,10 +345,39 @@ class TiraHostService(tira_host_pb2_grpc.TiraHostService):
         """
         vm = self._get_vm(request.vmId, context)
 
+        if vm.transaction_id is not None and scheduler.cancel(vm.transaction_id):
+            return tira_host_pb2.Transaction(status=tira_host_pb2.Status.SUCCESS,
+                                             transactionId=request.transaction.transactionId,
+                                             message="Cancelled the waiting transaction")
+
         return vm.run_abort(request.transaction.transactionId, request)
 
+    def run_output(self, request, context):
+        """
+        Stream the output of the running transaction of the vm: first the lines in the buffer of the vm, then each
+        new chunk of lines as it is written. The stream ends when the vm has no running transaction anymore.
+        :param request:
+        :param context:
+        :return:
+        """
+        vm = self._get_vm(request.vmId, context)
+        seq = vm.output_start
+        while context.is_active():
+            running = vm.transaction_id is not None
+            lines, seq = vm.output.read_since(seq, timeout=5)
+            if lines:
+                yield tira_host_pb2.Transaction(status=tira_host_pb2.Status.SUCCESS,
+                                                transactionId=vm.transaction_id or "", message=''.join(lines))
+            elif not running:
+                return
+
 def serve():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=100))
+    # the application keeps its channels open with keepalive pings every 60 seconds, also between calls
+    # (tira.grpc_client), grpc would otherwise close them after two pings (GOAWAY too_many_pings)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=100), options=[
+        ('grpc.keepalive_permit_without_calls', 1),
+        ('grpc.http2.min_ping_interval_without_data_ms', 30000),
+    ])
     tira_host_pb2_grpc.add_TiraHostServiceServicer_to_server(TiraHostService(), server)
     listen_addr = '[::]:' + grpc_port
     server.add_insecure_port(listen_addr)
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""
+    Run the tira scripts of the host as managed processes: without a shell, in their own process group (so that an
+    abort kills the whole process tree), with a timeout, and with stdout/stderr streamed line by line to a log file
+    instead of being buffered in memory. The wall and cpu time of each step is recorded.
+"""
+from collections import deque
+from pathlib import Path
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class OutputBuffer(object):
+    """ A bounded ring buffer of output lines with sequence numbers, so that readers (e.g., the run_output stream) can
+    follow the output of a transaction without reading the log file. Readers that fall behind skip the dropped lines.
+    """
+    def __init__(self, maxlen=1000):
+        self.lines = deque(maxlen=maxlen)
+        self.next_seq = 0
+        self.condition = threading.Condition()
+
+    def append(self, line):
+        with self.condition:
+            self.lines.append((self.next_seq, line))
+            self.next_seq += 1
+            self.condition.notify_all()
+
+    def read_since(self, seq, timeout=None):
+        """ Return the lines with a sequence number >= seq and the sequence number to continue with. Waits up to
+        timeout seconds if there are no such lines yet. """
+        with self.condition:
+            if self.next_seq <= seq and timeout:
+                self.condition.wait(timeout)
+            return [line for i, line in self.lines if i >= seq], self.next_seq
+
+
+class ProcessRunner(object):
+    def __init__(self, cmd, log_file=None, timeout=None, tail_lines=1000, on_output=None):
+        """
+        :param cmd: list of the program and its arguments
+        :param log_file: the output is appended to this file (if given)
+        :param timeout: seconds until the process group is killed
+        :param tail_lines: number of the last output lines that are kept in memory (the output of the step)
+        :param on_output: called with (stream_name, line) for each line of output, e.g., to relay it
+        """
+        self.cmd = [str(i) for i in cmd]
+        self.log_file = Path(log_file) if log_file else None
+        self.timeout = timeout
+        self.tail = deque(maxlen=tail_lines)
+        self.on_output = on_output
+        self.lock = threading.Lock()
+        self.process = None
+        self.killed = None
+        self.returncode = None
+        self.wall_time, self.user_time, self.system_time = None, None, None
+
+    def _read(self, stream, stream_name, log):
+        for line in iter(stream.readline, b''):
+            line = line.decode('utf-8', errors='replace')
+            with self.lock:
+                self.tail.append(line)
+                if log and not log.closed:
+                    log.write(f"[{stream_name}] {line}" if stream_name == 'stderr' else line)
+                    log.flush()
+            if self.on_output:
+                try:
+                    self.on_output(stream_name, line)
+                except Exception as e:
+                    logger.debug(f"on_output failed: {e}")
+        stream.close()
+
+    def kill(self, reason='aborted'):
+        """ Terminate the whole process group (SIGTERM, then SIGKILL after 10 seconds). """
+        if self.process is None or self.returncode is not None:
+            return
+        self.killed = reason
+        try:
+            os.killpg(self.process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+
+        def force_kill():
+            if self.returncode is None:
+                try:
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+        threading.Timer(10, force_kill).start()
+
+    def run(self):
+        """ Run the process to completion. Returns the exit code (-signal if it was killed) and the tail of the
+        output. """
+        log = None
+        if self.log_file:
+            self.log_file.parent.mkdir(parents=True, exist_ok=True)
+            log = open(self.log_file, 'a')
+            log.write(f"$ {' '.join(self.cmd)}\n")
+            log.flush()
+
+        start = time.time()
+        try:
+            self.process = subprocess.Popen(self.cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                            start_new_session=True)
+        except OSError as e:
+            if log:
+                log.write(f"Could not start the process: {e}\n")
+                log.close()
+            self.returncode = 127
+            return self.returncode, str(e)
+
+        readers = [threading.Thread(target=self._read, args=(self.process.stdout, 'stdout', log), daemon=True),
+                   threading.Thread(target=self._read, args=(self.process.stderr, 'stderr', log), daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        timer = None
+        if self.timeout:
+            timer = threading.Timer(self.timeout, self.kill, args=(f'timeout after {self.timeout} seconds',))
+            timer.start()
+
+        # wait4 instead of wait to get the resource usage of this process (and its waited-for children) only
+        _, status, rusage = os.wait4(self.process.pid, 0)
+        self.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+        self.process.returncode = self.returncode
+        if timer:
+            timer.cancel()
+        for reader in readers:
+            reader.join(timeout=10)  # a detached grandchild may keep the pipes open
+
+        self.wall_time, self.user_time, self.system_time = time.time() - start, rusage.ru_utime, rusage.ru_stime
+        summary = f"{self.cmd[:2]} finished with exit code {self.returncode}" + \
+                  (f" ({self.killed})" if self.killed else "") + \
+                  f" after {self.wall_time:.1f}s wall time, {self.user_time:.1f}s user and " \
+                  f"{self.system_time:.1f}s system cpu time"
+        logger.debug(summary)
+        if log:
+            with self.lock:
+                log.write(summary + '\n')
+                log.close()
+
+        return self.returncode, ''.join(self.tail)
+
+    def timings(self):
+        return {'cmd': ' '.join(self.cmd[:2]), 'returncode': self.returncode, 'killed': self.killed,
+                'wall_time': self.wall_time, 'user_time': self.user_time, 'system_time': self.system_time}
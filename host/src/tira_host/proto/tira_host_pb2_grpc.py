@@ -89,6 +89,11 @@ class TiraHostServiceStub(object):
                 request_serializer=tira__host__pb2.VmId.SerializeToString,
                 response_deserializer=tira__host__pb2.Transaction.FromString,
                 )
+        self.run_output = channel.unary_stream(
+                '/tira.generated.TiraHostService/run_output',
+                request_serializer=tira__host__pb2.VmId.SerializeToString,
+                response_deserializer=tira__host__pb2.Transaction.FromString,
+                )
         self.run_eval = channel.unary_unary(
                 '/tira.generated.TiraHostService/run_eval',
                 request_serializer=tira__host__pb2.RunDetails.SerializeToString,
@@ -193,6 +198,12 @@ class TiraHostServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def run_output(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def run_eval(self, request, context):
         """Missing associated documentation comment in .proto file."""
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
@@ -278,6 +289,11 @@ def add_TiraHostServiceServicer_to_server(servicer, server):
                     request_deserializer=tira__host__pb2.VmId.FromString,
                     response_serializer=tira__host__pb2.Transaction.SerializeToString,
             ),
+            'run_output': grpc.unary_stream_rpc_method_handler(
+                    servicer.run_output,
+                    request_deserializer=tira__host__pb2.VmId.FromString,
+                    response_serializer=tira__host__pb2.Transaction.SerializeToString,
+            ),
             'run_eval': grpc.unary_unary_rpc_method_handler(
                     servicer.run_eval,
                     request_deserializer=tira__host__pb2.RunDetails.FromString,
@@ -541,6 +557,23 @@ class TiraHostService(object):
             options, channel_credentials,
             insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
 
+    @staticmethod
+    def run_output(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/tira.generated.TiraHostService/run_output',
+            tira__host__pb2.VmId.SerializeToString,
+            tira__host__pb2.Transaction.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
     @staticmethod
     def run_eval(request,
             target,
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+    Host-level scheduler for the transactions of vm_manage.async_api: at most a configured number of transactions per
+    operation (e.g., run_execute) run at once, the others wait in a FIFO queue until they can start or are cancelled.
+"""
+from collections import deque, OrderedDict
+from configparser import ConfigParser
+import logging
+import threading
+
+config = ConfigParser()
+config.read('conf/grpc_service.ini')
+
+logger = logging.getLogger(__name__)
+
+
+class HostBusy(Exception):
+    pass
+
+
+class JobScheduler(object):
+    def __init__(self, limits, max_queued_jobs, default_limit=4):
+        """
+        :param limits: dict operation -> maximum number of concurrently running transactions of this operation
+        :param max_queued_jobs: maximum number of waiting transactions (of all operations), HostBusy is raised beyond
+        :param default_limit: limit for operations without an entry in limits
+        """
+        self.limits = limits
+        self.default_limit = default_limit
+        self.max_queued_jobs = max_queued_jobs
+        self.lock = threading.Lock()
+        self.queues = {}
+        self.running = {}
+
+    def _limit(self, operation):
+        return max(1, self.limits.get(operation, self.default_limit))
+
+    def submit(self, transaction_id, operation, task, on_cancel=None):
+        """
+        Run task (without arguments) in a worker thread as soon as less than the limit of transactions of the
+        operation run. Returns the position in the queue of the operation (0 if the task started right away).
+        :raises HostBusy: if max_queued_jobs transactions are already waiting
+        """
+        with self.lock:
+            queue = self.queues.setdefault(operation, OrderedDict())
+            if self.running.get(operation, 0) < self._limit(operation):
+                self.running[operation] = self.running.get(operation, 0) + 1
+                threading.Thread(target=self._work, args=(operation, task), daemon=True).start()
+                return 0
+
+            if sum(len(q) for q in self.queues.values()) >= self.max_queued_jobs:
+                raise HostBusy(f"{self.max_queued_jobs} transactions are already waiting")
+
+            queue[transaction_id] = (task, on_cancel)
+            logger.debug(f"Transaction {transaction_id} ({operation}) is queued at position {len(queue)}")
+            return len(queue)
+
+    def _work(self, operation, task):
+        while task is not None:
+            try:
+                task()
+            except Exception as e:
+                logger.error(f"Task of {operation} failed: {e}")
+
+            with self.lock:
+                queue = self.queues[operation]
+                if queue:
+                    _, (task, _) = queue.popitem(last=False)
+                else:
+                    task = None
+                    self.running[operation] -= 1
+
+    def position(self, transaction_id):
+        """ The (1-based) position of the transaction in its queue, or None if it is not waiting. """
+        with self.lock:
+            for queue in self.queues.values():
+                if transaction_id in queue:
+                    return list(queue).index(transaction_id) + 1
+        return None
+
+    def cancel(self, transaction_id):
+        """ Remove a waiting transaction from its queue. Returns False if it is not waiting (anymore). """
+        with self.lock:
+            for queue in self.queues.values():
+                if transaction_id in queue:
+                    _, on_cancel = queue.pop(transaction_id)
+                    break
+            else:
+                return False
+
+        if on_cancel:
+            on_cancel()
+        logger.debug(f"Transaction {transaction_id} was cancelled")
+        return True
+
+    def status(self):
+        with self.lock:
+            return {operation: {'running': self.running.get(operation, 0), 'limit': self._limit(operation),
+                                'queued': list(queue)} for operation, queue in self.queues.items()}
+
+
+scheduler = JobScheduler(
+    limits={k: int(v) for k, v in config.items('scheduler') if k not in ('max_queued_jobs', 'default')}
+    if config.has_section('scheduler') else {},
+    max_queued_jobs=config.getint('scheduler', 'max_queued_jobs', fallback=50),
+    default_limit=config.getint('scheduler', 'default', fallback=4),
+)
@@ -1,4 +1,5 @@
 #!/usr/bin/env python
+import threading
 import time
 from configparser import ConfigParser
 from datetime import datetime
@@ -14,6 +15,7 @@ from watchdog.events import FileSystemEventHandler
 config = ConfigParser()
 config.read('conf/grpc_service.ini')
 TIRA_ROOT = config.get('main', 'tira_model_path')
+RELOAD_DEBOUNCE = config.getfloat('main', 'reload_debounce', fallback=2)
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +47,10 @@ class FileDatabase(FileSystemEventHandler):
 
 
         self.on_modified_callback = on_modified_callback
+        self.reload_lock = threading.Lock()
+        self.reload_timer = None
+        self.first_event = None
+
         observer = PollingObserver()
         observer.schedule(self, path=str(self.users_file_path), recursive=False)
         observer.start()
@@ -64,11 +70,40 @@ class FileDatabase(FileSystemEventHandler):
         self._build_software_relations()
 
     def on_modified(self, event):
+        """ Debounce the events: reload once no event arrived for RELOAD_DEBOUNCE seconds, but during a storm of
+        events at the latest 10 * RELOAD_DEBOUNCE seconds after the first one. """
+        with self.reload_lock:
+            now = time.time()
+            if self.reload_timer is not None:
+                self.reload_timer.cancel()
+            if self.first_event is None:
+                self.first_event = now
+            delay = max(0, min(RELOAD_DEBOUNCE, self.first_event + 10 * RELOAD_DEBOUNCE - now))
+            self.reload_timer = threading.Timer(delay, self.reload_vms)
+            self.reload_timer.daemon = True
+            self.reload_timer.start()
+
+    def reload_vms(self):
+        """ Re-parse users.prototext and apply only the differences to self.vms. The change set
+        {'added': [vm_id], 'changed': [vm_id], 'removed': [vm_id]} is passed to the on_modified_callback. """
+        with self.reload_lock:
+            self.reload_timer, self.first_event = None, None
+
         logger.info(f"Reload {self.users_file_path}...")
-        time.sleep(5)
-        self.build_model()
-        if self.on_modified_callback:
-            self.on_modified_callback()
+        vms = self._read_vm_list()
+        if vms is None:
+            return  # keep the current vms, the file is probably written right now
+
+        changes = {'added': sorted(set(vms) - set(self.vms)),
+                   'removed': sorted(set(self.vms) - set(vms)),
+                   'changed': sorted(vm_id for vm_id in set(vms) & set(self.vms)
+                                     if vms[vm_id].SerializeToString() != self.vms[vm_id].SerializeToString())}
+        self.vms = vms
+
+        logger.info(f"Reloaded {self.users_file_path}: {len(changes['added'])} added, "
+                    f"{len(changes['changed'])} changed, {len(changes['removed'])} removed.")
+        if self.on_modified_callback and any(changes.values()):
+            self.on_modified_callback(changes)
 
     def _parse_organizer_list(self):
         """ Parse the PB Database and extract all hosts.
@@ -79,14 +114,19 @@ class FileDatabase(FileSystemEventHandler):
 
         self.organizers = {org.hostId: org for org in organizers.hosts}
 
-    def _parse_vm_list(self):
+    def _read_vm_list(self):
+        """ :return: a dict {vm_id: modelpb.User} or None if users.prototext can not be parsed """
         users = modelpb.Users()
         try:
             Parse(open(self.users_file_path, "r").read(), users)
         except ParseError as e:
             logger.error(f"Exception while parsing {self.users_file_path}: {e}")
+            return None
 
-        self.vms = {user.userName: user for user in users.users}
+        return {user.userName: user for user in users.users}
+
+    def _parse_vm_list(self):
+        self.vms = self._read_vm_list() or {}
 
     def _parse_dataset_list(self):
         """ Load all the datasets from the Filedatabase.
@@ -1,16 +1,18 @@
 #!/usr/bin/env python
-import os
-import signal
 import threading
 import uuid
+from collections import deque
 from configparser import ConfigParser
 from functools import wraps
+from pathlib import Path
 import logging
 import re
 import socket
-import subprocess
+import time
 
 from grpc_client import TiraHostClient
+from scheduler import scheduler, HostBusy
+from process_runner import ProcessRunner, OutputBuffer
 from proto import tira_host_pb2, tira_host_pb2_grpc
 from proto import TiraClientWebMessages_pb2 as modelpb
 
@@ -19,6 +21,8 @@ config = ConfigParser()
 config.read('conf/grpc_service.ini')
 tira_application_host = config.get('main', 'tira_application_host')
 tira_application_grpc_port = config.get('main', 'tira_application_grpc_port')
+transaction_log_dir = Path(config.get('main', 'tira_log_path')) / 'transactions'
+output_buffer_lines = config.getint('main', 'output_buffer_lines', fallback=1000)
 
 logger = logging.getLogger(__name__)
 
@@ -33,13 +37,24 @@ grpc_client = TiraHostClient(tira_application_host, tira_application_grpc_port)
 def async_api(wrapped_function):
     """
     Manage transactions, make callbacks to tira-application on complete.
+    The transactions are executed by the scheduler: the vm is reserved for the transaction right away, but the
+    transaction waits in a queue while the limit of concurrent transactions of this operation is reached.
+    Returns the queue position of the transaction, or a HOST_BUSY Transaction if the queue is full.
     :param wrapped_function:
     :return:
     """
 
     @wraps(wrapped_function)
     def new_function(vm, transaction_id, request, *args, **kwargs):
+        def on_cancel():
+            vm.transaction_id = None
+            grpc_client.complete_transaction(transaction_id=transaction_id,
+                                             status=tira_host_pb2.Status.FAILED,
+                                             message=f"Transaction {transaction_id} ({wrapped_function.__name__}) "
+                                                     f"was cancelled while waiting in the queue")
+
         def task_call():
+            vm.output_start = vm.output.next_seq  # the output of this transaction starts here
             try:
                 wrapped_function(vm, transaction_id, request, *args, **kwargs)
                 logger.debug(
@@ -56,8 +71,14 @@ def async_api(wrapped_function):
 
         logger.debug(f"Transaction ({transaction_id}) received. (function: {wrapped_function.__name__}, request: {str(request)})")
 
-        t = threading.Thread(target=task_call, args=())
-        t.start()
+        try:
+            vm.transaction_id = transaction_id
+            return scheduler.submit(transaction_id, wrapped_function.__name__, task_call, on_cancel)
+        except HostBusy as e:
+            vm.transaction_id = None
+            logger.warning(f"Transaction ({transaction_id}) rejected: {e}")
+            return tira_host_pb2.Transaction(status=tira_host_pb2.Status.HOST_BUSY, transactionId=transaction_id,
+                                             message=f"Host is busy: {e}")
 
     return new_function
 
@@ -87,13 +108,17 @@ class VirtualMachine(object):
                         message=f"Another transaction ({self.transaction_id}) is already running"
                     )
                 else:
-                    func(self, transaction_id, request, *args, **kwargs)
+                    position = func(self, transaction_id, request, *args, **kwargs)
+                    if isinstance(position, tira_host_pb2.Transaction):
+                        return position
 
                 # Respond right away with Transaction message to tira-application request
                 response_transaction = tira_host_pb2.Transaction()
                 response_transaction.transactionId = str(uuid.uuid4())
                 response_transaction.status = tira_host_pb2.Status.SUCCESS
                 response_transaction.message = f"Host accepted the transaction {transaction_id} request"
+                if position:
+                    response_transaction.message += f" (waiting at position {position} in the queue)"
                 logger.debug(
                     f"Confirmation for transactionId {str(request.transaction.transactionId)} ({func.__name__}) sent")
 
@@ -104,44 +129,65 @@ class VirtualMachine(object):
 
     def run_script(self, *args, script_name="tira", command=""):
         """
+        Run the script without a shell in its own process group. The output is appended to the log file of the
+        current transaction while it runs, the process is killed after the timeout of the command (section
+        [timeouts] of grpc_service.ini) or by run_abort.
         :param script_name: name of the script to execute
         :param command: name of the command (e.g. tira command vm-start)
         :param args: list of arguments for tira command
-        :return:
+        :return: the exit code and the tail of the output
         """
-        shell_command = f"{script_name} {command} " + " ".join([f"'{a}'" for a in args])
+        cmd = [script_name] + ([command] if command else []) + list(args)
         if not command == "vm-info":
-            logger.debug(f"Execute {shell_command}")
-        p = subprocess.Popen(shell_command, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-        self.pid = p.pid
-        out, err = p.communicate()
-        output = out.decode('utf-8')
-        self.pid = None
-
-        if p.returncode != 0:
+            logger.debug(f"Execute {cmd}")
+        timeout = config.getint('timeouts', command, fallback=config.getint('timeouts', 'default', fallback=0))
+        runner = ProcessRunner(cmd, timeout=timeout or None,
+                               log_file=transaction_log_dir / f"{self.transaction_id}.log" if self.transaction_id
+                               else None,
+                               on_output=self._on_output if self.transaction_id else None)
+        self.processes.add(runner)
+        try:
+            returncode, output = runner.run()
+        finally:
+            self.processes.discard(runner)
+        self.step_times.append(runner.timings())
+
+        if returncode != 0:
             logger.error(f"{command} command finished with error: \n" + output)
 
-        return p.returncode, output
+        return returncode, output
 
     def __init__(self, vm: modelpb.User):
         self.state = 0
+        self.guest_os = ""
+        self.memory_size = ""
+        self.number_of_cpus = ""
+        self.ssh_port_status = False
+        self.rdp_port_status = False
+        self.update(vm)
+        self.transaction_id = None
+        self.processes = set()
+        self.step_times = deque(maxlen=50)
+        self.output = OutputBuffer(maxlen=output_buffer_lines)
+        self.output_start = 0
+        self.aborted = False
+        self.info_updated = None
+
+        self.info()
+
+    def update(self, vm: modelpb.User):
+        """ Take over the configuration of the vm from users.prototext (the state is kept) """
         self.vm_id = vm.virtualMachineId
         self.user_name = vm.userName
         self.user_password = vm.userPw
         self.vm_name = vm.vmName
-        self.guest_os = ""
-        self.memory_size = ""
-        self.number_of_cpus = ""
         self.ssh_port = vm.portSsh
-        self.ssh_port_status = False
         self.rdp_port = vm.portRdp
-        self.rdp_port_status = False
         self.host = vm.host
         self.ip = vm.ip
-        self.transaction_id = None
-        self.pid = None
 
-        self.state = self._update_info()
+    def _on_output(self, stream_name, line):
+        self.output.append(f"[{stream_name}] {line}" if stream_name == 'stderr' else line)
 
     def _set_state(self, state):
         self.state = state
@@ -227,9 +273,14 @@ class VirtualMachine(object):
         return retcode, output
 
     def info(self):
+        """ Refresh the snapshot of the vm state (guest os, memory, cpus, port status, power state) and set
+        info_updated. The state is left as it is during a transaction, since the transaction sets it. """
         if self.transaction_id is not None:
             return
-        self.state = self._update_info()
+        state = self._update_info()
+        if self.transaction_id is None:
+            self.state = state
+        self.info_updated = time.time()
 
     def _sandbox(self, transaction_id, output_dir_name, mount_test_data):
         """
@@ -340,6 +391,10 @@ class VirtualMachine(object):
         self._unsandbox(transaction_id)
         self.transaction_id = None
 
+        if self.aborted:
+            self.aborted = False
+            raise Exception(f"The run {request.runId.runId} was aborted")
+
         grpc_client.confirm_run_execute(vm_id=request.runId.vmId, dataset_id=request.runId.datasetId,
                                         run_id=request.runId.runId, transaction_id=transaction_id)
 
@@ -370,11 +425,18 @@ class VirtualMachine(object):
 
         return retcode, output
 
-    @check_state({7})
-    @async_api
     def run_abort(self, transaction_id, request):
-        if self.pid is not None:
-            os.killpg(os.getpgid(self.pid), signal.SIGTERM)
-            self._unsandbox(transaction_id)
-        else:
-            raise Exception(f"No active runs to abort")
+        """
+        Kill the process groups of the running execution. The transaction of the execution continues with the
+        unsandboxing and then fails with 'aborted', so this call does not need a transaction of its own.
+        """
+        if self.state != 7 or not self.processes:
+            return tira_host_pb2.Transaction(status=tira_host_pb2.Status.FAILED, transactionId=transaction_id,
+                                             message="No active runs to abort")
+
+        self.aborted = True
+        for runner in list(self.processes):
+            runner.kill()
+
+        return tira_host_pb2.Transaction(status=tira_host_pb2.Status.SUCCESS, transactionId=transaction_id,
+                                         message=f"Aborted the run of transaction {self.transaction_id}")